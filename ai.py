@@ -18,6 +18,7 @@ import json
 from datetime import datetime
 import sys
 import logging
+from core.thread_manager import ProgressChannel
 
 try:
     import importlib.metadata
@@ -160,6 +161,37 @@ class ProgressDialog:
     def update_message(self, message):
         self.message_var.set(message)
         self.top.update_idletasks()
+    
+    def track(self, channel, unit="项", interval=100):
+        """定时读取进度通道并显示确定进度（通道自身限频）"""
+        def poll():
+            if self.cancelled or not self.top.winfo_exists():
+                return
+            snapshot = channel.poll()
+            if snapshot is not None:
+                self.set_progress(unit=unit, **snapshot)
+            self.top.after(interval, poll)
+        self.top.after(interval, poll)
+    
+    def set_progress(self, fraction=None, throughput=None, eta=None, message=None, unit="项"):
+        """显示完成比例、吞吐量和剩余时间"""
+        if fraction is not None and str(self.progress.cget("mode")) != "determinate":
+            self.progress.stop()
+            self.progress.config(mode="determinate", maximum=100)
+        if fraction is not None:
+            self.progress["value"] = fraction * 100
+        
+        text = message or self.message_var.get().split("\n")[0]
+        details = []
+        if fraction is not None:
+            details.append(f"{fraction * 100:.0f}%")
+        if throughput is not None:
+            details.append(f"{throughput:,.0f} {unit}/秒")
+        if eta is not None:
+            details.append(f"剩余 {eta:.0f} 秒")
+        if details:
+            text += "\n" + "  ·  ".join(details)
+        self.message_var.set(text)
         
     def on_cancel(self):
         self.cancelled = True
@@ -735,6 +767,8 @@ class DataAnalyzerGUI:
             
             # 使用进度对话框
             progress = ProgressDialog(self.root, "加载文件")
+            channel = ProgressChannel()
+            progress.track(channel, unit="KB")
             
             def load_task():
                 try:
@@ -751,12 +785,12 @@ class DataAnalyzerGUI:
                         try:
                             # 尝试不同的编码方式打开CSV文件
                             try:
-                                self.df = pd.read_csv(file_path, encoding='utf-8')
+                                self.df = self.read_csv_with_progress(file_path, 'utf-8', channel)
                             except UnicodeDecodeError:
                                 try:
-                                    self.df = pd.read_csv(file_path, encoding='gbk')
+                                    self.df = self.read_csv_with_progress(file_path, 'gbk', channel)
                                 except UnicodeDecodeError:
-                                    self.df = pd.read_csv(file_path, encoding='latin1')
+                                    self.df = self.read_csv_with_progress(file_path, 'latin1', channel)
                         except IOError as e:
                             if "File is already open" in str(e):
                                 self.root.after(0, lambda: self.show_file_locked_error(str(e), progress))
@@ -780,6 +814,23 @@ class DataAnalyzerGUI:
             self.update_status("文件加载失败")
             messagebox.showerror("错误", f"加载文件失败：{str(e)}")
     
+    CSV_CHUNK_THRESHOLD = 5 * 1024 * 1024  # 超过5MB的CSV分块读取并汇报进度
+    CSV_CHUNK_ROWS = 50000
+    
+    def read_csv_with_progress(self, file_path, encoding, channel):
+        """读取CSV文件，大文件分块读取并通过进度通道汇报已读取的字节数"""
+        file_size = os.path.getsize(file_path)
+        if file_size < self.CSV_CHUNK_THRESHOLD:
+            return pd.read_csv(file_path, encoding=encoding)
+        
+        chunks = []
+        with open(file_path, 'rb') as f:
+            for chunk in pd.read_csv(f, encoding=encoding, chunksize=self.CSV_CHUNK_ROWS):
+                chunks.append(chunk)
+                channel.report(f.tell() / 1024, file_size / 1024,
+                               message=f"正在读取 {os.path.basename(file_path)}")
+        return pd.concat(chunks, ignore_index=True)
+    
     def show_file_locked_error(self, error_message, progress):
         """显示文件被锁定的错误"""
         progress.close()
@@ -0,0 +1,137 @@
+"""
+自适应采样 - 按曲线弯曲程度递归细分参数区间
+平坦处少采样，拐弯、尖峰和定义域边界处加密；跨越极点等间断处自动断开线段。
+初始网格较稀，另用一组错开的探测点检查每个区间是否藏有网格看不到的振荡
+"""
+
+from typing import Callable, Tuple
+
+import numpy as np
+
+
+def _bend_angles(px: np.ndarray, py: np.ndarray) -> np.ndarray:
+    """计算每个内部点处相邻两段的转角（弧度），无法计算处为0"""
+    dx, dy = np.diff(px), np.diff(py)
+    dot = dx[:-1] * dx[1:] + dy[:-1] * dy[1:]
+    norm = np.hypot(dx[:-1], dy[:-1]) * np.hypot(dx[1:], dy[1:])
+    with np.errstate(all="ignore"):
+        cos = np.clip(dot / norm, -1.0, 1.0)
+        angles = np.arccos(cos)
+    return np.nan_to_num(angles, nan=0.0)
+
+
+def _crosses_viewport(py: np.ndarray) -> np.ndarray:
+    """线段两端分别位于视口上方和下方（py 为归一化纵坐标）"""
+    with np.errstate(invalid="ignore"):
+        return ((py[:-1] > 1) & (py[1:] < 0)) | ((py[:-1] < 0) & (py[1:] > 1))
+
+
+def adaptive_sample(func: Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]],
+                    t_min: float, t_max: float,
+                    viewport: Tuple[float, float, float, float],
+                    max_points: int = 2000, initial_points: int = 65, max_depth: int = 12,
+                    angle_tol: float = 0.08, min_length: float = 1e-3,
+                    jump_length: float = 0.02, probe_tol: float = 0.005) -> Tuple[np.ndarray, np.ndarray]:
+    """自适应采样参数曲线
+
+    Args:
+        func: 向量化函数，t 数组 -> (x 数组, y 数组)
+        t_min, t_max: 参数区间
+        viewport: (x_min, x_max, y_min, y_max)，角度和长度均在按视口归一化的坐标中计算
+        max_points: 采样点预算
+        initial_points: 初始均匀采样点数
+        max_depth: 最大细分层数
+        angle_tol: 相邻线段转角超过该值（弧度）时细分
+        min_length: 归一化长度小于该值的线段不再细分（已小于显示精度）
+        jump_length: 细分到最深仍长于该值的线段视为间断
+        probe_tol: 探测点偏离所在区间弦线超过该值（归一化纵坐标）时，把探测点加入网格；
+            周期与网格间距接近的振荡在网格上会混叠成平缓的曲线，只靠转角无法发现
+
+    Returns:
+        (x, y)，间断处插入 NaN 以便 matplotlib 断开线段
+    """
+    x_min, x_max, y_min, y_max = viewport
+    sx = (x_max - x_min) or 1.0
+    sy = (y_max - y_min) or 1.0
+
+    def evaluate(t):
+        x, y = func(t)
+        x = np.broadcast_to(np.asarray(x, dtype=float), t.shape).copy()
+        y = np.broadcast_to(np.asarray(y, dtype=float), t.shape).copy()
+        bad = ~(np.isfinite(x) & np.isfinite(y))
+        x[bad] = np.nan
+        y[bad] = np.nan
+        return x, y
+
+    t = np.linspace(t_min, t_max, max(3, initial_points))
+    x, y = evaluate(t)
+    min_dt = (t_max - t_min) / (len(t) - 1) / 2 ** (max_depth - 1)
+
+    # 防混叠探测：每个区间内取一个错开的点（黄金分割位置，避免与振荡周期共振），
+    # 与弦线偏差大或在两端有定义时无定义的探测点并入网格，之后由转角细分接手
+    probe_t = t[:-1] + np.diff(t) * 0.381966
+    probe_x, probe_y = evaluate(probe_t)
+    fraction = (probe_t - t[:-1]) / np.diff(t)
+    with np.errstate(invalid="ignore"):
+        chord_x = x[:-1] + fraction * np.diff(x)
+        chord_y = y[:-1] + fraction * np.diff(y)
+        deviation = np.hypot((probe_x - chord_x) / sx, (probe_y - chord_y) / sy)
+        hidden = deviation > probe_tol
+    hidden |= np.isfinite(x[:-1]) & np.isfinite(x[1:]) & ~np.isfinite(probe_x)
+    idx = np.flatnonzero(hidden)
+    if idx.size:
+        t = np.insert(t, idx + 1, probe_t[idx])
+        x = np.insert(x, idx + 1, probe_x[idx])
+        y = np.insert(y, idx + 1, probe_y[idx])
+    # 未并入网格的探测点同样计入预算
+    discarded = probe_t.size - idx.size
+
+    for _ in range(max_depth):
+        px, py = (x - x_min) / sx, (y - y_min) / sy
+        finite = np.isfinite(px)
+        seg_len = np.hypot(np.diff(px), np.diff(py))
+
+        bent = np.zeros(len(t), dtype=bool)
+        bent[1:-1] = _bend_angles(px, py) > angle_tol
+        refine = bent[:-1] | bent[1:]
+        # 定义域边界：一端有值一端无值
+        refine |= finite[:-1] != finite[1:]
+        # 已小于显示精度的线段不再细分（NaN 比较为 False，不影响边界细分）
+        refine &= ~(seg_len < min_length)
+        # 两端都远在视口之外的线段看不到，不必细分
+        outside = ~((px > -1) & (px < 2) & (py > -1) & (py < 2))
+        refine &= ~(outside[:-1] & outside[1:] & finite[:-1] & finite[1:])
+        # 从视口上方直接跨到下方的线段：可能是陡峭的连续段，也可能是极点，细分后再判断
+        refine |= _crosses_viewport(py)
+        refine &= np.diff(t) > min_dt
+
+        idx = np.flatnonzero(refine)
+        budget = max_points - len(t) - discarded
+        if idx.size == 0 or budget <= 0:
+            break
+        if idx.size > budget:
+            # 预算不足时优先细分最长的线段
+            priority = np.nan_to_num(seg_len[idx], nan=np.inf)
+            idx = np.sort(idx[np.argsort(-priority)[:budget]])
+
+        t_mid = (t[idx] + t[idx + 1]) / 2
+        x_mid, y_mid = evaluate(t_mid)
+        t = np.insert(t, idx + 1, t_mid)
+        x = np.insert(x, idx + 1, x_mid)
+        y = np.insert(y, idx + 1, y_mid)
+
+    # 间断检测：细分到最深仍跨越整个视口或仍然很长的线段
+    py = (y - y_min) / sy
+    seg_len = np.hypot(np.diff((x - x_min) / sx), np.diff(py))
+    finest = np.diff(t) <= 2 * min_dt
+    # 预算用完而未细分到最深时：跨越视口且走向与前后两段都相反的线段是极点（如 tan 的 +∞ 跳到 -∞）
+    dy = np.diff(py)
+    reversed_jump = np.zeros(len(dy), dtype=bool)
+    with np.errstate(invalid="ignore"):
+        reversed_jump[1:-1] = (dy[1:-1] * dy[:-2] < 0) & (dy[1:-1] * dy[2:] < 0)
+        crossing = _crosses_viewport(py)
+        breaks = np.flatnonzero((finest & (crossing | (seg_len > jump_length))) | (crossing & reversed_jump))
+    if breaks.size:
+        x = np.insert(x, breaks + 1, np.nan)
+        y = np.insert(y, breaks + 1, np.nan)
+    return x, y
@@ -0,0 +1,155 @@
+"""
+二元函数临界点（∇f = 0）的数值求解
+在粗网格上寻找 fx、fy 同时变号的单元格作为初值，对所有初值同时做向量化牛顿迭代，
+收敛点去重后用 Hessian 分类（极小值、极大值、鞍点、退化）
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from common.derivatives import get_derivative_bundle
+
+# Hessian 分类编号
+CONVEX, CONCAVE, SADDLE = 0, 1, 2
+# 临界点分类编号（退化点 Hessian 行列式为0，无法由二阶导数判断）
+MINIMUM, MAXIMUM, SADDLE_POINT, DEGENERATE = 0, 1, 2, 3
+CRITICAL_POINT_NAMES: Dict[int, str] = {
+    MINIMUM: "极小值点", MAXIMUM: "极大值点", SADDLE_POINT: "鞍点", DEGENERATE: "退化点",
+}
+
+
+def classify_hessian(fxx, fxy, fyy, tol=1e-9):
+    """按 2×2 对称矩阵特征值的闭式解（迹与行列式）批量分类
+
+    Returns:
+        (分类编号数组, 较小特征值数组, 较大特征值数组)
+    """
+    half_trace = (fxx + fyy) / 2
+    det = fxx * fyy - fxy ** 2
+    radius = np.sqrt(np.maximum(half_trace ** 2 - det, 0.0))
+    lam_min, lam_max = half_trace - radius, half_trace + radius
+    classes = np.where(lam_min > tol, CONVEX, np.where(lam_max < -tol, CONCAVE, SADDLE))
+    return classes, lam_min, lam_max
+
+
+def classify_critical_points(fxx, fxy, fyy, tol=1e-9) -> np.ndarray:
+    """临界点分类：两特征值同号为极值点，异号为鞍点，有接近0的特征值为退化点"""
+    _, lam_min, lam_max = classify_hessian(fxx, fxy, fyy, tol)
+    return np.select([lam_min > tol, lam_max < -tol, (lam_min < -tol) & (lam_max > tol)],
+                     [MINIMUM, MAXIMUM, SADDLE_POINT], DEGENERATE)
+
+
+def gradient_seeds(source: str, viewport: Tuple[float, float, float, float],
+                   grid_size: int = 40) -> Tuple[np.ndarray, np.ndarray]:
+    """在粗网格上取 fx 和 fy 都变号的单元格中心作为牛顿迭代初值"""
+    x_min, x_max, y_min, y_max = viewport
+    bundle = get_derivative_bundle(source)
+    X, Y = np.meshgrid(np.linspace(x_min, x_max, grid_size + 1),
+                       np.linspace(y_min, y_max, grid_size + 1))
+    fx, fy = bundle.gradient(X, Y)
+
+    def changes_sign(values):
+        # 单元格四个角点中既有 >0 又有 <=0
+        with np.errstate(invalid="ignore"):
+            corners = np.stack([values[:-1, :-1], values[:-1, 1:], values[1:, :-1], values[1:, 1:]])
+            positive = corners > 0
+        finite = np.isfinite(corners).all(axis=0)
+        return finite & positive.any(axis=0) & ~positive.all(axis=0)
+
+    cells = changes_sign(fx) & changes_sign(fy)
+    cx = (X[:-1, :-1] + X[1:, 1:]) / 2
+    cy = (Y[:-1, :-1] + Y[1:, 1:]) / 2
+    return cx[cells], cy[cells]
+
+
+def newton_solve(source: str, x: np.ndarray, y: np.ndarray,
+                 max_iter: int = 100, xtol: float = 1e-10) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """对所有初值同时做牛顿迭代求解 ∇f = 0（参数均可pickle，可在进程池中执行）
+
+    以步长小于 xtol 作为收敛条件：退化临界点附近梯度很早就接近0，但牛顿法只线性收敛，
+    只看梯度会停在离真实位置较远的地方
+
+    Returns:
+        (x, y, 是否收敛)
+    """
+    bundle = get_derivative_bundle(source)
+    x = np.array(x, dtype=float)
+    y = np.array(y, dtype=float)
+    converged = np.zeros(len(x), dtype=bool)
+    active = np.ones(len(x), dtype=bool)
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        xa, ya = x[active], y[active]
+        _, fx, fy, fxx, fxy, fyy = bundle.evaluate(xa, ya)
+        with np.errstate(all="ignore"):
+            det = fxx * fyy - fxy ** 2
+            # 2×2 线性方程 H·d = -∇f 的闭式解
+            dx = (-fx * fyy + fy * fxy) / det
+            dy = (-fy * fxx + fx * fxy) / det
+        done = (np.hypot(dx, dy) < xtol) | ((fx == 0) & (fy == 0))
+        failed = ~(np.isfinite(dx) & np.isfinite(dy)) & ~done
+
+        indices = np.flatnonzero(active)
+        step = ~done & ~failed
+        x[indices[step]] = xa[step] + dx[step]
+        y[indices[step]] = ya[step] + dy[step]
+        converged[indices[done]] = True
+        active[indices[done | failed]] = False
+
+    return x, y, converged
+
+
+def _newton_part(args):
+    return newton_solve(*args)
+
+
+def find_critical_points(source: str, viewport: Tuple[float, float, float, float],
+                         grid_size: int = 40, max_iter: int = 100,
+                         process_threshold: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """求视口内的全部临界点
+
+    Args:
+        source: f(x, y) 表达式
+        viewport: (x_min, x_max, y_min, y_max)
+        grid_size: 寻找初值的粗网格每个方向的单元格数
+        process_threshold: 初值数超过该值时分块交给进程池并行迭代，None 或 0 表示不使用进程池
+            （会阻塞等待进程池结果，界面中应在后台线程调用）
+
+    Returns:
+        字典，包含 x, y, z, fxx, fxy, fyy 以及分类编号 kind，按 x、y 排序
+    """
+    x_min, x_max, y_min, y_max = viewport
+    scale = max(x_max - x_min, y_max - y_min)
+    xtol = scale * 1e-10
+    seeds_x, seeds_y = gradient_seeds(source, viewport, grid_size)
+
+    if process_threshold and len(seeds_x) > process_threshold:
+        from core.thread_manager import get_thread_manager
+        manager = get_thread_manager()
+        parts = [(source, px, py, max_iter, xtol) for px, py in
+                 zip(np.array_split(seeds_x, manager.max_processes), np.array_split(seeds_y, manager.max_processes))]
+        results = manager.map(_newton_part, parts, backend=manager.BACKEND_PROCESS)
+        x = np.concatenate([r[0] for r in results])
+        y = np.concatenate([r[1] for r in results])
+        converged = np.concatenate([r[2] for r in results])
+    else:
+        x, y, converged = newton_solve(source, seeds_x, seeds_y, max_iter, xtol)
+
+    keep = converged & (x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)
+    x, y = x[keep], y[keep]
+
+    # 去重：不同初值收敛到同一点时，按视口尺度的容差合并
+    if len(x):
+        keys = np.round(np.column_stack([x, y]) / (scale * 1e-6)).astype(np.int64)
+        _, first = np.unique(keys, axis=0, return_index=True)
+        x, y = x[first], y[first]
+
+    z, _, _, fxx, fxy, fyy = get_derivative_bundle(source).evaluate(x, y)
+    return {
+        "x": x, "y": y, "z": z,
+        "fxx": fxx, "fxy": fxy, "fyy": fyy,
+        "kind": classify_critical_points(fxx, fxy, fyy),
+    }
@@ -0,0 +1,91 @@
+"""
+二元函数的导数组 - (f, ∇f, H) 一次求导、一次编译
+六个分量用公共子表达式消除（CSE）编译为同一个向量化函数，按表达式缓存，
+旋转视角、更换颜色或点击取值时不再做任何符号计算
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+import numpy as np
+import sympy as sp
+
+from core.expression_manager import expression_manager
+
+# 缓存的导数组数量
+BUNDLE_CACHE_SIZE = 32
+
+
+class DerivativeBundle:
+    """f(x, y) 及其梯度、Hessian 的符号表达式与编译后的数值函数"""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.x, self.y = sp.symbols("x y")
+        self.expr = expression_manager.parse(source, ("x", "y"))
+
+        self.fx = sp.diff(self.expr, self.x)
+        self.fy = sp.diff(self.expr, self.y)
+        self.fxx = sp.diff(self.fx, self.x)
+        self.fxy = sp.diff(self.fx, self.y)
+        self.fyy = sp.diff(self.fy, self.y)
+
+        args = (self.x, self.y)
+        # 曲面只需要函数值，单独编译以免多算导数
+        self._value = sp.lambdify(args, self.expr, modules=["numpy"])
+        self._all = sp.lambdify(args, [self.expr, self.fx, self.fy, self.fxx, self.fxy, self.fyy],
+                                modules=["numpy"], cse=True)
+
+    @staticmethod
+    def _as_float(value, shape) -> np.ndarray:
+        """转换为浮点数组并广播到输入形状，复数结果按无定义处理"""
+        value = np.asarray(value)
+        if np.iscomplexobj(value):
+            value = np.where(np.abs(value.imag) < 1e-12, value.real, np.nan)
+        return np.broadcast_to(value.astype(float, copy=False), shape)
+
+    def value(self, X, Y) -> np.ndarray:
+        """函数值，无定义处为NaN"""
+        X, Y = np.asarray(X, dtype=float), np.asarray(Y, dtype=float)
+        shape = np.broadcast_shapes(X.shape, Y.shape)
+        with np.errstate(all="ignore"):
+            Z = np.array(self._as_float(self._value(X, Y), shape))
+        Z[~np.isfinite(Z)] = np.nan
+        return Z
+
+    def evaluate(self, X, Y) -> Tuple[np.ndarray, ...]:
+        """(f, fx, fy, fxx, fxy, fyy)，一次调用求出全部分量"""
+        X, Y = np.asarray(X, dtype=float), np.asarray(Y, dtype=float)
+        shape = np.broadcast_shapes(X.shape, Y.shape)
+        with np.errstate(all="ignore"):
+            return tuple(self._as_float(v, shape) for v in self._all(X, Y))
+
+    def gradient(self, X, Y) -> Tuple[np.ndarray, np.ndarray]:
+        """(fx, fy)"""
+        return self.evaluate(X, Y)[1:3]
+
+    def hessian(self, X, Y) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(fxx, fxy, fyy)"""
+        return self.evaluate(X, Y)[3:]
+
+
+_bundles: "OrderedDict[str, DerivativeBundle]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_derivative_bundle(source: str) -> DerivativeBundle:
+    """按表达式取导数组（LRU缓存），同一表达式只做一次符号求导和编译"""
+    key = " ".join(str(source).split())
+    with _lock:
+        bundle = _bundles.get(key)
+        if bundle is not None:
+            _bundles.move_to_end(key)
+            return bundle
+
+    bundle = DerivativeBundle(key)
+    with _lock:
+        _bundles[key] = bundle
+        while len(_bundles) > BUNDLE_CACHE_SIZE:
+            _bundles.popitem(last=False)
+    return bundle
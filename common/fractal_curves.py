@@ -0,0 +1,201 @@
+"""
+分形曲线引擎 - 以复数数组迭代生成 L 系统（边替换）曲线
+每条规则写成若干相似变换 z -> offset + scale * z（可带镜像、逆序），
+第 n+1 层 = 各变换作用于第 n 层点列后首尾相接；每层只做一次整体数组运算，
+已生成的层全部缓存，加深迭代时直接从上一层展开。
+另有按视口裁剪的绘制方式：只展开与视口相交的分支，细分到像素尺度为止
+"""
+
+import math
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 单个系统缓存的最大点数，超出时不再加深（约 64MB 的复数数组）
+MAX_CACHED_POINTS = 4_000_000
+# 按视口绘制时的线段预算
+VIEWPORT_SEGMENT_BUDGET = 200_000
+
+
+class SimilarityMap(NamedTuple):
+    """相似变换 z -> offset + scale * z；mirror 先取共轭（镜像），reverse 将结果点列逆序"""
+    offset: complex
+    scale: complex
+    mirror: bool = False
+    reverse: bool = False
+
+    def apply(self, z: np.ndarray) -> np.ndarray:
+        w = np.conj(z) if self.mirror else z
+        result = self.offset + self.scale * w
+        return result[::-1] if self.reverse else result
+
+
+def segment_map(a: complex, b: complex, mirror: bool = False, reverse: bool = False) -> SimilarityMap:
+    """把单位线段 [0, 1] 映射到线段 [a, b]"""
+    return SimilarityMap(complex(a), complex(b) - complex(a), mirror, reverse)
+
+
+def polyline_maps(points: Sequence[complex], mirror: Sequence[bool] = ()) -> List[SimilarityMap]:
+    """折线的每一段各对应一个变换（科赫类曲线的生成元）"""
+    mirror = list(mirror) or [False] * (len(points) - 1)
+    return [segment_map(a, b, m) for a, b, m in zip(points[:-1], points[1:], mirror)]
+
+
+def _join(parts: List[np.ndarray], shared: bool) -> np.ndarray:
+    """拼接各段点列；相邻两段首尾重合时去掉重复点"""
+    if shared:
+        parts = parts[:1] + [p[1:] for p in parts[1:]]
+    return np.concatenate(parts)
+
+
+class CurveSystem:
+    """一种分形曲线：生成规则 + 初始点列 + 放置到画面上的初始变换"""
+
+    def __init__(self, name: str, maps: Sequence[SimilarityMap], seed: Sequence[complex] = (0, 1),
+                 initiator: Optional[Sequence[SimilarityMap]] = None, max_depth: int = 8,
+                 description: str = ""):
+        self.name = name
+        self.maps = list(maps)
+        self.initiator = list(initiator) if initiator else [SimilarityMap(0, 1)]
+        self.max_depth = max_depth
+        self.description = description
+        self.levels = [np.asarray(seed, dtype=complex)]
+        # 种子为两个端点时，相邻副本首尾相接；种子为单点（如希尔伯特曲线的格子中心）时依次连接
+        self.shared = len(self.levels[0]) > 1
+
+    def level(self, depth: int) -> np.ndarray:
+        """第 depth 层的点列（单位坐标），从已缓存的最深一层逐层展开"""
+        depth = max(0, min(int(depth), self.max_depth))
+        while len(self.levels) <= depth:
+            last = self.levels[-1]
+            if len(last) * len(self.maps) > MAX_CACHED_POINTS:
+                depth = len(self.levels) - 1
+                break
+            self.levels.append(_join([m.apply(last) for m in self.maps], self.shared))
+        return self.levels[depth]
+
+    def points(self, depth: int) -> np.ndarray:
+        """放置到画面坐标后的完整点列"""
+        curve = self.level(depth)
+        return _join([m.apply(curve) for m in self.initiator], self.shared)
+
+    def segments(self, depth: int) -> np.ndarray:
+        """线段数组 (n, 2, 2)，可直接交给 LineCollection"""
+        z = self.points(depth)
+        xy = np.column_stack([z.real, z.imag])
+        return np.stack([xy[:-1], xy[1:]], axis=1)
+
+    def _bounding_disk(self) -> Tuple[complex, float]:
+        """极限曲线（单位坐标）的包围圆 (圆心, 半径)，由较深一层的点列估计并留出余量"""
+        if not hasattr(self, "_disk"):
+            depth = min(self.max_depth, 6)
+            z = np.concatenate([self.level(depth), [0, 1]])
+            center = complex((z.real.min() + z.real.max()) / 2, (z.imag.min() + z.imag.max()) / 2)
+            ratio = max(abs(m.scale) for m in self.maps)
+            self._disk = (center, float(np.abs(z - center).max()) * 1.05 + ratio ** depth)
+        return self._disk
+
+    def visible_segments(self, viewport: Tuple[float, float, float, float], pixel_size: float,
+                         budget: int = VIEWPORT_SEGMENT_BUDGET) -> Tuple[np.ndarray, int]:
+        """只展开与视口相交的分支，直到分支小于一个像素或线段数达到预算
+
+        每个分支是初始变换与若干生成变换的复合，整个分支的曲线位于其包围圆内；
+        不再展开的分支画成从起点 g(0) 到终点 g(1) 的线段，相邻分支首尾相接
+
+        Args:
+            viewport: (x_min, x_max, y_min, y_max)
+            pixel_size: 一个像素对应的数据长度
+            budget: 最多输出的线段数
+
+        Returns:
+            (线段数组 (n, 2, 2), 展开的层数)
+        """
+        x_min, x_max, y_min, y_max = viewport
+        center, radius = self._bounding_disk()
+        map_offsets = np.array([m.offset for m in self.maps], dtype=complex)
+        map_scales = np.array([m.scale for m in self.maps], dtype=complex)
+        map_mirrors = np.array([m.mirror for m in self.maps], dtype=bool)
+
+        offsets = np.array([m.offset for m in self.initiator], dtype=complex)
+        scales = np.array([m.scale for m in self.initiator], dtype=complex)
+        mirrors = np.array([m.mirror for m in self.initiator], dtype=bool)
+        leaves = []
+        leaf_count = 0
+        depth = 0
+
+        while offsets.size:
+            # 视口裁剪：包围圆与视口矩形不相交的分支直接丢弃
+            c = offsets + scales * np.where(mirrors, np.conj(center), center)
+            r = np.abs(scales) * radius
+            dx = np.maximum(np.maximum(x_min - c.real, c.real - x_max), 0)
+            dy = np.maximum(np.maximum(y_min - c.imag, c.imag - y_max), 0)
+            keep = np.hypot(dx, dy) <= r
+            offsets, scales, mirrors, r = offsets[keep], scales[keep], mirrors[keep], r[keep]
+
+            small = 2 * r <= pixel_size
+            leaves.append((offsets[small], scales[small]))
+            leaf_count += int(small.sum())
+            offsets, scales, mirrors = offsets[~small], scales[~small], mirrors[~small]
+
+            # 预算不足以再展开一层时，剩余分支直接画成线段
+            if leaf_count + offsets.size * len(self.maps) > budget:
+                leaves.append((offsets, scales))
+                break
+
+            # 复合变换：父变换带镜像时，子变换的偏移和缩放取共轭，镜像状态翻转
+            child_offsets = np.where(mirrors[:, None], np.conj(map_offsets), map_offsets)
+            child_scales = np.where(mirrors[:, None], np.conj(map_scales), map_scales)
+            offsets = (offsets[:, None] + scales[:, None] * child_offsets).ravel()
+            scales = (scales[:, None] * child_scales).ravel()
+            mirrors = (mirrors[:, None] ^ map_mirrors).ravel()
+            if offsets.size:
+                depth += 1
+
+        offsets = np.concatenate([o for o, _ in leaves])
+        ends = offsets + np.concatenate([sc for _, sc in leaves])
+        segments = np.stack([np.column_stack([offsets.real, offsets.imag]),
+                             np.column_stack([ends.real, ends.imag])], axis=1)
+        return segments, depth
+
+    def dimension(self) -> float:
+        """相似维数 log N / log(1/r)（各变换缩放比相同时）"""
+        ratio = abs(self.maps[0].scale)
+        return math.log(len(self.maps)) / -math.log(ratio)
+
+
+def _build_systems() -> Dict[str, CurveSystem]:
+    w = complex(math.cos(math.pi / 3), math.sin(math.pi / 3))
+    koch = [0, 1 / 3, 0.5 + 1j * math.sqrt(3) / 6, 2 / 3, 1]
+    quadratic = [0, 0.25, 0.25 + 0.25j, 0.5 + 0.25j, 0.5, 0.5 - 0.25j, 0.75 - 0.25j, 0.75, 1]
+
+    # 雪花三角形顺时针走一圈，使每条边的凸起朝外
+    side = 2.0
+    height = side * math.sqrt(3) / 2
+    p1 = complex(-side / 2, -height / 3)
+    p2 = complex(side / 2, -height / 3)
+    p3 = complex(0, 2 * height / 3)
+
+    systems = [
+        CurveSystem("科赫雪花", polyline_maps(koch), initiator=polyline_maps([p1, p3, p2, p1]),
+                    max_depth=8, description="三角形的每条边反复替换为带60°凸起的四段折线，周长无限而面积有限。"),
+        CurveSystem("科赫曲线", polyline_maps(koch), initiator=[segment_map(-1.2 - 0.3j, 1.2 - 0.3j)],
+                    max_depth=9, description="线段三等分后把中间一段替换为等边三角形的两边。"),
+        CurveSystem("二次科赫曲线", polyline_maps(quadratic), initiator=[segment_map(-1.2, 1.2)],
+                    max_depth=6, description="线段四等分，以方形凸起和凹陷替换为八段折线（闵可夫斯基香肠）。"),
+        CurveSystem("谢尔宾斯基箭头曲线", polyline_maps([0, w / 2, w / 2 + 0.5, 1], mirror=[True, False, True]),
+                    initiator=[segment_map(-1 - 0.8j, 1 - 0.8j)], max_depth=9,
+                    description="一条连续曲线，极限为谢尔宾斯基三角形。"),
+        CurveSystem("龙形曲线", [SimilarityMap(0, (1 + 1j) / 2), SimilarityMap(1, -(1 - 1j) / 2, reverse=True)],
+                    initiator=[segment_map(-0.8 + 0.3j, 1.0 + 0.3j)], max_depth=16,
+                    description="纸条反复对折后展开成直角得到的曲线（海威龙）。"),
+        CurveSystem("希尔伯特曲线",
+                    [SimilarityMap(0, 0.5j, mirror=True), SimilarityMap(0.5j, 0.5),
+                     SimilarityMap(0.5 + 0.5j, 0.5), SimilarityMap(1 + 0.5j, -0.5j, mirror=True)],
+                    seed=(0.5 + 0.5j,), initiator=[SimilarityMap(-1 - 1j, 2)], max_depth=8,
+                    description="依次经过正方形所有格子的空间填充曲线。"),
+    ]
+    return {system.name: system for system in systems}
+
+
+# 名称 -> 分形曲线系统（各自缓存已生成的层）
+CURVE_SYSTEMS: Dict[str, CurveSystem] = _build_systems()
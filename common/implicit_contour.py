@@ -0,0 +1,147 @@
+"""
+隐式曲线 f(x,y)=0 的自适应绘制 - 四叉树 + 行进方格（marching squares）
+只细分可能含有零点的单元格，最终在最细层的变号单元格中提取线段；
+角点处无定义（奇点、定义域边界）的单元格一直细分到最细层再判断
+"""
+
+from typing import Callable, Tuple
+
+import numpy as np
+
+
+class ImplicitField:
+    """隐式函数在整数格点上的采样结果（按格点编号排序存储）"""
+
+    def __init__(self, viewport: Tuple[float, float, float, float], grid_size: int):
+        self.viewport = viewport
+        self.grid_size = grid_size  # 最细层每个方向的单元格数
+        self.keys = np.empty(0, dtype=np.int64)
+        self.values = np.empty(0, dtype=float)
+        self.evaluations = 0
+
+    def to_xy(self, i: np.ndarray, j: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """整数格点 -> 坐标"""
+        x_min, x_max, y_min, y_max = self.viewport
+        n = self.grid_size
+        return x_min + i * (x_max - x_min) / n, y_min + j * (y_max - y_min) / n
+
+    def lookup(self, func: Callable, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        """取格点处的函数值，缺失的格点一次性向量化求值后并入缓存"""
+        keys = i.astype(np.int64) * (self.grid_size + 1) + j
+        unique_keys = np.unique(keys)
+        missing = unique_keys[~np.isin(unique_keys, self.keys, assume_unique=True)]
+        if missing.size:
+            mi, mj = np.divmod(missing, self.grid_size + 1)
+            values = np.asarray(func(*self.to_xy(mi, mj)), dtype=float)
+            values = np.broadcast_to(values, missing.shape)
+            self.evaluations += missing.size
+            merged_keys = np.concatenate([self.keys, missing])
+            order = np.argsort(merged_keys, kind="mergesort")
+            self.keys = merged_keys[order]
+            self.values = np.concatenate([self.values, values])[order]
+        return self.values[np.searchsorted(self.keys, keys)]
+
+
+def _corner_values(field: ImplicitField, func: Callable, i, j, size):
+    """单元格四个角（左下、右下、右上、左上）的函数值，形状 (n, 4)"""
+    ci = np.stack([i, i + size, i + size, i], axis=1)
+    cj = np.stack([j, j, j + size, j + size], axis=1)
+    return field.lookup(func, ci.ravel(), cj.ravel()).reshape(-1, 4)
+
+
+def _may_contain_zero(values: np.ndarray) -> np.ndarray:
+    """单元格可能含零点：角点变号，或最小绝对值小于角点间的变化幅度（捕捉细小结构）
+
+    部分角点无定义的单元格（贴着奇点或定义域边界）无法判断，同样保留继续细分；
+    四个角点都无定义的单元格丢弃
+    """
+    with np.errstate(invalid="ignore"):
+        positive = values > 0
+        sign_change = positive.any(axis=1) & ~positive.all(axis=1)
+        variation = values.max(axis=1) - values.min(axis=1)
+        near_zero = np.abs(values).min(axis=1) < variation
+    finite = np.isfinite(values)
+    all_finite = finite.all(axis=1)
+    unknown = finite.any(axis=1) & ~all_finite
+    return (all_finite & (sign_change | near_zero)) | unknown
+
+
+# 四条边（下、右、上、左）对应的角点编号
+_EDGES = np.array([[0, 1], [1, 2], [2, 3], [3, 0]])
+
+
+def _marching_squares(field: ImplicitField, func: Callable, i, j, size, values) -> np.ndarray:
+    """在变号单元格中提取零等值线段，返回形状 (n, 2, 2) 的线段数组"""
+    ci = np.stack([i, i + size, i + size, i], axis=1)
+    cj = np.stack([j, j, j + size, j + size], axis=1)
+    cx, cy = field.to_xy(ci, cj)
+
+    va, vb = values[:, _EDGES[:, 0]], values[:, _EDGES[:, 1]]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        crossing = (va > 0) != (vb > 0)
+        ratio = np.clip(va / (va - vb), 0.0, 1.0)
+    px = cx[:, _EDGES[:, 0]] + ratio * (cx[:, _EDGES[:, 1]] - cx[:, _EDGES[:, 0]])
+    py = cy[:, _EDGES[:, 0]] + ratio * (cy[:, _EDGES[:, 1]] - cy[:, _EDGES[:, 0]])
+    points = np.stack([px, py], axis=2)  # (n, 4条边, 2)
+
+    count = crossing.sum(axis=1)
+    segments = []
+
+    # 普通情况：恰有两条边被穿过
+    two = np.flatnonzero(count == 2)
+    if two.size:
+        edges = np.argsort(~crossing[two], axis=1, kind="stable")[:, :2]
+        rows = two[:, None]
+        segments.append(points[rows, edges])
+
+    # 鞍点情况：四条边都被穿过，用中心点的符号决定连接方式
+    four = np.flatnonzero(count == 4)
+    if four.size:
+        mx = cx[four].mean(axis=1)
+        my = cy[four].mean(axis=1)
+        center = np.broadcast_to(np.asarray(func(mx, my), dtype=float), mx.shape)
+        same = (center > 0) == (values[four, 0] > 0)
+        # 中心与左下角同号时切开右下角和左上角，否则切开左下角和右上角
+        pairs = np.where(same[:, None, None], [[0, 1], [2, 3]], [[3, 0], [1, 2]])
+        rows = four[:, None, None]
+        segments.append(points[rows, pairs].reshape(-1, 2, 2))
+
+    if not segments:
+        return np.empty((0, 2, 2))
+    return np.concatenate(segments)
+
+
+def quadtree_contour(func: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                     viewport: Tuple[float, float, float, float],
+                     initial_cells: int = 32, max_depth: int = 5) -> Tuple[np.ndarray, ImplicitField]:
+    """四叉树自适应提取 f(x,y)=0 的线段
+
+    Args:
+        func: 向量化函数 (x 数组, y 数组) -> 函数值数组
+        viewport: (x_min, x_max, y_min, y_max)
+        initial_cells: 初始网格每个方向的单元格数
+        max_depth: 最大细分层数，最细层每个方向有 initial_cells * 2**max_depth 个单元格
+
+    Returns:
+        (线段数组 (n, 2, 2), 采样场)
+    """
+    field = ImplicitField(tuple(viewport), initial_cells * 2 ** max_depth)
+
+    size = 2 ** max_depth
+    i, j = np.meshgrid(np.arange(initial_cells) * size, np.arange(initial_cells) * size, indexing="ij")
+    i, j = i.ravel(), j.ravel()
+
+    for _ in range(max_depth):
+        active = _may_contain_zero(_corner_values(field, func, i, j, size))
+        i, j = i[active], j[active]
+        if i.size == 0:
+            return np.empty((0, 2, 2)), field
+        # 每个活动单元格分为四个子单元格
+        size //= 2
+        i = np.concatenate([i, i + size, i, i + size])
+        j = np.concatenate([j, j, j + size, j + size])
+
+    values = _corner_values(field, func, i, j, size)
+    # 最细层仍有角点无定义的单元格无法插值出零点位置，丢弃
+    finite = np.isfinite(values).all(axis=1)
+    return _marching_squares(field, func, i[finite], j[finite], size, values[finite]), field
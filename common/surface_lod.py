@@ -0,0 +1,133 @@
+"""
+3D 曲面的多级细节（LOD）渲染
+每个曲面预先生成网格金字塔（每级隔一条网格线抽取），拖动旋转/缩放期间显示抽稀后的网格，
+鼠标停止一段时间后再切换回全分辨率网格
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+def _decimate_indices(n: int, step: int) -> np.ndarray:
+    """每隔 step 取一条网格线，并保留最后一条以免曲面边缘缩进"""
+    return np.unique(np.r_[np.arange(0, n, step), n - 1])
+
+
+def build_mesh_pyramid(X: np.ndarray, Y: np.ndarray, Z: np.ndarray,
+                       min_lines: int = 8) -> Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """生成网格金字塔：抽取步长 -> (X, Y, Z)，步长依次为 1, 2, 4, ...，直到网格线少于 min_lines"""
+    levels = {}
+    step = 1
+    while True:
+        rows = _decimate_indices(Z.shape[0], step)
+        cols = _decimate_indices(Z.shape[1], step)
+        grid = np.ix_(rows, cols)
+        levels[step] = (X[grid], Y[grid], Z[grid])
+        if min(len(rows), len(cols)) // 2 < min_lines:
+            return levels
+        step *= 2
+
+
+class SurfaceLOD:
+    """为一个画布上的3D曲面提供交互期间的低分辨率替身"""
+
+    # 最后一次鼠标动作后多久恢复全分辨率（毫秒）
+    IDLE_MS = 250
+    # 交互期间每个方向最多显示的网格线数
+    INTERACTIVE_LINES = 40
+
+    def __init__(self, canvas, idle_ms: int = IDLE_MS, interactive_lines: int = INTERACTIVE_LINES):
+        self.canvas = canvas
+        self.widget = canvas.get_tk_widget()
+        self.idle_ms = idle_ms
+        self.interactive_lines = interactive_lines
+
+        self.pyramid = {}
+        self.full = None
+        self.coarse = None
+        self.interacting = False
+        self.pressed = False
+        self.idle_job = None
+
+        self._cids = [
+            canvas.mpl_connect('button_press_event', self._on_press),
+            canvas.mpl_connect('button_release_event', self._on_release),
+            canvas.mpl_connect('motion_notify_event', self._on_motion),
+            canvas.mpl_connect('scroll_event', self._on_scroll),
+        ]
+
+    def plot_surface(self, ax, X, Y, Z, **kwargs):
+        """绘制曲面（全分辨率 + 隐藏的交互用低分辨率），返回全分辨率曲面"""
+        self._cancel_idle()
+        self.interacting = False
+        self.pyramid = build_mesh_pyramid(X, Y, Z)
+
+        rows, cols = Z.shape
+        self.full = ax.plot_surface(X, Y, Z, rcount=rows, ccount=cols, **kwargs)
+
+        # 选取网格线数不超过 interactive_lines 的最精细一级
+        step = next((s for s in sorted(self.pyramid)
+                     if max(self.pyramid[s][2].shape) <= self.interactive_lines), max(self.pyramid))
+        self.coarse = None
+        if step > 1:
+            Xc, Yc, Zc = self.pyramid[step]
+            self.coarse = ax.plot_surface(Xc, Yc, Zc, rcount=Zc.shape[0], ccount=Zc.shape[1], **kwargs)
+            self.coarse.set_visible(False)
+        return self.full
+
+    def disconnect(self):
+        """断开事件连接并取消待执行的恢复"""
+        self._cancel_idle()
+        for cid in self._cids:
+            self.canvas.mpl_disconnect(cid)
+        self._cids = []
+
+    def _owns(self, event) -> bool:
+        return self.full is not None and event.inaxes is not None and event.inaxes is self.full.axes
+
+    def _on_press(self, event):
+        self.pressed = self._owns(event)
+
+    def _on_release(self, event):
+        self.pressed = False
+
+    def _on_motion(self, event):
+        if self.pressed:
+            self._begin_interaction()
+
+    def _on_scroll(self, event):
+        if self._owns(event):
+            self._begin_interaction()
+
+    def _begin_interaction(self):
+        """切换到低分辨率网格（重绘由旋转/缩放本身触发），并重新开始计时"""
+        if self.coarse is None:
+            return
+        if not self.interacting:
+            self.interacting = True
+            self.full.set_visible(False)
+            self.coarse.set_visible(True)
+        self._cancel_idle()
+        self.idle_job = self.widget.after(self.idle_ms, self._restore)
+
+    def _restore(self):
+        """空闲后切换回全分辨率网格"""
+        self.idle_job = None
+        if self.pressed:
+            # 按住鼠标不动时仍在交互中，继续等待
+            self.idle_job = self.widget.after(self.idle_ms, self._restore)
+            return
+        if self.interacting and self.full is not None:
+            self.interacting = False
+            self.coarse.set_visible(False)
+            self.full.set_visible(True)
+            self.canvas.draw_idle()
+
+    def _cancel_idle(self):
+        if self.idle_job is not None:
+            try:
+                self.widget.after_cancel(self.idle_job)
+            except Exception:
+                pass
+            self.idle_job = None
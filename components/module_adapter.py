@@ -1,7 +1,87 @@
 import tkinter as tk
 from core.page_manager import BasePage
+from core.module_registry import module_registry
+
+# 各模块保存 Tk after 回调编号的属性名，页面回收时逐一取消
+_AFTER_ATTRIBUTES = ("_after_id", "simulation_task", "resample_timer", "rectangle_update_timer",
+                     "hover_job", "refine_timer")
 
 class ModuleAdapter(BasePage):
     def __init__(self, parent, controller, module_class):
         super().__init__(parent, controller)
-        self.module = module_class(self)
\ No newline at end of file
+        # module_class 可以是类，也可以是 "package.module:ClassName" 形式的导入路径
+        self.module_class = module_class
+        self.module = None
+
+    def initialize(self):
+        """首次显示时才导入并创建模块"""
+        module_class = module_registry.load(self.module_class)
+        self.module = module_class(self)
+
+    def _iter_figures(self):
+        """查找模块持有的 matplotlib 图形"""
+        if self.module is None:
+            return
+        seen = set()
+        for value in list(vars(self.module).values()):
+            figure = getattr(value, "figure", None) if hasattr(value, "get_tk_widget") else value
+            if hasattr(figure, "savefig") and hasattr(figure, "axes") and id(figure) not in seen:
+                seen.add(id(figure))
+                yield figure
+
+    def estimate_memory(self) -> int:
+        """估算模块内存：图形的渲染缓冲区加上模块直接持有的数组"""
+        if self.module is None:
+            return 0
+        total = 0
+        for figure in self._iter_figures():
+            width, height = figure.get_size_inches() * figure.dpi
+            total += int(width * height * 4)  # RGBA 缓冲区
+            for ax in figure.axes:
+                total += sum(line.get_xydata().nbytes for line in ax.lines)
+                total += sum(len(c.get_paths()) * 256 for c in ax.collections)  # 每条路径的粗略开销
+        for value in vars(self.module).values():
+            total += getattr(value, "nbytes", 0) if hasattr(value, "dtype") else 0
+        return total
+
+    def cleanup(self):
+        """页面被回收时停止动画、关闭图形并释放模块持有的数组"""
+        if self.module is None:
+            return
+        import matplotlib.pyplot as plt
+
+        module = self.module
+        # 模块自己的清理钩子（停止内部循环、取消嵌套对象持有的回调等）
+        hook = getattr(module, "cleanup", None)
+        if callable(hook):
+            try:
+                hook()
+            except Exception as e:
+                print(f"模块清理出错: {e}")
+        # 先取消尚未执行的 after 回调，避免它们在图形关闭、数组释放后继续运行
+        for name in _AFTER_ATTRIBUTES:
+            after_id = getattr(module, name, None)
+            if after_id is not None:
+                try:
+                    self.after_cancel(after_id)
+                except tk.TclError:
+                    pass
+                setattr(module, name, None)
+
+        if hasattr(module, "animation_running"):
+            module.animation_running = False
+        for name in ("animation", "ani", "anim"):
+            animation = getattr(module, name, None)
+            event_source = getattr(animation, "event_source", None)
+            if event_source is not None:
+                event_source.stop()
+
+        for figure in list(self._iter_figures()):
+            figure.clear()
+            plt.close(figure)
+
+        # 断开对大型数组和图形的引用，便于及时回收内存
+        for name, value in list(vars(module).items()):
+            if hasattr(value, "dtype") or hasattr(value, "savefig"):
+                setattr(module, name, None)
+        self.module = None
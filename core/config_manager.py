@@ -108,7 +108,14 @@ class ConfigManager:
                 "enable_animations": True,
                 "animation_speed": "normal",
                 "max_threads": 4,
-                "cache_enabled": True
+                "max_processes": None,  # None 表示 CPU核心数-1
+                "dispatch_interval_ms": 16,  # 任务结果分发周期
+                "progress_interval_ms": 100,  # 进度条刷新最小间隔
+                "max_live_pages": 6,  # 同时保留的模块页面数，0 表示不限
+                "page_memory_budget_mb": 512,  # 模块页面的估算内存预算，0 表示不限
+                "cache_enabled": True,
+                "prefetch_modules": False,
+                "process_batch_threshold": 256  # 批量计算的数据量超过该值时交给进程池，0 表示不使用
             },
             "accessibility": {
                 "high_contrast": False,
@@ -118,7 +125,8 @@ class ConfigManager:
             "debugging": {
                 "log_level": "INFO",
                 "show_fps": False,
-                "show_memory_usage": False
+                "show_memory_usage": False,
+                "report_import_times": False
             }
         }
     
@@ -243,7 +251,14 @@ class ConfigManager:
             "enable_animations": self.get_config("performance.enable_animations", True),
             "animation_speed": self.get_config("performance.animation_speed", "normal"),
             "max_threads": self.get_config("performance.max_threads", 4),
-            "cache_enabled": self.get_config("performance.cache_enabled", True)
+            "max_processes": self.get_config("performance.max_processes", None),
+            "dispatch_interval_ms": self.get_config("performance.dispatch_interval_ms", 16),
+            "progress_interval_ms": self.get_config("performance.progress_interval_ms", 100),
+            "max_live_pages": self.get_config("performance.max_live_pages", 6),
+            "page_memory_budget_mb": self.get_config("performance.page_memory_budget_mb", 512),
+            "cache_enabled": self.get_config("performance.cache_enabled", True),
+            "prefetch_modules": self.get_config("performance.prefetch_modules", False),
+            "process_batch_threshold": self.get_config("performance.process_batch_threshold", 256)
         }
 
 
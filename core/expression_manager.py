@@ -0,0 +1,198 @@
+"""
+表达式管理器 - 用户输入公式的统一解析与编译
+公式只解析一次：安全校验后转换为 SymPy 表达式并编译为向量化的 NumPy 函数，
+结果按 (表达式, 变量, 函数集) 缓存在 LRU 中，供各模块共享
+"""
+
+import re
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import sympy as sp
+from sympy.core.function import AppliedUndef
+from sympy.parsing.sympy_parser import (parse_expr, standard_transformations,
+                                        implicit_multiplication_application, convert_xor)
+
+
+class ExpressionError(ValueError):
+    """表达式无效或不安全"""
+
+
+# 可用的函数集：名称 -> lambdify 的 modules 参数
+FUNCTION_SETS: Dict[str, list] = {
+    "numpy": ["numpy"],
+    "scipy": ["scipy", "numpy"],
+}
+
+# 允许在表达式中使用的常量和函数别名
+_NAMESPACE = {
+    "pi": sp.pi, "e": sp.E, "E": sp.E,
+    "ln": sp.log, "log": sp.log, "log10": lambda arg: sp.log(arg, 10),
+    "arcsin": sp.asin, "arccos": sp.acos, "arctan": sp.atan,
+    "abs": sp.Abs,
+}
+
+_TRANSFORMATIONS = standard_transformations + (implicit_multiplication_application, convert_xor)
+
+# 解析时可见的全部全局名称：显式白名单 + 转换规则生成的构造器，不包含任何 Python 内置函数
+_SAFE_SYMPY_NAMES = (
+    # 转换规则会生成的名称
+    "Integer", "Float", "Rational", "Symbol", "factorial", "factorial2",
+    # 初等函数
+    "sin", "cos", "tan", "cot", "sec", "csc", "asin", "acos", "atan", "atan2", "acot",
+    "sinh", "cosh", "tanh", "coth", "asinh", "acosh", "atanh",
+    "exp", "log", "sqrt", "cbrt", "root", "Abs", "sign", "floor", "ceiling", "Mod", "Min", "Max",
+    "re", "im", "conjugate", "Heaviside", "Piecewise",
+    # 特殊函数与组合函数
+    "gamma", "loggamma", "beta", "erf", "erfc", "binomial", "besselj", "bessely",
+    # 常量与符号运算（是否可以数值编译由 compile 检查）
+    "pi", "E", "I", "oo", "Integral", "Derivative", "Sum",
+)
+_GLOBAL_DICT = {"__builtins__": {}, **{name: getattr(sp, name) for name in _SAFE_SYMPY_NAMES}}
+
+# 禁止属性访问、双下划线、字符串、lambda 等可能逃逸的语法
+_FORBIDDEN = re.compile(r"__|\.\s*[A-Za-z_]|['\"`;\\\[\]{}]|\blambda\b|\bimport\b")
+
+
+def _normalize(source: str) -> str:
+    """去掉 np./math. 前缀等写法差异，得到统一的缓存键"""
+    source = source.strip()
+    source = re.sub(r"\b(?:np|numpy|math)\.", "", source)
+    return re.sub(r"\s+", " ", source)
+
+
+class CompiledExpression:
+    """已编译的表达式 - 可直接以数组调用，返回与输入广播形状一致的浮点数组"""
+
+    def __init__(self, source: str, variables: Tuple[str, ...], expr: sp.Expr, functions: str):
+        self.source = source
+        self.variables = variables
+        self.symbols = tuple(sp.Symbol(name) for name in variables)
+        self.expr = expr
+        self.functions = functions
+        try:
+            self.func = sp.lambdify(self.symbols, expr, modules=FUNCTION_SETS[functions])
+        except Exception as e:
+            # 如 Integral(x, x) 等无法生成数值代码的表达式
+            raise ExpressionError(f"表达式无法数值计算 '{source}': {e}") from e
+
+    def __call__(self, *args) -> np.ndarray:
+        arrays = [np.asarray(arg, dtype=float) for arg in args]
+        with np.errstate(all="ignore"):
+            result = np.asarray(self.func(*arrays))
+
+        if np.iscomplexobj(result):
+            # 复数结果只保留实数部分可信的点
+            result = np.where(np.abs(result.imag) < 1e-12, result.real, np.nan)
+        result = result.astype(float, copy=False)
+
+        # 常数表达式等情况下结果需要广播到输入形状
+        shape = np.broadcast_shapes(*(a.shape for a in arrays)) if arrays else ()
+        if result.shape != shape:
+            result = np.broadcast_to(result, shape).copy()
+        return result
+
+    def scalar(self, *args) -> float:
+        """以标量方式求值"""
+        return float(self(*args))
+
+
+class ExpressionManager:
+    """表达式管理器"""
+
+    def __init__(self, max_size: int = 256, enabled: bool = True):
+        self.max_size = max_size
+        self.enabled = enabled
+        self._cache: "OrderedDict[Tuple, CompiledExpression]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self.logger = logging.getLogger(__name__)
+
+    def parse(self, source: str, variables: Sequence[str] = ("x",),
+              parameters: Iterable[str] = ()) -> sp.Expr:
+        """安全解析表达式为 SymPy 表达式，只允许出现给定的变量和参数"""
+        source = _normalize(source)
+        if not source:
+            raise ExpressionError("表达式为空")
+        if _FORBIDDEN.search(source):
+            raise ExpressionError(f"表达式包含不允许的语法: {source}")
+
+        allowed = set(variables) | set(parameters)
+        local_dict = dict(_NAMESPACE)
+        for name in allowed:
+            local_dict[name] = sp.Symbol(name)
+
+        try:
+            # 必须传入受限的 global_dict：默认的全局名称中可以访问到 Python 内置函数
+            expr = parse_expr(source, local_dict=local_dict, global_dict=dict(_GLOBAL_DICT),
+                              transformations=_TRANSFORMATIONS)
+        except Exception as e:
+            raise ExpressionError(f"无法解析表达式 '{source}': {e}") from e
+
+        if not isinstance(expr, sp.Basic):
+            raise ExpressionError(f"表达式不是有效的数学表达式: {source}")
+
+        unknown_funcs = {type(f).__name__ for f in expr.atoms(AppliedUndef)}
+        if unknown_funcs:
+            raise ExpressionError(f"未知函数: {', '.join(sorted(unknown_funcs))}")
+
+        unknown_symbols = {s.name for s in expr.free_symbols} - allowed
+        if unknown_symbols:
+            raise ExpressionError(f"未知变量: {', '.join(sorted(unknown_symbols))}")
+
+        return expr
+
+    def compile(self, source: str, variables: Sequence[str] = ("x",),
+                functions: str = "numpy") -> CompiledExpression:
+        """解析并编译表达式（带LRU缓存）"""
+        if functions not in FUNCTION_SETS:
+            raise ValueError(f"未知的函数集: {functions}")
+
+        variables = tuple(variables)
+        key = (_normalize(source), variables, functions)
+
+        if self.enabled:
+            with self._lock:
+                compiled = self._cache.get(key)
+                if compiled is not None:
+                    self._cache.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return compiled
+                self.stats["misses"] += 1
+
+        expr = self.parse(source, variables)
+        compiled = CompiledExpression(key[0], variables, expr, functions)
+
+        if self.enabled:
+            with self._lock:
+                self._cache[key] = compiled
+                while len(self._cache) > self.max_size:
+                    self._cache.popitem(last=False)
+                    self.stats["evictions"] += 1
+        return compiled
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["size"] = len(self._cache)
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / total if total else 0.0
+        return stats
+
+
+def _create_expression_manager() -> ExpressionManager:
+    from core.config_manager import config_manager
+    return ExpressionManager(enabled=config_manager.get_config("performance.cache_enabled", True))
+
+
+# 全局表达式管理器实例
+expression_manager = _create_expression_manager()
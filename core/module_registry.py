@@ -0,0 +1,156 @@
+"""
+模块注册表 - 按需加载数学功能模块
+菜单只保存模块的点分导入路径，首次打开时才真正导入，缩短冷启动时间
+"""
+
+import importlib
+import logging
+import time
+from typing import Dict, List, Optional, Tuple, Type, Union
+import tkinter as tk
+
+
+class ModuleSpec:
+    """模块描述 - 记录显示名称与导入路径"""
+
+    def __init__(self, name: str, import_path: str, category: str = ""):
+        # import_path 形如 "modules.calculus.kehe:KeheApp"
+        if ":" not in import_path:
+            raise ValueError(f"模块路径格式错误（应为 'package.module:ClassName'）: {import_path}")
+
+        self.name = name
+        self.import_path = import_path
+        self.category = category
+        self.module_name, self.class_name = import_path.split(":", 1)
+
+        # 加载状态
+        self.loaded_class: Optional[Type] = None
+        self.import_time: Optional[float] = None  # 秒
+        self.error: Optional[Exception] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded_class is not None
+
+
+class ModuleRegistry:
+    """模块注册表"""
+
+    def __init__(self):
+        self.specs: Dict[str, ModuleSpec] = {}
+        self.startup_imports: List[Tuple[str, float]] = []
+        self._prefetch_queue: List[str] = []
+        self._prefetch_job = None
+        self.logger = logging.getLogger(__name__)
+
+    def register(self, name: str, import_path: str, category: str = "") -> ModuleSpec:
+        """注册模块路径（不会导入模块）"""
+        spec = ModuleSpec(name, import_path, category)
+        self.specs[import_path] = spec
+        return spec
+
+    def register_many(self, modules: Dict[str, str], category: str = "") -> Dict[str, str]:
+        """批量注册模块，返回原字典便于菜单页面直接使用"""
+        for name, import_path in modules.items():
+            self.register(name, import_path, category)
+        return modules
+
+    def get_spec(self, import_path: str) -> ModuleSpec:
+        """获取模块描述，未注册的路径会自动登记"""
+        spec = self.specs.get(import_path)
+        if spec is None:
+            spec = self.register(import_path.rsplit(":", 1)[-1], import_path)
+        return spec
+
+    def load(self, target: Union[str, Type]) -> Type:
+        """加载模块类，target 可以是导入路径或已经导入的类"""
+        if not isinstance(target, str):
+            return target
+
+        spec = self.get_spec(target)
+        if spec.loaded_class is not None:
+            return spec.loaded_class
+
+        start = time.perf_counter()
+        try:
+            module = importlib.import_module(spec.module_name)
+            spec.loaded_class = getattr(module, spec.class_name)
+            spec.error = None
+        except Exception as e:
+            spec.error = e
+            self.logger.error(f"模块导入失败 {spec.import_path}: {e}")
+            raise
+        finally:
+            spec.import_time = time.perf_counter() - start
+
+        self.logger.info(f"模块已加载: {spec.import_path} ({spec.import_time * 1000:.1f} ms)")
+        return spec.loaded_class
+
+    @staticmethod
+    def class_name_of(target: Union[str, Type]) -> str:
+        """在不导入模块的情况下获取类名（用作页面名称）"""
+        if isinstance(target, str):
+            return target.rsplit(":", 1)[-1]
+        return target.__name__
+
+    def record_startup_import(self, label: str, seconds: float):
+        """记录启动阶段的导入耗时"""
+        self.startup_imports.append((label, seconds))
+
+    def prefetch(self, root: tk.Misc, import_paths: Optional[List[str]] = None, delay: int = 50):
+        """空闲时逐个预加载模块，每次事件循环空闲只导入一个，避免界面卡顿"""
+        if import_paths is None:
+            import_paths = [path for path, spec in self.specs.items() if not spec.is_loaded]
+        self._prefetch_queue = list(import_paths)
+
+        def step():
+            self._prefetch_job = None
+            while self._prefetch_queue:
+                import_path = self._prefetch_queue.pop(0)
+                spec = self.get_spec(import_path)
+                if spec.is_loaded or spec.error is not None:
+                    continue
+                try:
+                    self.load(import_path)
+                except Exception:
+                    pass  # 错误已记录，打开模块时会再次提示
+                break
+
+            if self._prefetch_queue:
+                self._prefetch_job = root.after(delay, lambda: root.after_idle(step))
+            else:
+                self.logger.info("模块预加载完成")
+
+        self._prefetch_job = root.after(delay, lambda: root.after_idle(step))
+
+    def cancel_prefetch(self, root: tk.Misc):
+        """取消尚未完成的预加载"""
+        self._prefetch_queue.clear()
+        if self._prefetch_job is not None:
+            try:
+                root.after_cancel(self._prefetch_job)
+            except tk.TclError:
+                pass
+            self._prefetch_job = None
+
+    def get_import_report(self) -> str:
+        """生成导入耗时报告（首次导入的耗时包含其依赖库的加载时间）"""
+        lines = ["启动导入耗时:"]
+        for label, seconds in self.startup_imports:
+            lines.append(f"  {label:<45} {seconds * 1000:8.1f} ms")
+
+        lines.append("模块导入耗时:")
+        specs = sorted(self.specs.values(), key=lambda s: s.import_time or 0.0, reverse=True)
+        for spec in specs:
+            if spec.import_time is None:
+                status = "未加载"
+            elif spec.error is not None:
+                status = f"{spec.import_time * 1000:8.1f} ms (失败)"
+            else:
+                status = f"{spec.import_time * 1000:8.1f} ms"
+            lines.append(f"  {spec.name:<12} {spec.import_path:<45} {status}")
+        return "\n".join(lines)
+
+
+# 全局模块注册表实例
+module_registry = ModuleRegistry()
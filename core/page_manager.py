@@ -4,7 +4,8 @@
 """
 
 import tkinter as tk
-from typing import Dict, Type, Any, Optional, Callable
+from collections import OrderedDict
+from typing import Dict, Type, Any, Optional, Callable, Tuple
 import logging
 from effects.animations import fade_in, slide_in
 from themes.futuristic_theme import COLORS, FONTS
@@ -44,18 +45,29 @@ class BasePage(tk.Frame):
     def cleanup(self):
         """页面清理，子类可以重写"""
         pass
+    
+    def estimate_memory(self) -> int:
+        """估算页面占用的内存（字节），用于页面缓存的内存预算，子类可以重写"""
+        return 0
 
 
 class PageManager:
     """页面管理器 - 管理应用的所有页面并提供流畅切换"""
     
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, max_live_pages: int = 6, memory_budget_mb: float = 0):
         self.root = root
         self.pages: Dict[str, BasePage] = {}
         self.current_page: Optional[str] = None
         self.page_history = []
         self.navbar = None
         
+        # 可回收页面的LRU缓存：被回收的页面在再次访问时按登记的工厂参数重建
+        self.max_live_pages = max_live_pages          # 0 表示不限数量
+        self.memory_budget = memory_budget_mb * 1024 * 1024  # 0 表示不限内存
+        self.page_factories: Dict[str, Tuple[Type[BasePage], Dict[str, Any]]] = {}
+        self.lru_pages: "OrderedDict[str, None]" = OrderedDict()
+        self.cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+        
         # 创建主容器
         self.container = tk.Frame(root, bg=COLORS["bg_light"])
         self.container.pack(fill=tk.BOTH, expand=True)
@@ -72,8 +84,12 @@ class PageManager:
         if self.navbar:
             self.navbar.update_title(title)
         
-    def register_page(self, name: str, page_class: Type[BasePage], **kwargs) -> BasePage:
-        """注册页面类"""
+    def register_page(self, name: str, page_class: Type[BasePage], evictable: bool = False, **kwargs) -> BasePage:
+        """注册页面类
+        
+        evictable 为 True 的页面受LRU缓存管理，超出数量或内存预算时会被回收，
+        再次显示时用相同的参数重新创建。需要在注册后额外配置的页面（如菜单页）不应设为可回收。
+        """
         try:
             # 创建页面实例
             page = page_class(self.container, controller=self, **kwargs)
@@ -81,6 +97,9 @@ class PageManager:
             page.grid_remove()  # 初始隐藏
             
             self.pages[name] = page
+            if evictable:
+                self.page_factories[name] = (page_class, kwargs)
+                self.lru_pages[name] = None
             self.logger.info(f"页面已注册: {name}")
             return page
             
@@ -92,11 +111,21 @@ class PageManager:
         """显示指定页面"""
         print(f"show_page called with page name: {name}")
         if name not in self.pages:
-            self.logger.error(f"页面未找到: {name}")
-            return False
+            if name not in self.page_factories:
+                self.logger.error(f"页面未找到: {name}")
+                return False
+            # 页面已被回收，重新创建
+            page_class, page_kwargs = self.page_factories[name]
+            self.register_page(name, page_class, evictable=True, **page_kwargs)
+            self.cache_stats["misses"] += 1
+        elif name in self.lru_pages:
+            self.cache_stats["hits"] += 1
+        
+        if name in self.lru_pages:
+            self.lru_pages.move_to_end(name)
         
         # 隐藏当前页面
-        if self.current_page:
+        if self.current_page and self.current_page in self.pages:
             old_page = self.pages[self.current_page]
             old_page.on_hide()
             old_page.grid_remove()
@@ -118,8 +147,50 @@ class PageManager:
         
         self.current_page = name
         self.logger.info(f"切换到页面: {name}")
+        
+        self._enforce_page_budget()
         return True
     
+    def _enforce_page_budget(self):
+        """按LRU顺序回收超出数量或内存预算的页面（当前页面不会被回收）"""
+        def over_budget() -> bool:
+            if self.max_live_pages and len(self.lru_pages) > self.max_live_pages:
+                return True
+            if self.memory_budget:
+                total = sum(self.pages[n].estimate_memory() for n in self.lru_pages)
+                return total > self.memory_budget
+            return False
+        
+        while over_budget():
+            victim = next((n for n in self.lru_pages if n != self.current_page), None)
+            if victim is None:
+                break
+            self.evict_page(victim)
+    
+    def evict_page(self, name: str) -> bool:
+        """回收页面：清理资源并销毁组件，保留工厂参数以便再次访问时重建"""
+        if name not in self.page_factories or name not in self.pages or name == self.current_page:
+            return False
+        
+        page = self.pages.pop(name)
+        self.lru_pages.pop(name, None)
+        try:
+            page.cleanup()
+        except Exception as e:
+            self.logger.warning(f"页面清理失败 {name}: {e}")
+        page.destroy()
+        
+        self.cache_stats["evictions"] += 1
+        self.logger.info(f"页面已回收: {name}")
+        return True
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """获取页面缓存统计（命中、未命中、回收次数和当前存活页面）"""
+        stats = dict(self.cache_stats)
+        stats["live_pages"] = list(self.lru_pages)
+        stats["memory_bytes"] = sum(self.pages[n].estimate_memory() for n in self.lru_pages)
+        return stats
+    
     def go_back(self) -> bool:
         """返回上一页面"""
         if not self.page_history:
@@ -131,13 +202,17 @@ class PageManager:
     def get_current_page(self) -> Optional[BasePage]:
         """获取当前页面实例"""
         if self.current_page:
-            return self.pages[self.current_page]
+            return self.pages.get(self.current_page)
         return None
     
     def get_page(self, name: str) -> Optional[BasePage]:
         """获取指定页面实例"""
         return self.pages.get(name)
     
+    def has_page(self, name: str) -> bool:
+        """页面是否已注册（包括已被回收、可重建的页面）"""
+        return name in self.pages or name in self.page_factories
+    
     def clear_history(self):
         """清空页面历史"""
         self.page_history.clear()
@@ -5,13 +5,73 @@
 
 import tkinter as tk
 from tkinter import ttk
-from typing import List, Dict, Callable, Optional, Tuple
+from typing import List, Dict, Callable, Optional, Tuple, Set
 import re
+import heapq
+from collections import Counter
 from difflib import SequenceMatcher
 import logging
 
 from themes.futuristic_theme import COLORS, FONTS
 
+# 拼音首字母索引为可选功能
+try:
+    from pypinyin import lazy_pinyin, Style
+except ImportError:
+    lazy_pinyin = None
+
+
+def _char_ngrams(text: str, unigrams: bool = True) -> Set[str]:
+    """提取字符二元组（可选包含一元组；中文按字、英文按字母）"""
+    text = re.sub(r"\s+", " ", text)
+    grams = set(text.replace(" ", "")) if unigrams else set()
+    grams.update(text[i:i + 2] for i in range(len(text) - 1) if " " not in text[i:i + 2])
+    return grams
+
+
+def _query_ngrams(query: str) -> Set[str]:
+    """按空白分词提取查询n元组：单字的词取一元组，其余取二元组（多词查询中的单字不会被丢掉）"""
+    grams = set()
+    for token in query.split():
+        grams |= _char_ngrams(token, unigrams=len(token) < 2)
+    return grams
+
+
+def _pinyin_initials(text: str) -> str:
+    """中文转拼音首字母，如 "方程可视化" -> "fckshh"；未安装 pypinyin 时返回空串"""
+    if lazy_pinyin is None:
+        return ""
+    return "".join(lazy_pinyin(text, style=Style.FIRST_LETTER)).lower()
+
+
+class _TrieNode:
+    __slots__ = ("children", "items")
+    
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.items: Set[int] = set()  # 以该前缀开头的所有搜索项
+
+
+class _PrefixTrie:
+    """前缀树 - 每个节点保存以该前缀开头的搜索项，查询耗时只与查询长度有关"""
+    
+    def __init__(self):
+        self.root = _TrieNode()
+    
+    def insert(self, word: str, item_id: int):
+        node = self.root
+        for ch in word:
+            node = node.children.setdefault(ch, _TrieNode())
+            node.items.add(item_id)
+    
+    def lookup(self, prefix: str) -> Set[int]:
+        node = self.root
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return set()
+        return node.items
+
 
 class SearchItem:
     """搜索项"""
@@ -32,6 +92,13 @@ class SearchItem:
         
         # 计算搜索权重用的文本
         self.search_text = f"{title} {description} {' '.join(keywords)}".lower()
+        
+        # 索引用的预处理数据
+        self.title_lower = title.lower()
+        self.description_lower = description.lower()
+        self.keywords_lower = [keyword.lower() for keyword in keywords]
+        self.pinyin_initials = _pinyin_initials(title)
+        self.ngrams = _char_ngrams(self.search_text)
     
     def get_similarity(self, query: str) -> float:
         """计算与查询的相似度"""
@@ -64,6 +131,8 @@ class SearchWidget(tk.Frame):
         # 搜索状态
         self.is_expanded = False
         self.search_results = []
+        self.debounce_ms = 120
+        self._search_job = None
         
         self._create_search_ui()
     
@@ -128,14 +197,25 @@ class SearchWidget(tk.Frame):
         self.results_listbox.bind('<Escape>', self._hide_results)
     
     def _on_search_change(self, *args):
-        """搜索内容变化时的处理"""
-        query = self.search_var.get().strip()
+        """搜索内容变化时的处理（防抖：停止输入 debounce_ms 后才搜索）"""
+        if self._search_job:
+            self.after_cancel(self._search_job)
+            self._search_job = None
         
+        if not self.search_var.get().strip():
+            self._hide_results()
+            return
+        
+        self._search_job = self.after(self.debounce_ms, self._run_search)
+    
+    def _run_search(self):
+        """执行搜索"""
+        self._search_job = None
+        query = self.search_var.get().strip()
         if not query:
             self._hide_results()
             return
         
-        # 执行搜索
         results = self.search_manager.search(query)
         self._show_results(results)
     
@@ -168,6 +248,10 @@ class SearchWidget(tk.Frame):
     
     def _on_search_enter(self, event):
         """回车键处理"""
+        if self._search_job:
+            # 还在防抖等待中，立即搜索
+            self.after_cancel(self._search_job)
+            self._run_search()
         if self.search_results:
             self._execute_first_result()
     
@@ -214,10 +298,16 @@ class SearchManager:
         self.items: List[SearchItem] = []
         self.categories: Dict[str, List[SearchItem]] = {}
         self.logger = logging.getLogger(__name__)
+        
+        # 索引：字符n元组倒排索引 + 标题/关键字/拼音首字母前缀树
+        self.ngram_index: Dict[str, Set[int]] = {}
+        self.prefix_trie = _PrefixTrie()
     
     def register_item(self, item: SearchItem):
         """注册搜索项"""
+        item_id = len(self.items)
         self.items.append(item)
+        self._index_item(item_id, item)
         
         # 按类别组织
         if item.category not in self.categories:
@@ -269,22 +359,60 @@ class SearchManager:
         
         self.register_item(item)
     
+    def _index_item(self, item_id: int, item: SearchItem):
+        """把搜索项加入索引"""
+        for gram in item.ngrams:
+            self.ngram_index.setdefault(gram, set()).add(item_id)
+        
+        words = [item.title_lower] + item.title_lower.split() + item.keywords_lower
+        if item.pinyin_initials:
+            words.append(item.pinyin_initials)
+        for word in words:
+            if word:
+                self.prefix_trie.insert(word, item_id)
+    
+    def _score(self, item: SearchItem, query: str, coverage: float) -> float:
+        """与 SearchItem.get_similarity 相同的分级，模糊部分用n元组覆盖率代替逐字符比对"""
+        if coverage >= 1.0:
+            # 只有n元组全部命中的项才可能包含完整的查询串
+            if query in item.title_lower:
+                return 1.0
+            if query in item.description_lower:
+                return 0.8
+            if any(query in keyword for keyword in item.keywords_lower):
+                return 0.6
+        if item.pinyin_initials and item.pinyin_initials.startswith(query):
+            return 0.6
+        return coverage * 0.4
+    
     def search(self, query: str, limit: int = 10) -> List[Tuple[SearchItem, float]]:
-        """执行搜索"""
-        if not query.strip():
+        """执行搜索（通过倒排索引统计n元组命中数，只对候选项评分，取前 limit 个）"""
+        query = query.strip().lower()
+        if not query:
             return []
         
-        results = []
+        query = " ".join(query.split())
+        query_grams = _query_ngrams(query)
         
-        for item in self.items:
-            similarity = item.get_similarity(query)
-            if similarity > 0.1:  # 最低相似度阈值
-                results.append((item, similarity))
+        # 统计每个搜索项命中的查询n元组数量
+        hit_counts = Counter()
+        for gram in query_grams:
+            hit_counts.update(self.ngram_index.get(gram, ()))
         
-        # 按相似度排序
-        results.sort(key=lambda x: x[1], reverse=True)
+        # 前缀匹配（标题、关键字、拼音首字母）的项也作为候选
+        for item_id in self.prefix_trie.lookup(query):
+            hit_counts.setdefault(item_id, 0)
+        
+        scored = []
+        gram_count = len(query_grams)
+        for item_id, hits in hit_counts.items():
+            similarity = self._score(self.items[item_id], query, hits / gram_count)
+            if similarity > 0.1:  # 最低相似度阈值
+                scored.append((similarity, -item_id))
         
-        return results[:limit]
+        # 按相似度取前k个（相同分数按注册顺序）
+        top = heapq.nlargest(limit, scored)
+        return [(self.items[-neg_id], similarity) for similarity, neg_id in top]
     
     def get_categories(self) -> List[str]:
         """获取所有类别"""
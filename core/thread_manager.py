@@ -3,14 +3,19 @@
 提供线程池、任务队列和进度反馈功能，确保UI不会卡顿
 """
 
-import threading
+import os
 import queue
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, Future
-from typing import Callable, Any, Optional, Dict
+import importlib
+import inspect
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, CancelledError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Any, Optional, Dict, Tuple, Deque, List
 import logging
 import tkinter as tk
-from functools import wraps
+from functools import wraps, partial
 
 from themes.futuristic_theme import COLORS, FONTS
 
@@ -24,6 +29,188 @@ class TaskResult:
         self.result = result
         self.error = error
         self.timestamp = time.time()
+        
+        # 延迟统计时间点（time.time()，可跨进程比较）
+        self.submitted_at: Optional[float] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.callback_started_at: Optional[float] = None
+        self.callback_finished_at: Optional[float] = None
+    
+    def get_latency(self) -> Dict[str, Optional[float]]:
+        """获取各阶段耗时（秒）：排队、执行、分发等待、回调"""
+        def span(begin, end):
+            if begin is None or end is None:
+                return None
+            return max(0.0, end - begin)
+        
+        return {
+            "queue": span(self.submitted_at, self.started_at),
+            "run": span(self.started_at, self.finished_at),
+            "dispatch": span(self.finished_at, self.callback_started_at),
+            "callback": span(self.callback_started_at, self.callback_finished_at),
+            "total": span(self.submitted_at, self.callback_finished_at),
+        }
+
+
+class TaskCancelledError(Exception):
+    """任务被取消（由取消令牌触发）"""
+
+
+class CancellationToken:
+    """协作式取消令牌 - 长时间运行的计算可定期检查并提前退出
+    
+    进程池任务中的令牌会被序列化为一个新的未取消令牌，
+    此时只能在任务开始前取消，结果仍会被丢弃。
+    """
+    
+    def __init__(self):
+        self._event = threading.Event()
+    
+    def cancel(self):
+        """请求取消"""
+        self._event.set()
+    
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+    
+    def raise_if_cancelled(self):
+        """已取消时抛出 TaskCancelledError"""
+        if self._event.is_set():
+            raise TaskCancelledError()
+    
+    def __reduce__(self):
+        return (CancellationToken, ())
+
+
+class TaskDescriptor:
+    """任务描述符 - 可序列化的任务定义，供线程池或进程池执行
+    
+    使用进程池时 func 必须是模块级函数（或其 functools.partial），
+    参数和返回值也必须可以被 pickle。
+    """
+    
+    def __init__(self, task_id: str, func: Callable, args: Tuple = (), kwargs: Optional[Dict[str, Any]] = None):
+        self.task_id = task_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.submitted_at = time.time()
+
+
+def _execute_descriptor(descriptor: TaskDescriptor) -> TaskResult:
+    """执行任务描述符（在工作线程或子进程中运行）"""
+    started_at = time.time()
+    try:
+        result = descriptor.func(*descriptor.args, **descriptor.kwargs)
+        task_result = TaskResult(descriptor.task_id, True, result)
+    except Exception as e:
+        task_result = TaskResult(descriptor.task_id, False, None, e)
+    
+    task_result.submitted_at = descriptor.submitted_at
+    task_result.started_at = started_at
+    task_result.finished_at = time.time()
+    return task_result
+
+
+def _call_by_reference(module_name: str, qualname: str, *args, **kwargs):
+    """按模块路径查找函数并调用，用于在子进程中执行被装饰器包装的函数"""
+    target = importlib.import_module(module_name)
+    for attr in qualname.split("."):
+        target = getattr(target, attr)
+    return inspect.unwrap(target)(*args, **kwargs)
+
+
+def _init_process_worker():
+    """子进程初始化：降低优先级，把CPU让给界面主循环"""
+    if hasattr(os, "nice"):
+        try:
+            os.nice(5)
+        except OSError:
+            pass
+
+
+class ProgressChannel:
+    """进度通道 - 任务线程写入进度，界面线程按限定频率读取
+    
+    任务可以调用 report(已完成, 总数) 或 set_fraction(比例)，
+    通道会计算吞吐量（项/秒，指数滑动平均）和剩余时间。
+    进程池任务中的通道会被序列化为一个新的独立通道，报告的进度不会回传。
+    """
+    
+    def __init__(self, total: Optional[float] = None, min_interval: float = 0.1):
+        self.min_interval = min_interval  # 界面刷新最小间隔（秒）
+        self._lock = threading.Lock()
+        self._total = total
+        self._completed = 0.0
+        self._fraction: Optional[float] = None
+        self._message: Optional[str] = None
+        self._rate: Optional[float] = None
+        self._last_sample = (time.time(), 0.0)
+        self._version = 0
+        self._polled_version = 0
+        self._last_poll = 0.0
+    
+    def report(self, completed: float, total: Optional[float] = None, message: Optional[str] = None):
+        """报告已完成的工作量"""
+        now = time.time()
+        with self._lock:
+            if total is not None:
+                self._total = total
+            
+            # 吞吐量：指数滑动平均，避免数值剧烈抖动
+            last_time, last_completed = self._last_sample
+            elapsed = now - last_time
+            if elapsed >= 0.05 and completed >= last_completed:
+                rate = (completed - last_completed) / elapsed
+                self._rate = rate if self._rate is None else 0.7 * self._rate + 0.3 * rate
+                self._last_sample = (now, completed)
+            
+            self._completed = completed
+            if self._total:
+                self._fraction = min(1.0, completed / self._total)
+            if message is not None:
+                self._message = message
+            self._version += 1
+    
+    def advance(self, amount: float = 1, message: Optional[str] = None):
+        """在当前进度上累加"""
+        self.report(self._completed + amount, message=message)
+    
+    def set_fraction(self, fraction: float, message: Optional[str] = None):
+        """直接设置完成比例（0~1），适用于没有明确工作量的任务"""
+        with self._lock:
+            self._fraction = max(0.0, min(1.0, fraction))
+            if message is not None:
+                self._message = message
+            self._version += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """获取当前进度快照"""
+        with self._lock:
+            eta = None
+            if self._rate and self._total:
+                eta = max(0.0, (self._total - self._completed) / self._rate)
+            return {
+                "fraction": self._fraction,
+                "throughput": self._rate,
+                "eta": eta,
+                "message": self._message,
+            }
+    
+    def poll(self) -> Optional[Dict[str, Any]]:
+        """界面线程调用：有新进度且距上次刷新超过 min_interval 时返回快照，否则返回 None"""
+        now = time.time()
+        with self._lock:
+            if self._version == self._polled_version or now - self._last_poll < self.min_interval:
+                return None
+            self._polled_version = self._version
+            self._last_poll = now
+        return self.snapshot()
+    
+    def __reduce__(self):
+        return (ProgressChannel, (None, self.min_interval))
 
 
 class ProgressOverlay:
@@ -35,6 +222,8 @@ class ProgressOverlay:
         self.overlay = None
         self.progress_bar = None
         self.message_label = None
+        self.detail_label = None
+        self.is_determinate = False
         self.is_visible = False
         
     def show(self):
@@ -98,9 +287,19 @@ class ProgressOverlay:
             style="Custom.Horizontal.TProgressbar",
             length=200
         )
-        self.progress_bar.pack(pady=(0, 20), padx=20)
+        self.progress_bar.pack(pady=(0, 5), padx=20)
         self.progress_bar.start(10)  # 动画速度
         
+        # 吞吐量与剩余时间
+        self.detail_label = tk.Label(
+            content_frame,
+            text="",
+            font=FONTS["small"],
+            bg=COLORS["bg_medium"],
+            fg=COLORS["text_secondary"]
+        )
+        self.detail_label.pack(pady=(0, 15))
+        
         # 设置为模态
         self.overlay.transient(self.parent.winfo_toplevel())
         self.overlay.grab_set()
@@ -110,10 +309,38 @@ class ProgressOverlay:
             self.overlay.update()
     
     def update_message(self, message: str):
-        """更新进度消息"""
+        """更新进度消息（由主循环负责重绘）"""
+        self.message = message
         if self.message_label:
             self.message_label.config(text=message)
-            self.overlay.update()
+    
+    def set_progress(self, fraction: Optional[float] = None,
+                     throughput: Optional[float] = None,
+                     eta: Optional[float] = None,
+                     message: Optional[str] = None):
+        """显示确定进度：完成比例、吞吐量（项/秒）和剩余时间（秒）"""
+        if not self.is_visible or not self.progress_bar:
+            return
+        
+        if message:
+            self.update_message(message)
+        
+        if fraction is not None:
+            if not self.is_determinate:
+                self.progress_bar.stop()
+                self.progress_bar.config(mode='determinate', maximum=100)
+                self.is_determinate = True
+            self.progress_bar['value'] = fraction * 100
+        
+        details = []
+        if fraction is not None:
+            details.append(f"{fraction * 100:.0f}%")
+        if throughput is not None:
+            details.append(f"{throughput:,.0f} 项/秒")
+        if eta is not None:
+            details.append(f"剩余 {eta:.0f} 秒" if eta >= 1 else "即将完成")
+        if self.detail_label:
+            self.detail_label.config(text="  ·  ".join(details))
     
     def hide(self):
         """隐藏进度遮罩"""
@@ -133,126 +360,359 @@ class ProgressOverlay:
 class ThreadManager:
     """线程管理器"""
     
-    def __init__(self, max_workers: int = 4):
+    BACKEND_THREAD = "thread"
+    BACKEND_PROCESS = "process"
+    
+    def __init__(self, max_workers: int = 4, max_processes: Optional[int] = None,
+                 dispatch_interval: int = 16, progress_interval: int = 100):
         self.max_workers = max_workers
+        self.max_processes = max_processes or self._default_process_count()
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.process_executor: Optional[ProcessPoolExecutor] = None  # 首次使用时创建
+        self._process_lock = threading.Lock()  # 主线程提交与后台线程 map 可能同时创建/重建进程池
         self.result_queue = queue.Queue()
         self.active_tasks: Dict[str, Future] = {}
+        self.task_tokens: Dict[str, CancellationToken] = {}
+        self.keyed_tasks: Dict[str, str] = {}  # 任务键 -> 最新任务ID
+        self.progress_channels: Dict[str, Tuple[ProgressChannel, Optional[ProgressOverlay]]] = {}
+        self.progress_interval = progress_interval  # 进度刷新最小间隔（毫秒）
         self.task_counter = 0
         
+        # 结果分发：在Tk主循环中通过after定时批量处理
+        self.dispatch_interval = dispatch_interval  # 毫秒
+        self.root: Optional[tk.Misc] = None
+        self._dispatch_job = None
+        
+        # 最近任务的延迟统计
+        self.latency_history: Deque[Dict[str, Optional[float]]] = deque(maxlen=200)
+        
         # 日志
         self.logger = logging.getLogger(__name__)
         
-        # 启动结果处理线程
-        self.result_thread = threading.Thread(target=self._process_results, daemon=True)
-        self.result_thread.start()
-        
-        self.logger.info(f"线程管理器初始化完成，最大工作线程数: {max_workers}")
+        self.logger.info(f"线程管理器初始化完成，最大工作线程数: {max_workers}，最大进程数: {self.max_processes}")
+    
+    @staticmethod
+    def _default_process_count() -> int:
+        """默认进程数：保留一个核心给界面主循环"""
+        return max(1, (os.cpu_count() or 2) - 1)
+    
+    def _get_process_executor(self) -> ProcessPoolExecutor:
+        """获取进程池（延迟创建）"""
+        with self._process_lock:
+            if self.process_executor is None:
+                self.process_executor = ProcessPoolExecutor(
+                    max_workers=self.max_processes,
+                    initializer=_init_process_worker
+                )
+                self.logger.info(f"进程池已创建，进程数: {self.max_processes}")
+            return self.process_executor
+    
+    def _reset_process_executor(self, broken: ProcessPoolExecutor):
+        """子进程异常退出后丢弃损坏的进程池，下次使用时重建"""
+        with self._process_lock:
+            if self.process_executor is broken:
+                self.logger.warning("进程池已损坏，正在重建")
+                self.process_executor = None
+        broken.shutdown(wait=False)
+    
+    def attach(self, root: tk.Misc):
+        """绑定Tk根窗口并启动结果分发循环，回调与遮罩操作都在主线程中执行"""
+        if self.root is root and self._dispatch_job is not None:
+            return
+        self.detach()
+        self.root = root
+        self._dispatch_job = root.after(self.dispatch_interval, self._dispatch_tick)
+    
+    def detach(self):
+        """停止结果分发循环"""
+        if self.root is not None and self._dispatch_job is not None:
+            try:
+                self.root.after_cancel(self._dispatch_job)
+            except tk.TclError:
+                pass
+        self._dispatch_job = None
+        self.root = None
+    
+    def _dispatch_tick(self):
+        """分发定时器：每个周期批量处理所有已完成的结果"""
+        self._dispatch_job = None
+        self.process_pending_results()
+        self.update_progress()
+        if self.root is not None:
+            try:
+                self._dispatch_job = self.root.after(self.dispatch_interval, self._dispatch_tick)
+            except tk.TclError:
+                # 窗口已销毁
+                self.root = None
     
     def submit_task(self, 
                    func: Callable,
                    callback: Optional[Callable[[TaskResult], None]] = None,
                    progress_parent: Optional[tk.Widget] = None,
                    progress_message: str = "正在计算...",
-                   *args, **kwargs) -> str:
-        """提交计算任务"""
+                   *args,
+                   backend: str = BACKEND_THREAD,
+                   key: Optional[str] = None,
+                   pass_token: bool = False,
+                   pass_progress: bool = False,
+                   **kwargs) -> str:
+        """提交计算任务
+        
+        backend 为 "thread" 时在线程池中执行；为 "process" 时在进程池中执行，
+        适合受GIL限制的CPU密集型任务（func、参数和返回值需可pickle）。
+        
+        key 不为空时采用"最新优先"策略：同一键的旧任务会被取消（未开始的直接撤销，
+        运行中的通过取消令牌通知），其结果不会再触发回调。
+        pass_token 为 True 时以 cancel_token 关键字参数把取消令牌传给 func。
+        pass_progress 为 True 时以 progress 关键字参数传入 ProgressChannel，
+        汇报的进度会按 progress_interval 限频显示在进度遮罩上。
+        """
+        if backend not in (self.BACKEND_THREAD, self.BACKEND_PROCESS):
+            raise ValueError(f"未知的执行后端: {backend}")
         
         # 生成任务ID
         self.task_counter += 1
         task_id = f"task_{self.task_counter}_{int(time.time())}"
         
+        # 同一键的旧任务被新任务取代
+        if key is not None:
+            previous_id = self.keyed_tasks.get(key)
+            if previous_id is not None:
+                self.cancel_task(previous_id)
+            self.keyed_tasks[key] = task_id
+        
+        token = CancellationToken()
+        self.task_tokens[task_id] = token
+        if pass_token:
+            kwargs["cancel_token"] = token
+        
+        # 未绑定主窗口时，使用进度遮罩所在的顶层窗口驱动结果分发
+        if self.root is None and progress_parent is not None:
+            self.attach(progress_parent.winfo_toplevel())
+        
         # 显示进度遮罩
         overlay = None
         if progress_parent:
             overlay = ProgressOverlay(progress_parent, progress_message)
             overlay.show()
         
-        # 包装任务函数
-        def wrapped_task():
-            try:
-                result = func(*args, **kwargs)
-                task_result = TaskResult(task_id, True, result)
-            except Exception as e:
-                self.logger.error(f"任务执行失败 {task_id}: {e}")
-                task_result = TaskResult(task_id, False, None, e)
-            
-            # 将结果放入队列
-            self.result_queue.put((task_result, callback, overlay))
-            return task_result
+        if pass_progress:
+            channel = ProgressChannel(min_interval=self.progress_interval / 1000)
+            kwargs["progress"] = channel
+            self.progress_channels[task_id] = (channel, overlay)
+        
+        descriptor = TaskDescriptor(task_id, func, args, kwargs)
         
         # 提交任务
-        future = self.executor.submit(wrapped_task)
+        if backend == self.BACKEND_PROCESS:
+            executor = self._get_process_executor()
+            try:
+                future = executor.submit(_execute_descriptor, descriptor)
+            except BrokenProcessPool:
+                self._reset_process_executor(executor)
+                future = self._get_process_executor().submit(_execute_descriptor, descriptor)
+        else:
+            future = self.executor.submit(_execute_descriptor, descriptor)
+        
         self.active_tasks[task_id] = future
+        future.add_done_callback(partial(self._on_future_done, task_id, callback, overlay))
         
-        self.logger.info(f"任务已提交: {task_id}")
+        self.logger.info(f"任务已提交: {task_id} ({backend})")
         return task_id
     
-    def _process_results(self):
-        """处理任务结果（在主线程中执行回调）"""
+    def _on_future_done(self, task_id: str, callback, overlay, future: Future):
+        """任务结束时将结果放入队列（在工作线程中调用）"""
+        if future.cancelled():
+            # 已取消的任务不执行回调，只需关闭进度遮罩
+            task_result = TaskResult(task_id, False, None, CancelledError())
+            task_result.finished_at = time.time()
+            callback = None
+        elif future.exception() is not None:
+            # 序列化失败、进程崩溃等执行器层面的错误
+            task_result = TaskResult(task_id, False, None, future.exception())
+            task_result.finished_at = time.time()
+        else:
+            task_result = future.result()
+        
+        if not task_result.success and not future.cancelled() \
+                and not isinstance(task_result.error, TaskCancelledError):
+            self.logger.error(f"任务执行失败 {task_id}: {task_result.error}")
+        
+        self.result_queue.put((task_result, callback, overlay))
+    
+    def process_pending_results(self) -> int:
+        """处理队列中所有已完成的结果，必须在主线程中调用，返回处理的数量"""
+        processed = 0
         while True:
             try:
-                task_result, callback, overlay = self.result_queue.get(timeout=1)
-                
+                task_result, callback, overlay = self.result_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            processed += 1
+            try:
                 # 移除活动任务
-                if task_result.task_id in self.active_tasks:
-                    del self.active_tasks[task_result.task_id]
+                self.active_tasks.pop(task_result.task_id, None)
+                token = self.task_tokens.pop(task_result.task_id, None)
+                self.progress_channels.pop(task_result.task_id, None)
+                self._release_key(task_result.task_id)
                 
                 # 隐藏进度遮罩
                 if overlay:
                     overlay.hide()
                 
+                # 已取消或被取代的任务结果已过期，不再回调
+                if token is not None and token.is_cancelled:
+                    callback = None
+                    self.logger.info(f"丢弃过期结果: {task_result.task_id}")
+                
                 # 执行回调
+                task_result.callback_started_at = time.time()
                 if callback:
                     try:
                         callback(task_result)
                     except Exception as e:
                         self.logger.error(f"回调执行失败: {e}")
+                task_result.callback_finished_at = time.time()
                 
+                self.latency_history.append(task_result.get_latency())
                 self.logger.info(f"任务完成: {task_result.task_id}")
                 
-            except queue.Empty:
-                continue
             except Exception as e:
                 self.logger.error(f"结果处理失败: {e}")
+        
+        return processed
+    
+    def update_progress(self):
+        """把各任务的最新进度刷新到进度遮罩（主线程调用，已按通道限频）"""
+        for channel, overlay in list(self.progress_channels.values()):
+            if overlay is None:
+                continue
+            snapshot = channel.poll()
+            if snapshot is not None:
+                try:
+                    overlay.set_progress(**snapshot)
+                except tk.TclError:
+                    pass
+    
+    def get_progress(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """获取任务的进度快照"""
+        entry = self.progress_channels.get(task_id)
+        return entry[0].snapshot() if entry else None
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """汇总最近任务的延迟（毫秒）：每个阶段的平均值和最大值"""
+        stats = {}
+        for stage in ("queue", "run", "dispatch", "callback", "total"):
+            values: List[float] = [m[stage] for m in self.latency_history if m[stage] is not None]
+            if values:
+                stats[stage] = {
+                    "count": len(values),
+                    "avg_ms": sum(values) / len(values) * 1000,
+                    "max_ms": max(values) * 1000,
+                }
+        return stats
+    
+    def map(self, func: Callable, items, backend: str = BACKEND_THREAD,
+            timeout: Optional[float] = None) -> List[Any]:
+        """并行执行 func(item) 并阻塞等待全部结果（按输入顺序返回）
+        
+        用于可拆分的批量计算（如多条曲线分别求值）；NumPy 运算会释放GIL，线程池即可并行。
+        使用进程池时 func 与 items 需可pickle；该方法会阻塞，界面中应在后台任务里调用。
+        """
+        if backend != self.BACKEND_PROCESS:
+            return list(self.executor.map(func, items, timeout=timeout))
+        items = list(items)
+        executor = self._get_process_executor()
+        try:
+            return list(executor.map(func, items, timeout=timeout))
+        except BrokenProcessPool:
+            # 某个子进程崩溃后整个进程池不可再用，重建后重试一次
+            self._reset_process_executor(executor)
+            return list(self._get_process_executor().map(func, items, timeout=timeout))
+    
+    def _release_key(self, task_id: str):
+        """任务结束后释放其占用的任务键"""
+        for key, latest_id in list(self.keyed_tasks.items()):
+            if latest_id == task_id:
+                del self.keyed_tasks[key]
     
     def cancel_task(self, task_id: str) -> bool:
-        """取消任务"""
+        """取消任务：未开始的任务直接撤销，运行中的任务通过取消令牌通知，结果均被丢弃"""
+        token = self.task_tokens.get(task_id)
+        if token is not None:
+            token.cancel()
+        
         if task_id in self.active_tasks:
             future = self.active_tasks[task_id]
             success = future.cancel()
             if success:
-                del self.active_tasks[task_id]
+                self.active_tasks.pop(task_id, None)
                 self.logger.info(f"任务已取消: {task_id}")
-            return success
+            else:
+                self.logger.info(f"已请求取消运行中的任务: {task_id}")
+            return success or token is not None
         return False
     
+    def cancel_key(self, key: str) -> bool:
+        """取消指定键的最新任务"""
+        task_id = self.keyed_tasks.get(key)
+        if task_id is None:
+            return False
+        return self.cancel_task(task_id)
+    
     def get_active_task_count(self) -> int:
         """获取活动任务数量"""
         return len(self.active_tasks)
     
     def shutdown(self, wait: bool = True):
-        """关闭线程池"""
+        """关闭线程池和进程池"""
+        self.detach()
         self.executor.shutdown(wait=wait)
+        with self._process_lock:
+            process_executor, self.process_executor = self.process_executor, None
+        if process_executor is not None:
+            # 退出时不再等待排队中的进程池任务（流线、临界点等结果已无人接收）
+            process_executor.shutdown(wait=wait, cancel_futures=True)
         self.logger.info("线程管理器已关闭")
 
 
 # 装饰器：自动异步执行
 def async_task(progress_message: str = "处理中...", 
-               show_progress: bool = True):
-    """装饰器：将函数标记为异步执行"""
+               show_progress: bool = True,
+               backend: str = ThreadManager.BACKEND_THREAD,
+               key: Optional[str] = None,
+               cancellable: bool = False,
+               reports_progress: bool = False):
+    """装饰器：将函数标记为异步执行
+    
+    backend="process" 时函数在进程池中执行，被装饰的函数必须定义在模块顶层。
+    key 指定"最新优先"的任务键（调用时可用 _key 覆盖）；
+    cancellable=True 时函数需接受 cancel_token 关键字参数；
+    reports_progress=True 时函数需接受 progress 关键字参数（ProgressChannel）。
+    """
     
     def decorator(func):
+        # 模块属性指向的是包装后的函数，进程池需要按名称找回原函数
+        if backend == ThreadManager.BACKEND_PROCESS:
+            target = partial(_call_by_reference, func.__module__, func.__qualname__)
+        else:
+            target = func
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             # 从kwargs中提取特殊参数
             callback = kwargs.pop('_callback', None)
             progress_parent = kwargs.pop('_progress_parent', None) if show_progress else None
+            task_key = kwargs.pop('_key', key)
             
             # 获取全局线程管理器
             thread_manager = get_thread_manager()
             
             return thread_manager.submit_task(
-                func, callback, progress_parent, progress_message, *args, **kwargs
+                target, callback, progress_parent, progress_message, *args,
+                backend=backend, key=task_key, pass_token=cancellable,
+                pass_progress=reports_progress, **kwargs
             )
         
         return wrapper
@@ -268,7 +728,10 @@ def get_thread_manager() -> ThreadManager:
     if _thread_manager is None:
         from core.config_manager import config_manager
         max_workers = config_manager.get_config("performance.max_threads", 4)
-        _thread_manager = ThreadManager(max_workers)
+        max_processes = config_manager.get_config("performance.max_processes", None)
+        dispatch_interval = config_manager.get_config("performance.dispatch_interval_ms", 16)
+        progress_interval = config_manager.get_config("performance.progress_interval_ms", 100)
+        _thread_manager = ThreadManager(max_workers, max_processes, dispatch_interval, progress_interval)
     return _thread_manager
 
 def shutdown_thread_manager():
@@ -1,12 +1,17 @@
+import time
+_import_start = time.perf_counter()
+
 import tkinter as tk
+from tkinter import messagebox
 import logging
+import multiprocessing
 import os
-from typing import Optional, Type
+from typing import Optional, Type, Union
 
 # --- 核心模块导入 ---
 from core.page_manager import PageManager, BasePage, NavigationBar
 from core.config_manager import config_manager
-from core.thread_manager import shutdown_thread_manager
+from core.thread_manager import get_thread_manager, shutdown_thread_manager
 from core.search_manager import search_manager, SearchWidget
 
 # --- UI组件和主题 ---
@@ -14,39 +19,12 @@ from themes.futuristic_theme import COLORS, FONTS
 from components.cards import InteractiveCard
 from components.buttons import FuturisticButton
 from components.module_adapter import ModuleAdapter
+from core.module_registry import module_registry
+
+module_registry.record_startup_import("core / themes / components", time.perf_counter() - _import_start)
 
-# --- 数学功能模块导入 ---
-# 高等数学
-from modules.calculus.equation_plotter import EquationVisualizationApp
-from modules.calculus.kehe import KeheApp
-from modules.calculus.weifen import DirectionFieldApp
-from modules.calculus.trig_plot_app import TrigPlotApp
-from modules.calculus.haisen import HessianApp
-from modules.sequences.shulie import SequenceModule
-
-# 线性代数
-from modules.linear_algebra.gaosixiaoyuan import GaussianEliminationApp
-from modules.linear_algebra.guodujuzhen import MatrixTransitionApp
-from modules.linear_algebra.hanglieshi import DeterminantApp
-from modules.linear_algebra.jibianhuan import MatrixTransformationApp
-from modules.linear_algebra.jisuan import VectorOperationsApp
-from modules.linear_algebra.juzhenduibi import MatrixComparisonApp
-from modules.linear_algebra.tezheng import EigenvalueApp
-from modules.linear_algebra.zhuanzhi import MatrixAnimationApp
-
-# 概率统计
-from modules.probability.fenxi import AnalysisApp
-from modules.probability.gailvlunn import ProbabilityApp
-from modules.probability.beiye import BayesianApp
-from modules.probability.game import GamePuzzleApp
-from modules.probability.mengka import MonteCarloApp
-from modules.probability.suiji import RandomVariableApp
-from modules.probability.suijiguocheng import StochasticProcessApp
-from modules.probability.tuiduan import HypothesisTestingApp
-from modules.probability.zhixin import ConfidenceIntervalApp
-
-# --- AI 模块 ---
-from modules.ai_wrapper import AIDataAnalysisWrapper
+# --- 数学功能模块 ---
+# 各学科模块以导入路径登记，首次打开时才由 module_registry 导入
 
 # --- 页面定义 ---
 
@@ -84,16 +62,21 @@ class ModuleMenuPage(BasePage):
         container = tk.Frame(self, bg=COLORS["bg_light"])
         container.pack(fill=tk.BOTH, expand=True, padx=50, pady=50)
 
-        for i, (name, module_class) in enumerate(self.modules.items()):
-            btn = FuturisticButton(container, text=name, command=lambda m=module_class: self._open_module(m), width=300, height=60)
+        for i, (name, module_path) in enumerate(self.modules.items()):
+            btn = FuturisticButton(container, text=name, command=lambda m=module_path: self._open_module(m), width=300, height=60)
             btn.pack(pady=15)
 
-    def _open_module(self, module_class: Type[BasePage]):
-        """通用模块加载方法"""
-        page_name = module_class.__name__
-        if not self.controller.get_page(page_name):
+    def _open_module(self, module_class: Union[str, Type[BasePage]]):
+        """通用模块加载方法，module_class 可以是类或导入路径"""
+        page_name = module_registry.class_name_of(module_class)
+        if not self.controller.has_page(page_name):
+            try:
+                module_class = module_registry.load(module_class)
+            except Exception as e:
+                messagebox.showerror("错误", f"模块加载失败: {e}")
+                return
             # 使用ModuleAdapter包装模块
-            self.controller.register_page(page_name, ModuleAdapter, module_class=module_class)
+            self.controller.register_page(page_name, ModuleAdapter, evictable=True, module_class=module_class)
         self.controller.show_page(page_name)
 
 # --- 主应用 ---
@@ -103,13 +86,25 @@ class MathVisionApp:
         self.root = tk.Tk()
         self._setup_window()
         
-        self.page_manager = PageManager(self.root)
+        # 任务结果在主循环中分发，保证回调可以安全操作Tk组件
+        get_thread_manager().attach(self.root)
+        
+        self.page_manager = PageManager(
+            self.root,
+            max_live_pages=config_manager.get_config("performance.max_live_pages", 6),
+            memory_budget_mb=config_manager.get_config("performance.page_memory_budget_mb", 512)
+        )
         self.navbar = NavigationBar(self.root, self.page_manager)
         self.page_manager.set_navbar(self.navbar)
         self.navbar.pack(side=tk.TOP, fill=tk.X)
         
         self._register_pages()
         self.page_manager.show_page("MainPage")
+        module_registry.record_startup_import("window ready", time.perf_counter() - _import_start)
+
+        # 空闲时预加载其余模块
+        if config_manager.get_config("performance.prefetch_modules", False):
+            module_registry.prefetch(self.root)
 
     def _setup_window(self):
         self.root.title("数学可视化教学工具 2.0")
@@ -120,36 +115,39 @@ class MathVisionApp:
     def _register_pages(self):
         self.page_manager.register_page("MainPage", MainPage)
 
-        # 定义模块
-        adv_math_modules = {
-            "方程可视化": EquationVisualizationApp,
-            "科赫雪花": KeheApp,
-            "微分方程方向场": DirectionFieldApp,
-            "海森矩阵": HessianApp,
-            "数列分析": SequenceModule,
-            "三角函数可视化": TrigPlotApp
-        }
-        lin_alg_modules = {
-            "高斯消元": GaussianEliminationApp,
-            "矩阵变换": MatrixTransformationApp,
-            "特征值": EigenvalueApp,
-            "过渡矩阵": MatrixTransitionApp,
-            "行列式": DeterminantApp,
-            "向量运算": VectorOperationsApp,
-            "矩阵对比": MatrixComparisonApp,
-            "矩阵动画": MatrixAnimationApp,
-        }
-        prob_modules = {
-            "统计分析": AnalysisApp,
-            "概率分布": ProbabilityApp,
-            "贝叶斯": BayesianApp,
-            "游戏益智": GamePuzzleApp,
-            "蒙特卡洛": MonteCarloApp,
-            "随机变量": RandomVariableApp,
-            "随机过程": StochasticProcessApp,
-            "假设检验": HypothesisTestingApp,
-            "置信区间": ConfidenceIntervalApp,
-        }
+        # 定义模块（仅登记导入路径，首次打开时才导入）
+        adv_math_modules = module_registry.register_many({
+            "方程可视化": "modules.calculus.equation_plotter:EquationVisualizationApp",
+            "科赫雪花": "modules.calculus.kehe:KeheApp",
+            "微分方程方向场": "modules.calculus.weifen:DirectionFieldApp",
+            "海森矩阵": "modules.calculus.haisen:HessianApp",
+            "数列分析": "modules.sequences.shulie:SequenceModule",
+            "三角函数可视化": "modules.calculus.trig_plot_app:TrigPlotApp"
+        }, category="高等数学")
+        lin_alg_modules = module_registry.register_many({
+            "高斯消元": "modules.linear_algebra.gaosixiaoyuan:GaussianEliminationApp",
+            "矩阵变换": "modules.linear_algebra.jibianhuan:MatrixTransformationApp",
+            "特征值": "modules.linear_algebra.tezheng:EigenvalueApp",
+            "过渡矩阵": "modules.linear_algebra.guodujuzhen:MatrixTransitionApp",
+            "行列式": "modules.linear_algebra.hanglieshi:DeterminantApp",
+            "向量运算": "modules.linear_algebra.jisuan:VectorOperationsApp",
+            "矩阵对比": "modules.linear_algebra.juzhenduibi:MatrixComparisonApp",
+            "矩阵动画": "modules.linear_algebra.zhuanzhi:MatrixAnimationApp",
+        }, category="线性代数")
+        prob_modules = module_registry.register_many({
+            "统计分析": "modules.probability.fenxi:AnalysisApp",
+            "概率分布": "modules.probability.gailvlunn:ProbabilityApp",
+            "贝叶斯": "modules.probability.beiye:BayesianApp",
+            "游戏益智": "modules.probability.game:GamePuzzleApp",
+            "蒙特卡洛": "modules.probability.mengka:MonteCarloApp",
+            "随机变量": "modules.probability.suiji:RandomVariableApp",
+            "随机过程": "modules.probability.suijiguocheng:StochasticProcessApp",
+            "假设检验": "modules.probability.tuiduan:HypothesisTestingApp",
+            "置信区间": "modules.probability.zhixin:ConfidenceIntervalApp",
+        }, category="概率统计")
+        ai_module = module_registry.register(
+            "AI 数据分析", "modules.ai_wrapper:AIDataAnalysisWrapper", category="AI"
+        ).import_path
 
         # 创建并注册菜单页面
         adv_math_page = self.page_manager.register_page("AdvancedMathPage", ModuleMenuPage)
@@ -162,14 +160,19 @@ class MathVisionApp:
         prob_page.setup("概率统计", prob_modules)
         
         # 注册 AI 数据分析页面
-        self.page_manager.register_page("AIDataAnalysisPage", ModuleAdapter, module_class=AIDataAnalysisWrapper)
+        self.page_manager.register_page("AIDataAnalysisPage", ModuleAdapter, evictable=True, module_class=ai_module)
 
     def run(self):
         try:
             self.root.mainloop()
         finally:
+            module_registry.cancel_prefetch(self.root)
+            if config_manager.get_config("debugging.report_import_times", False):
+                logging.getLogger(__name__).info(module_registry.get_import_report())
             shutdown_thread_manager()
 
 if __name__ == "__main__":
+    # 打包为exe后进程池子进程需要此调用
+    multiprocessing.freeze_support()
     app = MathVisionApp()
     app.run()
\ No newline at end of file
@@ -3,17 +3,29 @@ from tkinter import ttk, messagebox, colorchooser, scrolledtext
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.collections import LineCollection
 from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application
 import warnings
+from collections import OrderedDict
+from functools import partial
 from matplotlib import colors
 
 from common.base_app import MathModuleApp
+from common.adaptive_sampling import adaptive_sample
+from common.implicit_contour import quadtree_contour
+from core.expression_manager import expression_manager, ExpressionError
+from core.thread_manager import get_thread_manager
 from knowledge import KnowledgeLearningClass
 
 # 忽略特定警告
 warnings.filterwarnings("ignore", category=UserWarning, module='sympy')
 
 class EquationVisualizationApp(MathModuleApp):
+    # 显式方程数量达到该值时每条曲线作为单独的后台任务采样，不阻塞界面
+    PARALLEL_EQUATION_THRESHOLD = 4
+    # 隐式方程线段缓存的条目数（按 方程+视口+细分层数 区分）
+    IMPLICIT_CACHE_SIZE = 16
+
     def __init__(self, master):
         print("Initializing EquationVisualizationApp")
         super().__init__(master)
@@ -34,6 +46,9 @@ class EquationVisualizationApp(MathModuleApp):
         self.line_width = tk.DoubleVar(value=2.0)
         self.colormap = tk.StringVar(value="viridis")
         self.auto_scale_y = tk.BooleanVar(value=True)  # 自动调整Y轴
+        self.adaptive_implicit = tk.BooleanVar(value=True)  # 隐式方程使用四叉树自适应绘制
+        self.implicit_cache = OrderedDict()
+        self.explicit_task_keys = []  # 未完成的显式曲线采样任务
         
         self.setup_specific_ui()
         self.equation_entry.insert(0, "x**2")
@@ -171,6 +186,11 @@ class EquationVisualizationApp(MathModuleApp):
                        command=self.plot_equations).pack(side=tk.LEFT, padx=(0, SPACING["sm"]))
         ttk.Checkbutton(options_frame, text="📏 自动Y轴", variable=self.auto_scale_y, 
                        command=self.plot_equations).pack(side=tk.LEFT)
+        
+        implicit_options_frame = ttk.Frame(display_frame)
+        implicit_options_frame.pack(fill=tk.X, pady=(SPACING["xs"], 0))
+        ttk.Checkbutton(implicit_options_frame, text="🔲 隐式方程自适应细分", variable=self.adaptive_implicit, 
+                       command=self.plot_equations).pack(side=tk.LEFT)
 
         # ========== 操作按钮区域 ==========
         action_frame = self.create_control_section("🎨 操作")
@@ -326,13 +346,13 @@ class EquationVisualizationApp(MathModuleApp):
             self.update_status("已清空所有方程")
 
     def plot_equations(self):
+        self._cancel_explicit_tasks()
         if not self.equations:
             self.clear_plot()
             return
         
         try:
             x_min, x_max = map(float, self.x_range.get().split(','))
-            y_min, y_max = map(float, self.y_range.get().split(','))
             
             self.ax.clear()
             self.equation_lines = []
@@ -342,62 +362,144 @@ class EquationVisualizationApp(MathModuleApp):
             self.ax.set_title('方程可视化')
             self.ax.grid(self.show_grid.get())
             
+            # 显式方程较多时先画空线占位（保持图例顺序），采样结果在后台任务完成后填入
+            deferred = sum(mode == "显式方程" for mode, _ in self.equations) >= self.PARALLEL_EQUATION_THRESHOLD
+            pending = []
+            
             for i, ((mode, equation), color) in enumerate(zip(self.equations, self.equation_colors)):
-                if mode == "显式方程": self.plot_explicit(equation, color)
+                if mode == "显式方程":
+                    if deferred:
+                        pending.append((equation, self.plot_explicit(equation, color, (np.array([]), np.array([])))))
+                    else:
+                        self.plot_explicit(equation, color)
                 elif mode == "隐式方程": self.plot_implicit(equation, color)
                 elif mode == "参数方程": self.plot_parametric(equation, color)
                 elif mode == "极坐标方程": self.plot_polar(equation, color)
             
-            # 自动调整Y轴范围
-            if self.auto_scale_y.get() and self.ax.lines:
-                # 收集所有线的Y数据
-                all_y_data = []
-                for line in self.ax.lines:
-                    ydata = line.get_ydata()
-                    # 过滤掉 nan 和 inf
-                    valid_y = ydata[np.isfinite(ydata)]
-                    if len(valid_y) > 0:
-                        all_y_data.extend(valid_y)
-                
-                if all_y_data:
-                    y_min_auto = np.min(all_y_data)
-                    y_max_auto = np.max(all_y_data)
-                    # 添加一些边距
-                    y_margin = (y_max_auto - y_min_auto) * 0.1
-                    self.ax.set_ylim(y_min_auto - y_margin, y_max_auto + y_margin)
-                else:
-                    self.ax.set_ylim(y_min, y_max)
-            else:
-                self.ax.set_ylim(y_min, y_max)
-            
-            if self.show_legend.get() and self.equation_lines:
-                self.ax.legend()
-            
+            self._finish_plot()
             self.refresh_plot()
+            for equation, line in pending:
+                self._submit_explicit_curve(equation, line)
             self.update_status(f"已绘制 {len(self.equations)} 个方程")
         except Exception as e:
             messagebox.showerror("绘图错误", f"绘制方程时出错: {str(e)}")
 
-    def plot_explicit(self, equation, color):
+    def _finish_plot(self):
+        """按当前已有的曲线调整Y轴范围并更新图例"""
+        y_min, y_max = map(float, self.y_range.get().split(','))
+        # 自动调整Y轴范围
+        if self.auto_scale_y.get() and self.ax.lines:
+            # 收集所有线的Y数据
+            all_y_data = []
+            for line in self.ax.lines:
+                ydata = line.get_ydata()
+                # 过滤掉 nan 和 inf
+                valid_y = ydata[np.isfinite(ydata)]
+                if len(valid_y) > 0:
+                    all_y_data.extend(valid_y)
+            
+            if all_y_data:
+                y_min_auto = np.min(all_y_data)
+                y_max_auto = np.max(all_y_data)
+                # 添加一些边距
+                y_margin = (y_max_auto - y_min_auto) * 0.1
+                self.ax.set_ylim(y_min_auto - y_margin, y_max_auto + y_margin)
+            else:
+                self.ax.set_ylim(y_min, y_max)
+        else:
+            self.ax.set_ylim(y_min, y_max)
+        
+        if self.show_legend.get() and self.equation_lines:
+            self.ax.legend()
+
+    def _get_viewport(self):
         x_min, x_max = map(float, self.x_range.get().split(','))
-        x = np.linspace(x_min, x_max, self.resolution.get())
-        y = np.zeros_like(x)
-        for i, xi in enumerate(x):
-            try:
-                y[i] = eval(equation, {"__builtins__": {}}, {"x": xi, "sin": np.sin, "cos": np.cos, "tan": np.tan, "exp": np.exp, "log": np.log, "sqrt": np.sqrt, "pi": np.pi})
-            except:
-                y[i] = np.nan
-        line, = self.ax.plot(x, y, color=color, linewidth=self.line_width.get(), label=f"y = {equation}")
+        y_min, y_max = map(float, self.y_range.get().split(','))
+        return x_min, x_max, y_min, y_max
+
+    def _sample_curve(self, func, t_min, t_max, viewport=None, max_points=None):
+        """自适应采样：分辨率作为点数预算的基准，平坦处远少于预算"""
+        if viewport is None:
+            viewport = self._get_viewport()
+        if max_points is None:
+            max_points = self.resolution.get() * 4
+        return adaptive_sample(func, t_min, t_max, viewport, max_points=max_points)
+
+    def _evaluate_explicit_curve(self, equation, viewport, max_points):
+        """自适应采样显式曲线，定义域外的点为NaN，极点等间断处断开（可在工作线程中调用）"""
+        x_min, x_max = viewport[:2]
+        try:
+            compiled = expression_manager.compile(equation, ("x",))
+        except ExpressionError as e:
+            print(f"无法解析方程 {equation}: {e}")
+            return np.array([x_min, x_max]), np.full(2, np.nan)
+        return self._sample_curve(lambda x: (x, compiled(x)), x_min, x_max, viewport, max_points)
+
+    def _submit_explicit_curve(self, equation, line):
+        """在线程池中采样一条显式曲线，完成后由界面线程填入占位的线"""
+        key = f"explicit_{id(self)}_{len(self.explicit_task_keys)}"
+        self.explicit_task_keys.append(key)
+        # Tk 变量只能在主线程读取
+        get_thread_manager().submit_task(
+            self._evaluate_explicit_curve, partial(self._on_explicit_curve_done, equation, line),
+            None, "正在计算...", equation, self._get_viewport(), self.resolution.get() * 4, key=key)
+
+    def _on_explicit_curve_done(self, equation, line, task_result):
+        if line.axes is not self.ax:
+            return  # 采样期间已重新绘图
+        if not task_result.success:
+            messagebox.showerror("绘图错误", f"绘制方程 {equation} 时出错: {task_result.error}")
+            return
+        line.set_data(*task_result.result)
+        self._finish_plot()
+        self.canvas.draw_idle()
+
+    def _cancel_explicit_tasks(self):
+        manager = get_thread_manager()
+        for key in self.explicit_task_keys:
+            manager.cancel_key(key)
+        self.explicit_task_keys = []
+
+    def cleanup(self):
+        """页面回收时取消尚未完成的曲线采样"""
+        self._cancel_explicit_tasks()
+
+    def plot_explicit(self, equation, color, curve=None):
+        if curve is None:
+            curve = self._evaluate_explicit_curve(equation, self._get_viewport(), self.resolution.get() * 4)
+        line, = self.ax.plot(*curve, color=color, linewidth=self.line_width.get(), label=f"y = {equation}")
         self.equation_lines.append(line)
+        return line
+
+    def _get_implicit_segments(self, func, viewport):
+        """四叉树提取隐式曲线线段；相同方程和视口的结果直接取缓存，不重新求值"""
+        # 最细层约为分辨率的两倍
+        max_depth = max(1, int(np.ceil(np.log2(self.resolution.get() * 2 / 32))))
+        key = (func.source, viewport, max_depth)
+        cached = self.implicit_cache.get(key)
+        if cached is not None:
+            self.implicit_cache.move_to_end(key)
+            return cached
+        
+        segments, _ = quadtree_contour(func, viewport, initial_cells=32, max_depth=max_depth)
+        self.implicit_cache[key] = segments
+        while len(self.implicit_cache) > self.IMPLICIT_CACHE_SIZE:
+            self.implicit_cache.popitem(last=False)
+        return segments
 
     def plot_implicit(self, equation, color):
-        x_min, x_max = map(float, self.x_range.get().split(','))
-        y_min, y_max = map(float, self.y_range.get().split(','))
-        x = np.linspace(x_min, x_max, self.resolution.get()//5) # Lower res for performance
-        y = np.linspace(y_min, y_max, self.resolution.get()//5)
-        X, Y = np.meshgrid(x, y)
-        Z = eval(equation, {"__builtins__": {}}, {"x": X, "y": Y, "sin": np.sin, "cos": np.cos, "tan": np.tan, "exp": np.exp, "log": np.log, "sqrt": np.sqrt, "pi": np.pi})
-        self.ax.contour(X, Y, Z, [0], colors=color, linewidths=self.line_width.get())
+        viewport = self._get_viewport()
+        x_min, x_max, y_min, y_max = viewport
+        func = expression_manager.compile(equation, ("x", "y"))
+        if self.adaptive_implicit.get():
+            segments = self._get_implicit_segments(func, viewport)
+            self.ax.add_collection(LineCollection(segments, colors=color, linewidths=self.line_width.get()))
+        else:
+            x = np.linspace(x_min, x_max, self.resolution.get()//5) # Lower res for performance
+            y = np.linspace(y_min, y_max, self.resolution.get()//5)
+            X, Y = np.meshgrid(x, y)
+            Z = func(X, Y)
+            self.ax.contour(X, Y, Z, [0], colors=color, linewidths=self.line_width.get())
         from matplotlib.lines import Line2D
         legend_artist = Line2D([0], [0], color=color, lw=self.line_width.get(), label=f"{equation} = 0")
         self.equation_lines.append(legend_artist)
@@ -405,17 +507,20 @@ class EquationVisualizationApp(MathModuleApp):
     def plot_parametric(self, equation, color):
         parts = equation.split(',')
         x_expr, y_expr, t_min, t_max = [p.strip() for p in parts]
-        t = np.linspace(float(t_min), float(t_max), self.resolution.get())
-        x = eval(x_expr, {"__builtins__": {}}, {"t": t, "sin": np.sin, "cos": np.cos, "tan": np.tan, "exp": np.exp, "log": np.log, "sqrt": np.sqrt, "pi": np.pi})
-        y = eval(y_expr, {"__builtins__": {}}, {"t": t, "sin": np.sin, "cos": np.cos, "tan": np.tan, "exp": np.exp, "log": np.log, "sqrt": np.sqrt, "pi": np.pi})
+        x_func = expression_manager.compile(x_expr, ("t",))
+        y_func = expression_manager.compile(y_expr, ("t",))
+        x, y = self._sample_curve(lambda t: (x_func(t), y_func(t)), float(t_min), float(t_max))
         line, = self.ax.plot(x, y, color=color, linewidth=self.line_width.get(), label=f"x={{x_expr}}, y={{y_expr}}")
         self.equation_lines.append(line)
 
     def plot_polar(self, equation, color):
-        theta = np.linspace(0, 2 * np.pi, self.resolution.get())
-        r = eval(equation, {"__builtins__": {}}, {"theta": theta, "sin": np.sin, "cos": np.cos, "tan": np.tan, "exp": np.exp, "log": np.log, "sqrt": np.sqrt, "pi": np.pi})
-        x = r * np.cos(theta)
-        y = r * np.sin(theta)
+        r_func = expression_manager.compile(equation, ("theta",))
+        
+        def polar_to_xy(theta):
+            r = r_func(theta)
+            return r * np.cos(theta), r * np.sin(theta)
+        
+        x, y = self._sample_curve(polar_to_xy, 0, 2 * np.pi)
         line, = self.ax.plot(x, y, color=color, linewidth=self.line_width.get(), label=f"r = {equation}")
         self.equation_lines.append(line)
 
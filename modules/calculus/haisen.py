@@ -3,15 +3,20 @@ from tkinter import ttk, messagebox, scrolledtext, font as tkFont
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import numpy as np
-import sympy as sp
-from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application
 import matplotlib.pyplot as plt
 from matplotlib.font_manager import FontProperties
 from matplotlib.colors import LinearSegmentedColormap
 import math
 import warnings
+from functools import partial
 from matplotlib.backend_bases import MouseButton
 from knowledge import KnowledgeLearningClass
+from common.derivatives import get_derivative_bundle
+from common.surface_lod import SurfaceLOD
+from common.critical_points import (CONVEX, CONCAVE, SADDLE, MINIMUM, MAXIMUM, SADDLE_POINT, DEGENERATE,
+                                    CRITICAL_POINT_NAMES, classify_hessian, find_critical_points)
+from core.config_manager import config_manager
+from core.thread_manager import get_thread_manager
 
 # Suppress specific warnings if needed (e.g., from SymPy)
 warnings.filterwarnings("ignore", category=UserWarning, module='sympy')
@@ -21,6 +26,13 @@ plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False  # Ensure minus sign displays correctly
 
 
+# 每类的 (颜色, 名称)
+HESSIAN_CLASSES = {CONVEX: ('g', '凸点'), CONCAVE: ('r', '凹点'), SADDLE: ('b', '鞍点')}
+# 临界点的 (颜色, 名称)
+CRITICAL_POINT_STYLES = {kind: (color, CRITICAL_POINT_NAMES[kind]) for kind, color in
+                         ((MINIMUM, 'lime'), (MAXIMUM, 'orangered'), (SADDLE_POINT, 'deepskyblue'), (DEGENERATE, 'gray'))}
+
+
 class HessianApp:
     def __init__(self, root):
         self.root = root
@@ -50,6 +62,7 @@ class HessianApp:
         self.resolution = tk.IntVar(value=40)
         self.show_hessian_points = tk.BooleanVar(value=True)
         self.show_contour = tk.BooleanVar(value=False)
+        self.show_critical_points = tk.BooleanVar(value=True)
         self.colormap = tk.StringVar(value="viridis")
         self.alpha = tk.DoubleVar(value=0.8)
         self.point_size = tk.IntVar(value=40)
@@ -58,6 +71,8 @@ class HessianApp:
         self.z_min = tk.DoubleVar(value=-4)
         self.z_max = tk.DoubleVar(value=4)
         self._limits_set = False # Flag to track if limits have been set initially
+        # 临界点在后台求解，重绘时取消上一次未完成的求解
+        self.critical_points_task_key = f"critical_points_{id(self)}"
         
         # --- Style Configuration ---
         self.style = ttk.Style()
@@ -153,7 +168,7 @@ class HessianApp:
         ttk.Entry(range_frame, textvariable=self.y_range, width=10).grid(row=0, column=3, padx=5)
         
         ttk.Label(range_frame, text="分辨率:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        resolution_scale = ttk.Scale(range_frame, from_=20, to=100, variable=self.resolution, 
+        resolution_scale = ttk.Scale(range_frame, from_=20, to=300, variable=self.resolution, 
                                     orient=tk.HORIZONTAL)
         resolution_scale.grid(row=1, column=1, columnspan=3, sticky=tk.EW, padx=5, pady=5)
         
@@ -180,6 +195,7 @@ class HessianApp:
         
         ttk.Checkbutton(visual_frame, text="显示Hessian特征点", variable=self.show_hessian_points).pack(anchor=tk.W, **widget_padding)
         ttk.Checkbutton(visual_frame, text="显示等高线", variable=self.show_contour).pack(anchor=tk.W, **widget_padding)
+        ttk.Checkbutton(visual_frame, text="求解并标记临界点", variable=self.show_critical_points).pack(anchor=tk.W, **widget_padding)
         
         # 颜色映射选择
         cmap_frame = ttk.Frame(visual_frame)
@@ -252,6 +268,7 @@ class HessianApp:
         self.resolution.set(40)
         self.show_hessian_points.set(True)
         self.show_contour.set(False)
+        self.show_critical_points.set(True)
         self.colormap.set("viridis")
         self.alpha.set(0.8)
         self.point_size.set(40)
@@ -315,6 +332,7 @@ class HessianApp:
         try:
             # 如果已有图形则先清理
             if hasattr(self, 'fig') and self.fig:
+                self.surface_lod.disconnect()
                 plt.close(self.fig)
                 for widget in self.fig_frame.winfo_children():
                     widget.destroy()
@@ -324,6 +342,8 @@ class HessianApp:
             self.canvas = FigureCanvasTkAgg(self.fig, master=self.fig_frame)
             self.canvas_widget = self.canvas.get_tk_widget()
             self.canvas_widget.pack(fill=tk.BOTH, expand=True)
+            # 旋转/缩放期间显示抽稀网格，停止后恢复全分辨率
+            self.surface_lod = SurfaceLOD(self.canvas)
             
             # 创建3D axes并设置初始视角
             self.ax = self.fig.add_subplot(111, projection='3d')
@@ -368,16 +388,8 @@ class HessianApp:
                 x_min, x_max = -2, 2
                 y_min, y_max = -2, 2
             
-            # 解析函数并绘制
-            x, y = sp.symbols('x y')
-            expr = parse_expr(func_str, transformations=(standard_transformations + (implicit_multiplication_application,)))
-            
-            # 创建数值函数
-            f = sp.lambdify((x, y), expr, modules=['numpy', {'log': np.log, 'sqrt': np.sqrt, 'exp': np.exp}])
-            
-            # 计算Hessian矩阵
-            hessian_matrix = sp.hessian(expr, (x, y))
-            hessian_func = sp.lambdify((x, y), hessian_matrix, modules=['numpy'])
+            # 取缓存的 (f, ∇f, H) 导数组，同一函数只做一次符号计算
+            bundle = get_derivative_bundle(func_str)
             
             # 创建网格数据
             resolution = self.resolution.get()
@@ -385,11 +397,8 @@ class HessianApp:
             y_vals = np.linspace(y_min, y_max, resolution)
             X, Y = np.meshgrid(x_vals, y_vals)
             
-            # 计算Z值，处理无穷大和NaN
-            Z = np.zeros_like(X)
-            with np.errstate(divide='ignore', invalid='ignore'):
-                Z = f(X, Y)
-            Z[~np.isfinite(Z)] = np.nan  # 将非有限值替换为NaN
+            # 计算Z值，非有限值为NaN
+            Z = bundle.value(X, Y)
             
             # 获取颜色映射
             cmap_name = self.colormap.get()
@@ -397,8 +406,8 @@ class HessianApp:
             
             # 绘制曲面
             alpha = self.alpha.get()
-            surf = self.ax.plot_surface(X, Y, Z, cmap=cmap, alpha=alpha, 
-                                      edgecolor='none', antialiased=True)
+            surf = self.surface_lod.plot_surface(self.ax, X, Y, Z, cmap=cmap, alpha=alpha,
+                                                 edgecolor='none', antialiased=True)
             
             # 存储当前曲面对象
             self.current_surf = surf
@@ -417,43 +426,15 @@ class HessianApp:
             
             # 绘制Hessian特征点
             if self.show_hessian_points.get():
-                point_size = self.point_size.get()
                 step = max(1, self.point_density.get())  # 直接使用密度值作为步长
-                
-                convex_count, concave_count, saddle_count = 0, 0, 0
-                
-                for i in range(0, resolution, step):
-                    for j in range(0, resolution, step):
-                        try:
-                            x_val, y_val = X[j, i], Y[j, i]
-                            z_val = Z[j, i]
-                            
-                            # 跳过NaN值
-                            if not np.isfinite(z_val):
-                                continue
-                                
-                            hess = hessian_func(x_val, y_val)
-                            if not np.all(np.isfinite(hess)):
-                                continue
-                                
-                            eigenvalues = np.linalg.eigvals(hess)
-                            eigenvalues = np.real(eigenvalues)  # 确保特征值是实数
-                            
-                            # 确定点类型
-                            if all(eigenvalues > 1e-9):
-                                color, convex_count = 'g', convex_count + 1  # 凸点
-                            elif all(eigenvalues < -1e-9):
-                                color, concave_count = 'r', concave_count + 1  # 凹点
-                            else:
-                                color, saddle_count = 'b', saddle_count + 1  # 鞍点
-                                
-                            self.ax.scatter(x_val, y_val, z_val, color=color, s=point_size,
-                                          edgecolor='k', linewidth=0.5, alpha=0.9)
-                        except Exception as e:
-                            pass  # 忽略单个点的错误
-                            
-                # 存储点统计
-                self._hessian_point_counts = (convex_count, concave_count, saddle_count)
+                self._draw_hessian_points(X, Y, Z, bundle, step)
+            
+            # 求解并标记临界点
+            self._critical_points = None
+            if self.show_critical_points.get():
+                self._draw_critical_points(func_str, (x_min, x_max, y_min, y_max))
+            else:
+                get_thread_manager().cancel_key(self.critical_points_task_key)
             
             # 绘制等高线
             if self.show_contour.get():
@@ -476,7 +457,7 @@ class HessianApp:
             self.ax.set_title(f'f(x,y) = {func_str}', fontsize=10)
             
             # 更新信息文本
-            self.update_info_text(expr)
+            self.update_info_text(func_str)
             
         except Exception as e:
             messagebox.showerror("绘图错误", f"绘制函数时出错: {str(e)}")
@@ -484,6 +465,57 @@ class HessianApp:
             import traceback
             traceback.print_exc()
 
+    def _draw_hessian_points(self, X, Y, Z, bundle, step, z_limits=None):
+        """对抽样网格点整体计算Hessian并分类，每一类只绘制一个散点集合"""
+        Xs, Ys, Zs = X[::step, ::step], Y[::step, ::step], Z[::step, ::step]
+        fxx, fxy, fyy = bundle.hessian(Xs, Ys)
+        classes, _, _ = classify_hessian(fxx, fxy, fyy)
+        
+        valid = np.isfinite(Zs) & np.isfinite(fxx) & np.isfinite(fxy) & np.isfinite(fyy)
+        if z_limits is not None:
+            valid &= (Zs >= z_limits[0]) & (Zs <= z_limits[1])
+        
+        counts = []
+        for code, (color, label) in HESSIAN_CLASSES.items():
+            selected = valid & (classes == code)
+            counts.append(int(selected.sum()))
+            if selected.any():
+                self.ax.scatter(Xs[selected], Ys[selected], Zs[selected], color=color, s=self.point_size.get(),
+                                edgecolor='k', linewidth=0.5, alpha=0.9, label=label)
+        
+        # 存储点统计 (凸, 凹, 鞍)
+        self._hessian_point_counts = tuple(counts)
+
+    def _draw_critical_points(self, func_str, viewport, z_limits=None):
+        """在后台线程数值求解视口内的临界点，完成后在曲面上用星形标记（牛顿迭代较慢，不阻塞重绘）"""
+        get_thread_manager().submit_task(
+            find_critical_points, partial(self._on_critical_points_done, self.ax, func_str, z_limits),
+            None, "正在求解临界点...", func_str, viewport,
+            process_threshold=config_manager.get_config("performance.process_batch_threshold", 256),
+            key=self.critical_points_task_key)
+
+    def _on_critical_points_done(self, ax, func_str, z_limits, task_result):
+        """标记求得的临界点，结果保存供信息面板列出"""
+        if ax is not self.ax:
+            return  # 求解期间绘图区域已重建
+        if not task_result.success:
+            print(f"求解临界点时出错: {task_result.error}")
+            return
+        
+        points = task_result.result
+        self._critical_points = points
+        visible = np.isfinite(points['z'])
+        if z_limits is not None:
+            visible &= (points['z'] >= z_limits[0]) & (points['z'] <= z_limits[1])
+        for kind, (color, label) in CRITICAL_POINT_STYLES.items():
+            selected = visible & (points['kind'] == kind)
+            if selected.any():
+                self.ax.scatter(points['x'][selected], points['y'][selected], points['z'][selected],
+                                color=color, marker='*', s=self.point_size.get() * 4,
+                                edgecolor='k', linewidth=0.8, depthshade=False, label=label)
+        self.update_info_text(func_str)
+        self.canvas.draw_idle()
+
     def update_info_text(self, expr):
         """更新信息文本区域"""
         self.info_text.config(state=tk.NORMAL)
@@ -523,17 +555,10 @@ class HessianApp:
             # --- 确保 expr 是字符串 ---
             expr_str_info = str(expr)
 
-            x, y = sp.symbols('x y')
-            local_dict = {'x': x, 'y': y, 'sin': sp.sin, 'cos': sp.cos, 'exp': sp.exp, 'log': sp.log, 'sqrt': sp.sqrt, 'pi': sp.pi}
-            transformations = standard_transformations + (implicit_multiplication_application,)
-            parsed_expr = parse_expr(expr_str_info, local_dict=local_dict, transformations=transformations) # Parse the string
-
-            # Calculate derivatives
-            df_dx = sp.diff(parsed_expr, x)
-            df_dy = sp.diff(parsed_expr, y)
-            d2f_dx2 = sp.diff(df_dx, x)
-            d2f_dy2 = sp.diff(df_dy, y)
-            d2f_dxdy = sp.diff(df_dx, y)
+            # 导数直接取自缓存的导数组
+            bundle = get_derivative_bundle(expr_str_info)
+            df_dx, df_dy = bundle.fx, bundle.fy
+            d2f_dx2, d2f_dxdy, d2f_dy2 = bundle.fxx, bundle.fxy, bundle.fyy
 
             # --- Displaying the information ---
             self.info_text.insert(tk.END, "函数: ", ("bold",))
@@ -556,6 +581,13 @@ class HessianApp:
                  self.info_text.insert(tk.END, f"  - 凹点: {concave}\n")
                  self.info_text.insert(tk.END, f"  - 鞍点: {saddle}\n")
 
+            # 数值求得的临界点
+            points = getattr(self, '_critical_points', None)
+            if points is not None:
+                self.info_text.insert(tk.END, f"\n临界点 (∇f = 0，共 {len(points['x'])} 个):\n", ("bold",))
+                for px, py, pz, kind in zip(points['x'], points['y'], points['z'], points['kind']):
+                    self.info_text.insert(tk.END, f"  - ({px:.4f}, {py:.4f}, {pz:.4f})  {CRITICAL_POINT_NAMES[int(kind)]}\n")
+
             # ... (rest of info text: color legend, point stats) ...
 
         except Exception as e_inner:
@@ -577,17 +609,8 @@ class HessianApp:
             # --- 关键修复：确保在解析前将expr转换为字符串 ---
             expr_str = str(expr)
 
-            x, y = sp.symbols('x y')
-            local_dict = {'x': x, 'y': y, 'sin': sp.sin, 'cos': sp.cos, 'exp': sp.exp, 'log': sp.log, 'sqrt': sp.sqrt, 'pi': sp.pi}
-            transformations = standard_transformations + (implicit_multiplication_application,)
-            # --- 使用转换后的字符串进行解析 ---
-            parsed_expr = parse_expr(expr_str, local_dict=local_dict, transformations=transformations)
-
-            # 创建数值函数
-            f = sp.lambdify((x, y), parsed_expr, modules=['numpy', {'log': np.log, 'sqrt': np.sqrt, 'exp': np.exp}])
-            # 计算Hessian矩阵
-            hessian_matrix = sp.hessian(parsed_expr, (x, y))
-            hessian_func = sp.lambdify((x, y), hessian_matrix, modules=['numpy'])
+            # 取缓存的 (f, ∇f, H) 导数组
+            bundle = get_derivative_bundle(expr_str)
 
             # 创建网格数据
             resolution = self.resolution.get()
@@ -596,10 +619,7 @@ class HessianApp:
             X, Y = np.meshgrid(x_vals, y_vals)
 
             # 计算Z值，处理无穷大和NaN
-            Z = np.zeros_like(X)
-            with np.errstate(divide='ignore', invalid='ignore'): # 忽略计算中的警告
-                Z = f(X, Y)
-            Z[~np.isfinite(Z)] = np.nan # 将非有限值替换为NaN
+            Z = bundle.value(X, Y)
 
             # --- 清除旧的绘图元素，而不是整个轴 ---
             # 移除之前的曲面、散点图、等高线和文本（如果需要）
@@ -684,8 +704,8 @@ class HessianApp:
             # --- Plot Surface ---
             if valid_z_exists:
                  try:
-                     self.surf = self.ax.plot_surface(X, Y, Z, cmap=cmap, alpha=self.alpha.get(),
-                                                edgecolor='none', rstride=1, cstride=1,
+                     self.surf = self.surface_lod.plot_surface(self.ax, X, Y, Z, cmap=cmap, alpha=self.alpha.get(),
+                                                edgecolor='none',
                                                 vmin=final_zlim[0], vmax=final_zlim[1],
                                                 linewidth=0, antialiased=True)
                  except Exception as e:
@@ -724,45 +744,19 @@ class HessianApp:
             # ... (Hessian点绘制逻辑不变, 包括计数器重置和存储) ...
             self._hessian_point_counts = (0, 0, 0)
             if self.show_hessian_points.get():
-                point_size = self.point_size.get()
                 step = max(1, self.point_density.get())  # 直接使用密度值作为步长
-                convex_count, concave_count, saddle_count = 0, 0, 0
-
-                # Iterate using steps based on density
-                for i in range(0, resolution, step):
-                    for j in range(0, resolution, step):
-                        try:
-                            x_val, y_val = X[j, i], Y[j, i]
-                            z_val = Z[j, i] # Use already calculated Z
-
-                            # Skip if Z is NaN or outside current Z limits
-                            if not np.isfinite(z_val) or z_val < final_zlim[0] or z_val > final_zlim[1]:
-                                continue
-
-                            hess = hessian_func(x_val, y_val)
-                            if not np.all(np.isfinite(hess)): continue
-
-                            eigenvalues = np.linalg.eigvals(hess)
-                            # Ensure eigenvalues are real (Hessian should be symmetric)
-                            eigenvalues = np.real(eigenvalues)
-
-                            # Determine point type
-                            if all(eigenvalues > 1e-9): color, convex_count = 'g', convex_count + 1
-                            elif all(eigenvalues < -1e-9): color, concave_count = 'r', concave_count + 1
-                            else: color, saddle_count = 'b', saddle_count + 1 # Corrected indentation
-
-                            self.ax.scatter(x_val, y_val, z_val, color=color, s=point_size,
-                                           edgecolor='k', linewidth=0.5, alpha=0.9, depthshade=True)
-                        except Exception as e:
-                            # print(f"Error calculating/plotting point at ({i},{j}): {e}") # Optional debug
-                            pass # Ignore errors for individual points
-                # Store counts
-                self._hessian_point_counts = (convex_count, concave_count, saddle_count)
+                self._draw_hessian_points(X, Y, Z, bundle, step, z_limits=final_zlim)
             else:
                  # Clear counts if points are not shown
                  if hasattr(self, '_hessian_point_counts'):
                      del self._hessian_point_counts
 
+            # --- 临界点 ---
+            self._critical_points = None
+            if self.show_critical_points.get():
+                self._draw_critical_points(expr_str, (x_min, x_max, y_min, y_max), z_limits=final_zlim)
+            else:
+                get_thread_manager().cancel_key(self.critical_points_task_key)
 
             # --- 更新标签、标题、网格 (这些在clear时会丢失，所以需要重设) ---
             self.ax.set_xlabel('X')
@@ -773,7 +767,7 @@ class HessianApp:
             self.ax.grid(True, linestyle='--', alpha=0.6) # 重新应用网格
 
             # --- 更新信息文本 ---
-            self.update_info_text(expr) # Pass the original expr
+            self.update_info_text(expr_str)
 
             # --- Final Draw ---
             self.canvas.draw_idle()
@@ -820,20 +814,14 @@ class HessianApp:
                     if not func_str:
                         return
                         
-                    # 计算Z值
-                    x_sym, y_sym = sp.symbols('x y')
-                    expr = parse_expr(func_str, transformations=(standard_transformations + (implicit_multiplication_application,)))
-                    f = sp.lambdify((x_sym, y_sym), expr, modules=['numpy'])
-                    z = f(x, y)
+                    # 计算Z值（导数组已缓存，点击时只做数值计算）
+                    bundle = get_derivative_bundle(func_str)
+                    z = float(bundle.value(x, y))
                     
                     # 计算Hessian信息
-                    hessian = sp.hessian(expr, (x_sym, y_sym))
-                    hessian_func = sp.lambdify((x_sym, y_sym), hessian, modules=['numpy'])
-                    
                     try:
-                        hess_matrix = hessian_func(x, y)
-                        eigenvalues = np.linalg.eigvals(hess_matrix)
-                        eigenvalues = np.real(eigenvalues)
+                        fxx, fxy, fyy = (float(v) for v in bundle.hessian(x, y))
+                        eigenvalues = np.linalg.eigvalsh([[fxx, fxy], [fxy, fyy]])
                         
                         if all(eigenvalues > 1e-9):
                             point_type = "凸点 (所有特征值 > 0)"
@@ -851,6 +839,10 @@ class HessianApp:
             except Exception as e:
                 print(f"点击事件处理错误: {e}")
 
+    def cleanup(self):
+        """页面回收时取消尚未完成的临界点求解"""
+        get_thread_manager().cancel_key(self.critical_points_task_key)
+
 
 if __name__ == '__main__':
     root = tk.Tk()
@@ -1,13 +1,17 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, colorchooser
 import numpy as np
-import math
 import traceback
+from matplotlib.collections import LineCollection
 
 from common.base_app import MathModuleApp
 from knowledge import KnowledgeLearningClass
+from common.fractal_curves import CURVE_SYSTEMS
 
 class KeheApp(MathModuleApp):
+    # 缩放/平移停止后多久按新视口重新细化（毫秒）
+    REFINE_DELAY_MS = 30
+
     def __init__(self, master):
         super().__init__(master)
         
@@ -16,29 +20,44 @@ class KeheApp(MathModuleApp):
         self.current_color_index = 0
         self.x_range = tk.StringVar(value="-1.5,1.5")
         self.y_range = tk.StringVar(value="-1.5,1.5")
+        self.curve_type = tk.StringVar(value="科赫雪花")
         self.iteration_depth = tk.IntVar(value=3)
         self.show_grid = tk.BooleanVar(value=True)
         self.line_width = tk.DoubleVar(value=1.5)
+        self.viewport_detail = tk.BooleanVar(value=False)
+        self.fractal_lines = None
+        self.refine_timer = None
         
         self.setup_specific_ui()
-        self.plot_koch_snowflake()
+        self.plot_fractal()
 
     def setup_specific_ui(self):
         controls = self.create_control_section("控制面板")
         
+        type_frame = ttk.Frame(controls)
+        type_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(type_frame, text="分形类型:").pack(side=tk.LEFT)
+        type_combo = ttk.Combobox(type_frame, textvariable=self.curve_type, values=list(CURVE_SYSTEMS),
+                                  state="readonly", width=16)
+        type_combo.pack(side=tk.LEFT, padx=5)
+        type_combo.bind("<<ComboboxSelected>>", self.on_curve_type_change)
+        
         depth_frame = ttk.Frame(controls)
         depth_frame.pack(fill=tk.X, pady=5)
         
         ttk.Label(depth_frame, text="迭代深度:").pack(side=tk.LEFT)
-        depth_scale = ttk.Scale(depth_frame, from_=0, to=6, variable=self.iteration_depth, orient=tk.HORIZONTAL, length=150, command=lambda e: self.plot_koch_snowflake())
-        depth_scale.pack(side=tk.LEFT, padx=5)
+        self.depth_scale = ttk.Scale(depth_frame, from_=0, to=CURVE_SYSTEMS[self.curve_type.get()].max_depth, variable=self.iteration_depth, orient=tk.HORIZONTAL, length=150, command=lambda e: self.plot_fractal())
+        self.depth_scale.pack(side=tk.LEFT, padx=5)
         depth_label = ttk.Label(depth_frame, text="3")
         depth_label.pack(side=tk.LEFT)
         self.iteration_depth.trace_add("write", lambda *args: depth_label.config(text=str(self.iteration_depth.get())))
         
-        draw_button = ttk.Button(controls, text="绘制科赫雪花", command=self.plot_koch_snowflake)
+        draw_button = ttk.Button(controls, text="绘制分形", command=self.plot_fractal)
         draw_button.pack(fill=tk.X, pady=5)
         
+        detail_check = ttk.Checkbutton(controls, text="按视口细化到像素（放大显示更多细节）", variable=self.viewport_detail, command=self.plot_fractal)
+        detail_check.pack(anchor=tk.W, pady=5)
+        
         range_frame = self.create_control_section("坐标范围")
         ttk.Label(range_frame, text="X范围 (min,max):").grid(row=0, column=0, sticky=tk.W, pady=2)
         ttk.Entry(range_frame, textvariable=self.x_range, width=15).grid(row=0, column=1, pady=2)
@@ -48,7 +67,7 @@ class KeheApp(MathModuleApp):
         width_frame = ttk.Frame(controls)
         width_frame.pack(fill=tk.X, pady=5)
         ttk.Label(width_frame, text="线宽:").pack(side=tk.LEFT)
-        ttk.Scale(width_frame, from_=0.5, to=4.0, variable=self.line_width, orient=tk.HORIZONTAL, length=150, command=lambda e: self.plot_koch_snowflake()).pack(side=tk.LEFT, expand=True)
+        ttk.Scale(width_frame, from_=0.5, to=4.0, variable=self.line_width, orient=tk.HORIZONTAL, length=150, command=lambda e: self.plot_fractal()).pack(side=tk.LEFT, expand=True)
         
         grid_check = ttk.Checkbutton(controls, text="显示网格", variable=self.show_grid, command=self.update_plot_settings)
         grid_check.pack(anchor=tk.W, pady=5)
@@ -65,7 +84,7 @@ class KeheApp(MathModuleApp):
         knowledge_learning = ttk.Button(controls, text="知识介绍", command=self.knowledge_learner.knowledge_learning_8_function)
         knowledge_learning.pack(fill=tk.X,pady=5)
         
-        info_frame = self.create_control_section("科赫雪花信息")
+        info_frame = self.create_control_section("分形信息")
         self.info_text = scrolledtext.ScrolledText(info_frame, width=30, height=10, wrap=tk.WORD)
         self.info_text.pack(fill=tk.BOTH, expand=True)
         self.info_text.insert(tk.END, "科赫雪花是一种经典的分形...\n使用滑块调整迭代深度，观察复杂度的变化。")
@@ -77,73 +96,83 @@ class KeheApp(MathModuleApp):
         self.ax.set_title('科赫雪花分形')
         self.update_plot_settings()
 
-    def koch_curve(self, p1, p2, depth):
-        if depth == 0:
-            return [p1, p2]
-        
-        x1, y1 = p1
-        x2, y2 = p2
-        dx = x2 - x1
-        dy = y2 - y1
-        dist = math.sqrt(dx*dx + dy*dy)
-        
-        p1_1 = (x1 + dx/3, y1 + dy/3)
-        p2_1 = (x1 + 2*dx/3, y1 + 2*dy/3)
-        
-        angle = math.atan2(dy, dx) + math.pi/3
-        length = dist/3
-        px = x1 + dx/3 + length * math.cos(angle)
-        py = y1 + dy/3 + length * math.sin(angle)
-        p_mid = (px, py)
-        
-        points = []
-        points.extend(self.koch_curve(p1, p1_1, depth-1)[:-1])
-        points.extend(self.koch_curve(p1_1, p_mid, depth-1)[:-1])
-        points.extend(self.koch_curve(p_mid, p2_1, depth-1)[:-1])
-        points.extend(self.koch_curve(p2_1, p2, depth-1))
-        return points
-
-    def plot_koch_snowflake(self):
+    def on_curve_type_change(self, event=None):
+        system = CURVE_SYSTEMS[self.curve_type.get()]
+        self.depth_scale.configure(to=system.max_depth)
+        if self.iteration_depth.get() > system.max_depth:
+            self.iteration_depth.set(system.max_depth)
+        self.plot_fractal()
+
+    def plot_fractal(self):
         self.ax.clear()
         self.update_plot_settings()
         
         try:
-            depth = self.iteration_depth.get()
-            side_length = 2.0
-            height = side_length * math.sqrt(3) / 2
-            p1 = (-side_length/2, -height/3)
-            p2 = (side_length/2, -height/3)
-            p3 = (0, 2*height/3)
-            
-            curve1 = self.koch_curve(p1, p2, depth)
-            curve2 = self.koch_curve(p2, p3, depth)
-            curve3 = self.koch_curve(p3, p1, depth)
-            
-            x1, y1 = zip(*curve1)
-            x2, y2 = zip(*curve2)
-            x3, y3 = zip(*curve3)
+            system = CURVE_SYSTEMS[self.curve_type.get()]
+            if self.viewport_detail.get():
+                # 只展开视口内的分支，细分到像素尺度
+                segments, depth = self._viewport_segments(system)
+            else:
+                depth = min(self.iteration_depth.get(), system.max_depth)
+                # 各层已缓存，调整深度时只展开尚未生成的层
+                segments = system.segments(depth)
             
             color = self.equation_colors[self.current_color_index % len(self.equation_colors)]
-            line_width = self.line_width.get()
-            
-            self.ax.plot(x1, y1, color=color, linewidth=line_width)
-            self.ax.plot(x2, y2, color=color, linewidth=line_width)
-            self.ax.plot(x3, y3, color=color, linewidth=line_width)
+            self.fractal_lines = LineCollection(segments, colors=color, linewidths=self.line_width.get())
+            self.ax.add_collection(self.fractal_lines)
+            self.ax.set_title(f'{system.name}分形')
+            # ax.clear() 会清掉回调，每次重绘后重新连接
+            self.ax.callbacks.connect('xlim_changed', self.on_view_change)
+            self.ax.callbacks.connect('ylim_changed', self.on_view_change)
             
             self.refresh_plot()
-            self.update_status(f"已绘制科赫雪花 (迭代深度: {depth})")
-            total_segments = 3 * (4 ** depth)
-            self.update_info(f"科赫雪花 (迭代深度: {depth})\n\n特性:\n- 总线段数: {total_segments}...")
+            self.update_status(f"已绘制{system.name} (迭代深度: {depth})")
+            self._update_fractal_info(system, depth, segments)
         except Exception as e:
-            messagebox.showerror("绘图错误", f"绘制科赫雪花时出错: {str(e)}")
+            messagebox.showerror("绘图错误", f"绘制分形时出错: {str(e)}")
             traceback.print_exc()
             self.update_status("绘图失败")
 
+    def _viewport_segments(self, system):
+        """按当前视口和画布像素尺寸生成可见线段"""
+        x_min, x_max = self.ax.get_xlim()
+        y_min, y_max = self.ax.get_ylim()
+        extent = self.ax.get_window_extent()
+        pixel_size = max((x_max - x_min) / max(extent.width, 1), (y_max - y_min) / max(extent.height, 1))
+        return system.visible_segments((x_min, x_max, y_min, y_max), pixel_size)
+
+    def _update_fractal_info(self, system, depth, segments):
+        if self.viewport_detail.get():
+            detail = f"- 视口内展开层数: {depth}\n- 可见线段数: {len(segments)}"
+        else:
+            detail = f"- 总线段数: {len(segments)}"
+        self.update_info(f"{system.name} (迭代深度: {depth})\n\n{system.description}\n\n特性:\n"
+                         f"{detail}\n- 分形维数: {system.dimension():.4f}")
+
+    def on_view_change(self, ax):
+        """视口变化（防抖）：连续缩放/平移时只在停下后重新细化一次"""
+        if not self.viewport_detail.get() or self.fractal_lines is None:
+            return
+        if self.refine_timer is not None:
+            self.after_cancel(self.refine_timer)
+        self.refine_timer = self.after(self.REFINE_DELAY_MS, self._refine_view)
+
+    def _refine_view(self):
+        """按新视口重新展开可见分支，只替换线段数据"""
+        self.refine_timer = None
+        if not self.viewport_detail.get() or self.fractal_lines is None:
+            return
+        system = CURVE_SYSTEMS[self.curve_type.get()]
+        segments, depth = self._viewport_segments(system)
+        self.fractal_lines.set_segments(segments)
+        self.canvas.draw_idle()
+        self._update_fractal_info(system, depth, segments)
+
     def choose_color(self):
         color = colorchooser.askcolor(title="选择颜色")
         if color[1]:
             self.equation_colors[self.current_color_index % len(self.equation_colors)] = color[1]
-            self.plot_koch_snowflake()
+            self.plot_fractal()
 
     def update_plot_settings(self):
         self.ax.grid(self.show_grid.get())
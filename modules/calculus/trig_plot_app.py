@@ -4,13 +4,18 @@ from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import numpy as np
 import sympy as sp
-from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
+from matplotlib.collections import PolyCollection
 from matplotlib.font_manager import FontProperties
 import math
+import threading
 import warnings
+from collections import OrderedDict
 from knowledge import KnowledgeLearningClass
+from core.expression_manager import expression_manager
+from core.thread_manager import TaskCancelledError, get_thread_manager
+from common.quadrature import RULES, convergence_table, effective_intervals, finite_values, nodes_and_weights
 
 # Suppress specific warnings if needed (e.g., from SymPy)
 warnings.filterwarnings("ignore", category=UserWarning, module='sympy')
@@ -19,7 +24,122 @@ warnings.filterwarnings("ignore", category=UserWarning, module='sympy')
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False # Ensure minus sign displays correctly
 
+class FunctionTileCache:
+    """函数采样瓦片缓存
+
+    x 轴按缩放级别划分为宽度 2**level 的瓦片，每个瓦片固定采样 TILE_POINTS 个点。
+    视图只取覆盖当前范围的瓦片，缺失的瓦片一次性向量化求值；
+    缩回或平移到访问过的区间时直接复用，不再求值。
+    """
+
+    TILE_POINTS = 256
+    TILES_PER_VIEW = 4  # 视口宽度约对应的瓦片数，决定采样密度
+
+    def __init__(self, max_tiles=256):
+        self.max_tiles = max_tiles
+        self.tiles = OrderedDict()  # (函数, 级别, 序号) -> (x, y)
+        self.stats = {"hits": 0, "misses": 0}
+
+    def clear(self):
+        self.tiles.clear()
+
+    def sample(self, func, x_min, x_max):
+        """返回覆盖 [x_min, x_max] 的采样点 (x, y)"""
+        width = max(x_max - x_min, 1e-12)
+        level = int(np.floor(np.log2(width / self.TILES_PER_VIEW)))
+        tile_width = 2.0 ** level
+        first, last = int(np.floor(x_min / tile_width)), int(np.floor(x_max / tile_width))
+
+        keys = [(func.source, level, k) for k in range(first, last + 1)]
+        missing = [key for key in keys if key not in self.tiles]
+        self.stats["hits"] += len(keys) - len(missing)
+        self.stats["misses"] += len(missing)
+
+        if missing:
+            # 所有缺失瓦片合并为一次求值
+            grids = [np.linspace(k * tile_width, (k + 1) * tile_width, self.TILE_POINTS, endpoint=False)
+                     for _, _, k in missing]
+            values = np.split(func(np.concatenate(grids)), len(grids))
+            for key, x, y in zip(missing, grids, values):
+                self.tiles[key] = (x, y)
+
+        for key in keys:
+            self.tiles.move_to_end(key)
+        while len(self.tiles) > self.max_tiles:
+            self.tiles.popitem(last=False)
+
+        x = np.concatenate([self.tiles[key][0] for key in keys])
+        y = np.concatenate([self.tiles[key][1] for key in keys])
+        return x, y
+
+
+class TaylorCoefficientCache:
+    """泰勒系数缓存
+
+    按 (表达式, 展开点) 保存已求出的各阶导数和系数，阶数增加时只从上一阶导数继续求导，
+    滑块从 1 拖到 N 阶总共只需 N 次符号求导。
+    在后台线程中计算，被取代的旧任务在两阶之间退出，已求出的阶数保留在缓存中。
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (表达式, 展开点) -> 缓存条目
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def coefficients(self, compiled, center, n_terms, cancel_token=None):
+        """返回 0..n_terms 阶的 (精确系数列表, 数值系数数组)"""
+        with self._lock:
+            return self._coefficients(compiled, center, n_terms, cancel_token)
+
+    def _coefficients(self, compiled, center, n_terms, cancel_token):
+        key = (compiled.source, center)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = {"derivative": compiled.expr, "exact": [], "numeric": []}
+            self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+        x = compiled.symbols[0]
+        while len(entry["exact"]) <= n_terms:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            order = len(entry["exact"])
+            if order > 0:
+                # 只在上一阶导数的基础上再求一次导
+                entry["derivative"] = sp.diff(entry["derivative"], x)
+            coefficient = entry["derivative"].subs(x, center) / sp.factorial(order)
+            entry["exact"].append(coefficient)
+            try:
+                entry["numeric"].append(float(coefficient))
+            except (TypeError, ValueError):
+                entry["numeric"].append(np.nan)  # 展开点处导数不存在或为复数
+
+        return entry["exact"][:n_terms + 1], np.array(entry["numeric"][:n_terms + 1])
+
+    @staticmethod
+    def evaluate(coefficients, center, x_vals):
+        """霍纳法向量化计算部分和 sum(c_i * (x - center)**i)"""
+        dx = np.asarray(x_vals, dtype=float) - center
+        y = np.full_like(dx, coefficients[-1])
+        for c in coefficients[-2::-1]:
+            y = y * dx + c
+        return y
+
+
 class TrigPlotApp:
+    # 视图范围变化后延迟重新采样的时间（毫秒），快速滚动缩放时只处理最后一次
+    RESAMPLE_DELAY_MS = 30
+    # 收敛表使用的区间数
+    CONVERGENCE_NS = (2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+    # 辛普森法每个抛物线条带顶部的折线点数
+    SIMPSON_CURVE_POINTS = 9
+
     def __init__(self, root):
         self.root = root
         
@@ -50,12 +170,21 @@ class TrigPlotApp:
         # 初始化防抖计时器
         self.rectangle_update_timer = None
         self.taylor_update_timer = None
+        self.resample_timer = None
+        # 泰勒展开的后台任务键：拖动滑块时新的计算取代旧的，过期结果直接丢弃
+        self.taylor_task_key = f"taylor_{id(self)}"
+        
+        # 函数采样瓦片缓存
+        self.tile_cache = FunctionTileCache()
+        # 泰勒系数缓存
+        self.taylor_cache = TaylorCoefficientCache()
 
         # 添加控制变量
         self.draw_rectangles = tk.BooleanVar(value=False)  # 控制是否绘制矩形
         self.draw_taylor = tk.BooleanVar(value=False)  # 控制是否绘制泰勒曲线
         self.draw_tangent = tk.BooleanVar(value=False)  # 控制是否绘制切线
         self.draw_division = tk.BooleanVar(value=False)  # 控制是否绘制分割点连接线
+        self.integration_rule = tk.StringVar(value=RULES["midpoint"])  # 数值积分规则
 
         # 创建主框架
         main_frame = ttk.Frame(self.root)
@@ -274,6 +403,17 @@ class TrigPlotApp:
         self.rectangles_label = ttk.Label(rect_control_frame, text="矩形数：10")
         self.rectangles_label.pack(side=tk.LEFT, padx=5)
 
+        # 积分规则选择
+        rule_frame = ttk.Frame(frame)
+        rule_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(rule_frame, text="积分规则:").pack(side=tk.LEFT)
+        rule_combo = ttk.Combobox(rule_frame, textvariable=self.integration_rule,
+                                  values=list(RULES.values()), width=8, state='readonly')
+        rule_combo.pack(side=tk.LEFT, padx=5)
+        rule_combo.bind("<<ComboboxSelected>>",
+                        lambda e: self.update_rectangles(self.rectangles_slider.get()))
+        ttk.Button(rule_frame, text="收敛表", command=self.show_convergence_table).pack(side=tk.LEFT, padx=5)
+
         # 矩形范围输入
         range_frame = ttk.Frame(frame)
         range_frame.pack(fill=tk.X, pady=5)
@@ -513,7 +653,8 @@ class TrigPlotApp:
                 self.func_line.remove()
                 self.func_line = None
 
-            # 如果有泰勒曲线，清除它
+            # 如果有泰勒曲线，清除它（并丢弃尚未返回的计算）
+            get_thread_manager().cancel_key(self.taylor_task_key)
             if hasattr(self, 'taylor_plot') and self.taylor_plot:
                 self.taylor_plot.remove()
                 self.taylor_plot = None
@@ -542,25 +683,15 @@ class TrigPlotApp:
             # 解析函数表达式
             func_expr = self.function_entry.get() if hasattr(self, 'function_entry') else "sin(x)"
             
-            # 创建函数
+            # 创建函数（共享的表达式缓存，返回向量化函数，无定义处为NaN）
             x = sp.Symbol('x')
-            expr = parse_expr(func_expr, transformations=(standard_transformations + (implicit_multiplication_application,)))
+            compiled = expression_manager.compile(func_expr, ("x",))
+            expr = compiled.expr
+            self.user_function = compiled  # 保存函数引用，以便其他方法使用
             
-            # 将sympy表达式转换为可计算的Python函数
-            func_lambda = sp.lambdify(x, expr, modules=['numpy'])
-            self.user_function = func_lambda  # 保存函数引用，以便其他方法使用
-            
-            # 获取绘图范围
+            # 获取绘图范围（按瓦片采样，访问过的区间直接复用）
             xlim = self.ax.get_xlim()
-            x_vals = np.linspace(xlim[0], xlim[1], 1000)  # 使用1000个点来绘制平滑曲线
-            
-            # 计算y值 - 使用try/except捕获可能的计算错误
-            y_vals = []
-            for x_val in x_vals:
-                try:
-                    y_vals.append(func_lambda(x_val))
-                except (ValueError, ZeroDivisionError, OverflowError):
-                    y_vals.append(np.nan)  # 对于无法计算的点，使用NaN
+            x_vals, y_vals = self.tile_cache.sample(compiled, xlim[0], xlim[1])
             
             # 更新或创建函数曲线
             if hasattr(self, 'func_line') and self.func_line:
@@ -639,21 +770,15 @@ class TrigPlotApp:
             xlim = self.ax.get_xlim()
             
             # 在当前x轴范围内计算y值
-            x_vals = np.linspace(xlim[0], xlim[1], 1000)
-            y_vals = []
-            
-            for x_val in x_vals:
-                try:
-                    y_vals.append(self.user_function(x_val))
-                except (ValueError, ZeroDivisionError, OverflowError):
-                    y_vals.append(np.nan)
+            x_vals, y_vals = self.tile_cache.sample(self.user_function, xlim[0], xlim[1])
+            visible = (x_vals >= xlim[0]) & (x_vals <= xlim[1])
             
             # 过滤掉无效值
-            valid_y = [y for y in y_vals if not (np.isnan(y) or np.isinf(y))]
+            valid_y = y_vals[visible & np.isfinite(y_vals)]
             
-            if valid_y:
+            if valid_y.size:
                 # 计算y轴范围
-                y_min, y_max = min(valid_y), max(valid_y)
+                y_min, y_max = valid_y.min(), valid_y.max()
                 y_range = y_max - y_min
                 
                 # 设置y轴范围，添加一些边距
@@ -718,31 +843,24 @@ class TrigPlotApp:
         self.canvas.draw_idle()
 
     def on_xlim_change(self, ax):
-        """处理x轴范围变化事件"""
-        # 如果有用户函数，重新绘制
+        """处理x轴范围变化事件（防抖：连续缩放/平移时只在停下后重新采样一次）"""
         if hasattr(self, 'user_function') and self.user_function:
-            # 获取当前x轴范围
-            xlim = self.ax.get_xlim()
-            
-            # 重新计算函数值
-            x_vals = np.linspace(xlim[0], xlim[1], 1000)
-            y_vals = []
-            
-            for x_val in x_vals:
-                try:
-                    y_vals.append(self.user_function(x_val))
-                except (ValueError, ZeroDivisionError, OverflowError):
-                    y_vals.append(np.nan)
-            
-            # 更新函数曲线
-            if hasattr(self, 'func_line') and self.func_line:
-                self.func_line.set_data(x_vals, y_vals)
-            
-            # 更新其他可能的图形元素
-            # 例如：更新矩形、泰勒曲线等
-            
-            # 重新绘制
-            self.canvas.draw_idle()
+            if self.resample_timer is not None:
+                self.root.after_cancel(self.resample_timer)
+            self.resample_timer = self.root.after(self.RESAMPLE_DELAY_MS, self._resample_view)
+
+    def _resample_view(self):
+        """按当前视图范围重新采样函数曲线"""
+        self.resample_timer = None
+        if not self.user_function or not getattr(self, 'func_line', None):
+            return
+        
+        xlim = self.ax.get_xlim()
+        x_vals, y_vals = self.tile_cache.sample(self.user_function, xlim[0], xlim[1])
+        self.func_line.set_data(x_vals, y_vals)
+        
+        # 重新绘制
+        self.canvas.draw_idle()
 
     def toggle_rectangles(self):
         """切换是否显示矩形"""
@@ -763,6 +881,7 @@ class TrigPlotApp:
         if self.draw_taylor.get():
             self._update_taylor()
         else:
+            get_thread_manager().cancel_key(self.taylor_task_key)
             if hasattr(self, 'taylor_plot') and self.taylor_plot:
                 self.taylor_plot.remove()
                 self.taylor_plot = None
@@ -936,46 +1055,20 @@ class TrigPlotApp:
             total_rectangles = int(num_rectangles * interval_length / 10)
             total_rectangles = max(1, total_rectangles)  # 确保至少有1个矩形
             
-            # 计算矩形宽度
-            width = (b - a) / total_rectangles
-            
-            # 计算每个矩形的高度（使用矩形中点的函数值）
-            heights = []
-            for i in range(total_rectangles):
-                x = a + i * width
-                x_mid = x + width/2  # 计算矩形的中点x坐标
-                try:
-                    height = self.user_function(x_mid)  # 使用中点计算高度
-                    if np.isnan(height) or np.isinf(height):
-                        height = 0
-                    heights.append(height)
-                except (ValueError, ZeroDivisionError, OverflowError):
-                    heights.append(0)
-            
-            # 绘制矩形
-            total_area = 0
-            for i in range(total_rectangles):
-                x = a + i * width
-                height = heights[i]
-                
-                # 计算矩形面积
-                area = width * height
-                total_area += area
-                
-                # 绘制矩形
-                if height >= 0:
-                    rect = plt.Rectangle((x, 0), width, height, 
-                                        facecolor='blue', alpha=0.3, edgecolor='blue')
-                    # 在矩形顶部中点绘制一个小点
-                    self.ax.plot(x + width/2, height, 'bo', markersize=3)
-                else:
-                    rect = plt.Rectangle((x, height), width, -height, 
-                                        facecolor='red', alpha=0.3, edgecolor='red')
-                    # 在矩形顶部中点绘制一个小点
-                    self.ax.plot(x + width/2, height, 'ro', markersize=3)
-                
-                self.ax.add_patch(rect)
-                self.rects.append(rect)
+            # 所有节点一次性求值（无定义处按0处理）
+            rule = self._get_integration_rule()
+            nodes, weights = nodes_and_weights(a, b, total_rectangles, rule)
+            heights = finite_values(self.user_function, nodes)
+            total_area = float(np.dot(weights, heights))
+            
+            # 所有条带合并为一个多边形集合，标记点合并为一个散点集合
+            verts = self._build_strip_polygons(a, b, total_rectangles, rule, heights)
+            strip_heights = verts[:, 2:, 1].mean(axis=1)
+            strip_colors = np.where(strip_heights >= 0, 'blue', 'red')
+            strips = PolyCollection(verts, facecolors=strip_colors, edgecolors=strip_colors, alpha=0.3)
+            self.ax.add_collection(strips)
+            markers = self.ax.scatter(nodes, heights, c=np.where(heights >= 0, 'blue', 'red'), s=9, zorder=3)
+            self.rects = [strips, markers]
             
             # 更新矩形面积显示
             if hasattr(self, 'area_text'):
@@ -991,6 +1084,62 @@ class TrigPlotApp:
             print(f"更新矩形时出错: {str(e)}")
             self.clear_rectangles()
 
+    def _get_integration_rule(self):
+        """当前选择的积分规则名称"""
+        display_name = self.integration_rule.get()
+        for rule, name in RULES.items():
+            if name == display_name:
+                return rule
+        return "midpoint"
+
+    def _build_strip_polygons(self, a, b, n, rule, heights):
+        """构造每个积分条带的多边形顶点，形状 (条带数, 顶点数, 2)"""
+        n = effective_intervals(n, rule)
+        edges = np.linspace(a, b, n + 1)
+        
+        if rule in ("left", "right", "midpoint"):
+            # 矩形：底边两点 + 顶边两点（高度为节点处函数值）
+            left, right = edges[:-1], edges[1:]
+            xs = np.stack([left, right, right, left], axis=1)
+            ys = np.stack([np.zeros(n), np.zeros(n), heights, heights], axis=1)
+        elif rule == "trapezoid":
+            left, right = edges[:-1], edges[1:]
+            xs = np.stack([left, right, right, left], axis=1)
+            ys = np.stack([np.zeros(n), np.zeros(n), heights[1:], heights[:-1]], axis=1)
+        else:
+            # 辛普森：每两个区间为一条带，顶部为过三个节点的抛物线
+            y0, y1, y2 = heights[0:-1:2], heights[1::2], heights[2::2]
+            left, right = edges[0:-1:2], edges[2::2]
+            s = np.linspace(-1.0, 1.0, self.SIMPSON_CURVE_POINTS)[::-1]
+            # 以条带中点为原点的拉格朗日插值
+            top = (y0[:, None] * s * (s - 1) / 2 + y1[:, None] * (1 - s ** 2)
+                   + y2[:, None] * s * (s + 1) / 2)
+            mid, half = (left + right) / 2, (right - left) / 2
+            xs = np.hstack([left[:, None], right[:, None], mid[:, None] + half[:, None] * s])
+            ys = np.hstack([np.zeros((len(left), 2)), top])
+        return np.stack([xs, ys], axis=2)
+
+    def show_convergence_table(self):
+        """显示各积分规则随区间数 N 的收敛情况（所有规则和 N 一次性求值）"""
+        try:
+            if not hasattr(self, 'user_function') or self.user_function is None:
+                messagebox.showinfo("提示", "请先输入并绘制函数")
+                return
+            a = float(self.rect_min_entry.get())
+            b = float(self.rect_max_entry.get())
+            
+            from scipy import integrate
+            exact, _ = integrate.quad(self.user_function.scalar, a, b, limit=200)
+            table = convergence_table(self.user_function, a, b, self.CONVERGENCE_NS)
+            
+            lines = [f"收敛表: ∫[{a:g}, {b:g}] f(x)dx ≈ {exact:.10g}", "误差 |近似值 - 积分值|:", ""]
+            lines.append("N".rjust(6) + "".join(RULES[rule].rjust(10) for rule in table))
+            for k, n in enumerate(self.CONVERGENCE_NS):
+                lines.append(f"{n:6d}" + "".join(f"{abs(values[k] - exact):10.2e}" for values in table.values()))
+            self.update_function_info("\n".join(lines))
+        except Exception as e:
+            messagebox.showerror("积分错误", f"计算收敛表时出错: {str(e)}")
+
     def calculate_integral(self):
         """计算定积分"""
         try:
@@ -1108,7 +1257,7 @@ class TrigPlotApp:
             self.clear_division()
 
     def _update_taylor(self):
-        """更新泰勒级数的计算和显示"""
+        """读取阶数和展开点，把泰勒展开的计算提交到后台（符号求导可能较慢）"""
         try:
             if not hasattr(self, 'user_function') or self.user_function is None:
                 messagebox.showinfo("提示", "请先输入并绘制函数")
@@ -1122,35 +1271,48 @@ class TrigPlotApp:
             # 更新阶数标签
             if hasattr(self, 'taylor_label'):
                 self.taylor_label.config(text=f"阶数：{n_terms}")
-            
-            # 使用sympy计算泰勒展开
-            x = sp.Symbol('x')
-            func_expr = self.function_entry.get()
-            expr = parse_expr(func_expr, transformations=(standard_transformations + (implicit_multiplication_application,)))
-            
-            # 计算泰勒级数 - 确保即使是偶数阶也能正确展开
-            taylor_series = sum([(sp.diff(expr, x, i).subs(x, center) / sp.factorial(i)) * (x - center)**i for i in range(n_terms + 1)])
-            
-            # 将泰勒级数转换为可计算的函数
-            taylor_func = sp.lambdify(x, taylor_series, modules=['numpy'])
-            
-            # 绘制泰勒曲线
-            xlim = self.ax.get_xlim()
-            x_vals = np.linspace(xlim[0], xlim[1], 1000)
-            
-            # 计算y值，处理可能的错误
-            y_vals = []
-            for x_val in x_vals:
-                try:
-                    y_vals.append(taylor_func(x_val))
-                except (ValueError, ZeroDivisionError, OverflowError):
-                    y_vals.append(np.nan)
-            
+        except Exception as e:
+            self._show_taylor_error(e)
+            return
+        
+        manager = get_thread_manager()
+        if manager.root is None:
+            manager.attach(self.root.winfo_toplevel())
+        manager.submit_task(self._compute_taylor, self._on_taylor_done, None, "正在计算...",
+                            self.user_function, center, n_terms, self.ax.get_xlim(),
+                            key=self.taylor_task_key, pass_token=True)
+
+    def _compute_taylor(self, compiled, center, n_terms, xlim, cancel_token=None):
+        """后台线程：求泰勒系数（只补算新增的阶数）并用霍纳法向量化求值"""
+        x = sp.Symbol('x')
+        exact, coefficients = self.taylor_cache.coefficients(compiled, center, n_terms, cancel_token)
+        taylor_series = sum(c * (x - center)**i for i, c in enumerate(exact))
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        
+        x_vals = np.linspace(xlim[0], xlim[1], 1000)
+        with np.errstate(all='ignore'):
+            y_vals = TaylorCoefficientCache.evaluate(coefficients, center, x_vals)
+        return {"center": center, "n_terms": n_terms, "x": x_vals, "y": y_vals,
+                "formula": str(taylor_series)}
+
+    def _on_taylor_done(self, task_result):
+        """主线程：绘制最新一次提交的泰勒展开结果"""
+        if not task_result.success:
+            if not isinstance(task_result.error, TaskCancelledError):
+                self._show_taylor_error(task_result.error)
+            return
+        if not self.draw_taylor.get():
+            return
+        result = task_result.result
+        n_terms = result["n_terms"]
+        try:
             # 更新或创建泰勒曲线
             if hasattr(self, 'taylor_plot') and self.taylor_plot:
-                self.taylor_plot.set_data(x_vals, y_vals)
+                self.taylor_plot.set_data(result["x"], result["y"])
+                self.taylor_plot.set_label(f'泰勒级数 (n={n_terms})')
             else:
-                self.taylor_plot, = self.ax.plot(x_vals, y_vals, 'g--', linewidth=2, label=f'泰勒级数 (n={n_terms})')
+                self.taylor_plot, = self.ax.plot(result["x"], result["y"], 'g--', linewidth=2, label=f'泰勒级数 (n={n_terms})')
             
             # 更新图例
             self.ax.legend(loc='upper right', prop={'family':'SimHei', 'size':10})
@@ -1160,25 +1322,27 @@ class TrigPlotApp:
             
             # 更新泰勒公式显示
             if hasattr(self, 'taylor_formula_text'):
-                # 将泰勒级数转换为字符串
-                taylor_str = str(taylor_series)
-                
-                # 更新文本框
                 self.taylor_formula_text.config(state=tk.NORMAL)
                 self.taylor_formula_text.delete(1.0, tk.END)
-                formula_display = f"f(x) ≈ {taylor_str}   (在 x={center} 处的 {n_terms} 阶泰勒展开)"
+                formula_display = f"f(x) ≈ {result['formula']}   (在 x={result['center']} 处的 {n_terms} 阶泰勒展开)"
                 self.taylor_formula_text.insert(tk.END, formula_display)
                 self.taylor_formula_text.config(state=tk.DISABLED)
-            
         except Exception as e:
-            messagebox.showerror("泰勒更新错误", f"更新泰勒展开时出错: {str(e)}")
-            print(f"泰勒展开错误: {str(e)}")
-            # 清除泰勒公式显示
-            if hasattr(self, 'taylor_formula_text'):
-                self.taylor_formula_text.config(state=tk.NORMAL)
-                self.taylor_formula_text.delete(1.0, tk.END)
-                self.taylor_formula_text.insert(tk.END, f"泰勒展开错误: {str(e)}")
-                self.taylor_formula_text.config(state=tk.DISABLED)
+            self._show_taylor_error(e)
+
+    def _show_taylor_error(self, e):
+        messagebox.showerror("泰勒更新错误", f"更新泰勒展开时出错: {str(e)}")
+        print(f"泰勒展开错误: {str(e)}")
+        # 清除泰勒公式显示
+        if hasattr(self, 'taylor_formula_text'):
+            self.taylor_formula_text.config(state=tk.NORMAL)
+            self.taylor_formula_text.delete(1.0, tk.END)
+            self.taylor_formula_text.insert(tk.END, f"泰勒展开错误: {str(e)}")
+            self.taylor_formula_text.config(state=tk.DISABLED)
+
+    def cleanup(self):
+        """页面回收时丢弃尚未返回的泰勒展开计算"""
+        get_thread_manager().cancel_key(self.taylor_task_key)
 
     def _on_taylor_slider_change(self, value):
         """处理泰勒滑块值变化"""
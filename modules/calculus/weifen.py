@@ -3,23 +3,254 @@ from tkinter import ttk, messagebox, colorchooser
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from scipy.integrate import solve_ivp
 import matplotlib.colors as mcolors
 from matplotlib.figure import Figure
 import matplotlib
+from matplotlib.collections import LineCollection
+import contourpy
+from collections import OrderedDict
+from functools import partial
 from knowledge import KnowledgeLearningClass
+from core.config_manager import config_manager
+from core.expression_manager import expression_manager
+from core.thread_manager import get_thread_manager
+from common.ode_batch import integrate_batch, integrate_seeds, submit_seeds_to_process_pool
 
 # 配置 Matplotlib 以支持中文显示
 matplotlib.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'DejaVu Sans']
 matplotlib.rcParams['axes.unicode_minus'] = False  # 确保负号正确显示
 matplotlib.rcParams['font.family'] = 'sans-serif'
 
+class SlopeField:
+    """斜率场 - 在网格上一次性向量化求出的 dy/dx 及归一化方向向量"""
+
+    def __init__(self, func, x_min, x_max, y_min, y_max, density):
+        self.x = np.linspace(x_min, x_max, density)
+        self.y = np.linspace(y_min, y_max, density)
+        self.X, self.Y = np.meshgrid(self.x, self.y)
+        
+        slopes = func(self.X, self.Y)
+        # NaN（无定义）被屏蔽不画箭头；±inf 表示竖直方向
+        self.slopes = np.ma.masked_invalid(slopes)
+        infinite = np.isinf(slopes)
+        with np.errstate(invalid='ignore', over='ignore'):
+            norm = np.sqrt(1 + slopes ** 2)
+            U = np.where(infinite, 0.0, 1 / norm)
+            V = np.where(infinite, 1.0, slopes / norm)
+        mask = np.isnan(slopes)
+        self.U = np.ma.array(U, mask=mask)
+        self.V = np.ma.array(V, mask=mask)
+        self._streamlines = {}
+
+    def interpolate(self, x, y):
+        """在网格上双线性插值斜率（网格外或无定义处为NaN）"""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        n = len(self.x)
+        fx = (x - self.x[0]) / (self.x[-1] - self.x[0]) * (n - 1)
+        fy = (y - self.y[0]) / (self.y[-1] - self.y[0]) * (n - 1)
+        with np.errstate(invalid='ignore'):
+            outside = ~((fx >= 0) & (fx <= n - 1) & (fy >= 0) & (fy <= n - 1))
+        fx = np.clip(np.nan_to_num(fx), 0, n - 1)
+        fy = np.clip(np.nan_to_num(fy), 0, n - 1)
+        i = np.minimum(fx.astype(int), n - 2)
+        j = np.minimum(fy.astype(int), n - 2)
+        tx, ty = fx - i, fy - j
+        S = self.slopes.filled(np.nan)
+        with np.errstate(invalid='ignore'):
+            value = ((1 - tx) * (1 - ty) * S[j, i] + tx * (1 - ty) * S[j, i + 1]
+                     + (1 - tx) * ty * S[j + 1, i] + tx * ty * S[j + 1, i + 1])
+        return np.where(outside, np.nan, value)
+
+    def streamline_seeds(self, separation=2):
+        """流线的种子点：每隔 separation 个网格取一点"""
+        seeds_x, seeds_y = np.meshgrid(self.x[separation // 2::separation], self.y[separation // 2::separation])
+        return seeds_x.ravel(), seeds_y.ravel()
+
+    def cached_streamlines(self, separation=2, steps=100):
+        """已求出的流线，尚未计算时为 None"""
+        return self._streamlines.get((separation, steps))
+
+    def streamlines(self, separation=2, steps=100):
+        """均匀分布的流线（结果缓存）
+
+        在间隔为 separation 个网格的种子点上用插值斜率批量积分，然后依次接受各条流线：
+        种子已被占据则跳过，流线进入其他流线占据的网格时截断，从而保持大致均匀的间距
+        """
+        lines = self.cached_streamlines(separation, steps)
+        if lines is not None:
+            return lines
+
+        seeds_x, seeds_y = self.streamline_seeds(separation)
+        count = len(seeds_x)
+        y_bounds = (self.y[0], self.y[-1])
+        xs, ys = integrate_batch(self.interpolate,
+                                 np.concatenate([seeds_x, seeds_x]), np.concatenate([seeds_y, seeds_y]),
+                                 np.concatenate([np.full(count, self.x[-1]), np.full(count, self.x[0])]),
+                                 y_bounds, steps)
+        return self.accept_streamlines(seeds_x, seeds_y, (xs[:count], ys[:count]), (xs[count:], ys[count:]),
+                                       separation, steps)
+
+    def accept_streamlines(self, seeds_x, seeds_y, forward, backward, separation=2, steps=100):
+        """由各种子点向前、向后的轨迹 (xs, ys) 挑选互不重叠的流线，结果存入缓存"""
+        n = len(self.x)
+        count = len(seeds_x)
+        (forward_x, forward_y), (backward_x, backward_y) = forward, backward
+
+        # 占据网格：分辨率与斜率场网格一致
+        occupied = np.zeros((n, n), dtype=int)
+        scale_x = (n - 1) / (self.x[-1] - self.x[0])
+        scale_y = (n - 1) / (self.y[-1] - self.y[0])
+
+        def cells(px, py):
+            ci = np.clip(np.round((px - self.x[0]) * scale_x), 0, n - 1).astype(int)
+            cj = np.clip(np.round((py - self.y[0]) * scale_y), 0, n - 1).astype(int)
+            return cj, ci
+
+        lines = []
+        for k in range(count):
+            owner = k + 1
+            if occupied[cells(seeds_x[k], seeds_y[k])]:
+                continue
+            pieces = []
+            for px, py in ((forward_x[k], forward_y[k]), (backward_x[k], backward_y[k])):
+                valid = np.isfinite(py)
+                px, py = px[valid], py[valid]
+                cj, ci = cells(px, py)
+                taken = (occupied[cj, ci] != 0) & (occupied[cj, ci] != owner)
+                stop = np.argmax(taken) if taken.any() else len(px)
+                pieces.append((px[:stop], py[:stop]))
+                occupied[cj[:stop], ci[:stop]] = owner
+            (fx, fy), (bx, by) = pieces
+            line = np.column_stack([np.concatenate([bx[::-1], fx[1:]]), np.concatenate([by[::-1], fy[1:]])])
+            if len(line) >= 3:
+                lines.append(line)
+
+        self._streamlines[(separation, steps)] = lines
+        return lines
+
+    def isoclines(self, values):
+        """等斜线：对斜率场在给定斜率值处取等值线，返回 (线段列表, 对应斜率值)"""
+        generator = contourpy.contour_generator(self.x, self.y, self.slopes)
+        lines, levels = [], []
+        for value in values:
+            for line in generator.lines(value):
+                if len(line) >= 2:
+                    lines.append(line)
+                    levels.append(value)
+        return lines, levels
+
+
+class CurveAnimator:
+    """积分曲线动画 - 由 Tk 的 after 逐帧调度，原地更新 Line2D 数据，并用 blit 只重绘曲线
+
+    每条曲线从初始点同时向两端展开；不会阻塞事件循环，可随时取消。
+    overlays 中的其他 animated 图形（如悬停读数）与动画曲线共用同一份背景，一起 blit
+    """
+
+    def __init__(self, root, canvas, ax, frames=40, interval=30):
+        self.root = root
+        self.canvas = canvas
+        self.ax = ax
+        self.frames = frames
+        self.interval = interval
+        self.lines = []
+        self.curves = []
+        self.frame = 0
+        self.background = None
+        self.overlays = []
+        self._job = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    @property
+    def running(self):
+        return self._job is not None
+
+    def start(self, lines, curves):
+        """开始动画
+
+        Args:
+            lines: 以 animated=True 创建的 Line2D 列表
+            curves: 与 lines 对应的 (x, y, 初始点下标) 列表
+        """
+        self.cancel()
+        self.lines = lines
+        self.curves = curves
+        self.frame = 0
+        # 调用方需先完成一次完整绘制，背景中不包含动画曲线
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._job = self.root.after(self.interval, self._step)
+
+    def cancel(self):
+        """停止动画，已显示的部分保持不变"""
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        for line in self.lines:
+            line.set_animated(False)
+        self.lines = []
+        self.curves = []
+        # 结束的曲线转为普通图形，旧背景中没有它们，等下一次完整重绘重新截取
+        self.background = None
+
+    def _step(self):
+        self._job = None
+        self.frame += 1
+        progress = self.frame / self.frames
+        for line, (x, y, center) in zip(self.lines, self.curves):
+            reach = int(np.ceil(progress * max(center, len(x) - 1 - center)))
+            start, stop = max(0, center - reach), min(len(x), center + reach + 1)
+            line.set_data(x[start:stop], y[start:stop])
+        self.blit()
+
+        if self.frame < self.frames:
+            self._job = self.root.after(self.interval, self._step)
+        else:
+            # 结束后转为普通图形，参与之后的完整重绘
+            self.cancel()
+            self.canvas.draw_idle()
+
+    def blit(self):
+        """恢复背景后只重绘动画曲线和叠加图形；尚无背景时返回 False，由调用方完整重绘"""
+        if self.background is None:
+            return False
+        self.canvas.restore_region(self.background)
+        for artist in self.lines + self.overlays:
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.ax.bbox)
+        return True
+
+    def _on_draw(self, event):
+        """窗口缩放、范围变化等引起完整重绘后，重新截取背景并补画动画曲线和叠加图形"""
+        if self.lines or self.overlays:
+            self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+            for artist in self.lines + self.overlays:
+                self.ax.draw_artist(artist)
+
+
 class DirectionFieldApp:
+    # 斜率场缓存条目数（按 方程+范围+密度 区分）
+    FIELD_CACHE_SIZE = 8
+    # 积分曲线每个方向的步数
+    ODE_STEPS = 200
+    # 流线每个方向的步数
+    STREAMLINE_STEPS = 100
+    # 鼠标悬停信息的最短刷新间隔（毫秒），约等于屏幕刷新周期
+    HOVER_INTERVAL_MS = 16
+
     def __init__(self, root):
         self.root = root
         
         
         self.knowledge_learner = KnowledgeLearningClass()
+        self.field_cache = OrderedDict()
+        
+        # 悬停斜率：使用当前已绘制方程的编译结果，事件按刷新周期合并处理
+        self.hover_function = None
+        self.hover_position = None
+        self.hover_job = None
+        # 流线网格较大时交给进程池计算，新的绘制取代尚未返回的旧任务
+        self.streamline_task_key = f"streamlines_{id(self)}"
 
         # 设置样式
         self.style = ttk.Style()
@@ -107,17 +338,20 @@ class DirectionFieldApp:
         # 添加显示选项
         self.show_field_var = tk.BooleanVar(value=True)
         show_field_check = ttk.Checkbutton(control_frame, text="显示方向场", 
-                                         variable=self.show_field_var)
+                                         variable=self.show_field_var,
+                                         command=self.plot_direction_field_and_curves)
         show_field_check.grid(row=9, column=0, sticky=tk.W, pady=5)
         
         self.show_curves_var = tk.BooleanVar(value=True)
         show_curves_check = ttk.Checkbutton(control_frame, text="显示积分曲线", 
-                                          variable=self.show_curves_var)
+                                          variable=self.show_curves_var,
+                                         command=self.plot_direction_field_and_curves)
         show_curves_check.grid(row=9, column=1, sticky=tk.W, pady=5)
         
         self.show_grid_var = tk.BooleanVar(value=True)
         show_grid_check = ttk.Checkbutton(control_frame, text="显示网格", 
-                                        variable=self.show_grid_var)
+                                        variable=self.show_grid_var,
+                                         command=self.plot_direction_field_and_curves)
         show_grid_check.grid(row=10, column=0, sticky=tk.W, pady=5)
         
         # 添加动画选项
@@ -126,6 +360,21 @@ class DirectionFieldApp:
                                       variable=self.animate_var)
         animate_check.grid(row=10, column=1, sticky=tk.W, pady=5)
         
+        # 方向场显示方式与等斜线
+        ttk.Label(control_frame, text="方向场样式:").grid(row=14, column=0, sticky=tk.W, pady=5)
+        self.field_mode_var = tk.StringVar(value="箭头")
+        field_mode_combo = ttk.Combobox(control_frame, textvariable=self.field_mode_var,
+                                        values=["箭头", "流线"], width=10, state='readonly')
+        field_mode_combo.grid(row=14, column=1, sticky=tk.W, pady=5)
+        field_mode_combo.bind("<<ComboboxSelected>>", lambda e: self.plot_direction_field_and_curves())
+        
+        self.show_isoclines_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="等斜线 (斜率):", variable=self.show_isoclines_var,
+                        command=self.plot_direction_field_and_curves).grid(row=15, column=0, sticky=tk.W, pady=5)
+        self.isocline_entry = ttk.Entry(control_frame, width=25)
+        self.isocline_entry.grid(row=15, column=1, sticky=tk.W, pady=5)
+        self.isocline_entry.insert(0, "-1,0,1")
+        
         # 绘制按钮
         plot_button = ttk.Button(control_frame, text="绘制", command=self.plot_direction_field_and_curves)
         plot_button.grid(row=11, column=0, columnspan=2, pady=10)
@@ -174,6 +423,9 @@ class DirectionFieldApp:
         self.toolbar = NavigationToolbar2Tk(self.canvas, self.plot_frame)
         self.toolbar.update()
         
+        # 积分曲线动画
+        self.animator = CurveAnimator(self.root, self.canvas, self.ax)
+        
         # 绑定鼠标事件
         self.canvas.mpl_connect('button_press_event', self.on_click)
         self.canvas.mpl_connect('motion_notify_event', self.on_hover)
@@ -184,6 +436,20 @@ class DirectionFieldApp:
             color_var.set(color)
             self.plot_direction_field_and_curves()
 
+    def get_slope_field(self, equation_str, x_min, x_max, y_min, y_max, density):
+        """获取斜率场；相同方程、范围和密度时直接使用缓存，不重新求值"""
+        func = expression_manager.compile(equation_str, ("x", "y"))
+        key = (func.source, x_min, x_max, y_min, y_max, density)
+        field = self.field_cache.get(key)
+        if field is None:
+            field = SlopeField(func, x_min, x_max, y_min, y_max, density)
+            self.field_cache[key] = field
+            while len(self.field_cache) > self.FIELD_CACHE_SIZE:
+                self.field_cache.popitem(last=False)
+        else:
+            self.field_cache.move_to_end(key)
+        return field
+
     def plot_direction_field_and_curves(self):
         equation_str = self.equation_entry.get()
         initial_condition_str = self.initial_condition_entry.get()
@@ -221,20 +487,14 @@ class DirectionFieldApp:
                     offset = (i - num_curves/2) * (y_max - y_min) / 10
                     initial_conditions.append((x0, y0 + offset))
             
-            # 定义微分方程
-            def dydx(x, y):
-                # 安全地评估表达式
-                try:
-                    return eval(equation_str, {"__builtins__": {}}, 
-                              {"x": x, "y": y, "sin": np.sin, "cos": np.cos, 
-                               "tan": np.tan, "exp": np.exp, "log": np.log, 
-                               "sqrt": np.sqrt, "pi": np.pi})
-                except Exception as e:
-                    print(f"计算错误: {e}")
-                    return 0
-
-            # 清除旧图
+            self.hover_function = expression_manager.compile(equation_str, ("x", "y"))
+            
+            # 停止尚未结束的动画和流线计算，清除旧图
+            self.animator.cancel()
+            get_thread_manager().cancel_key(self.streamline_task_key)
             self.ax.clear()
+            self._create_hover_artists()
+            animated_lines, animated_curves = [], []
             
             # 设置坐标轴范围
             self.ax.set_xlim(x_min, x_max)
@@ -251,135 +511,85 @@ class DirectionFieldApp:
             else:
                 self.ax.grid(False)
             
-            # 绘制方向场
-            if self.show_field_var.get():
+            # 绘制方向场（箭头、流线和等斜线共用同一次斜率场求值）
+            field = None
+            if self.show_field_var.get() or self.show_isoclines_var.get():
                 density = self.density_var.get()
-                x = np.linspace(x_min, x_max, density)
-                y = np.linspace(y_min, y_max, density)
-                X, Y = np.meshgrid(x, y)
-                
-                # 计算斜率
-                U = np.ones_like(X)
-                V = np.zeros_like(Y)
-                
-                # 安全计算每个点的斜率
-                for i in range(len(x)):
-                    for j in range(len(y)):
-                        try:
-                            slope = dydx(X[j, i], Y[j, i])
-                            if np.isfinite(slope):
-                                # 归一化向量
-                                norm = np.sqrt(1 + slope**2)
-                                U[j, i] = 1 / norm
-                                V[j, i] = slope / norm
-                            else:
-                                U[j, i] = 0
-                                V[j, i] = 1  # 垂直向量表示无穷斜率
-                        except:
-                            U[j, i] = 0
-                            V[j, i] = 0
-                
-                # 使用自定义颜色绘制方向场
+                field = self.get_slope_field(equation_str, x_min, x_max, y_min, y_max, density)
+            
+            if self.show_field_var.get():
                 field_color = self.field_color_var.get()
-                self.ax.quiver(X, Y, U, V, color=field_color, 
-                             angles='xy', scale_units='xy', scale=25,
-                             alpha=0.8, width=0.003, headwidth=5, headlength=7)
+                if self.field_mode_var.get() == "流线":
+                    self._draw_streamlines(field, equation_str, field_color)
+                else:
+                    # 使用自定义颜色绘制方向场
+                    self.ax.quiver(field.X, field.Y, field.U, field.V, color=field_color, 
+                                 angles='xy', scale_units='xy', scale=25,
+                                 alpha=0.8, width=0.003, headwidth=5, headlength=7)
+            
+            if self.show_isoclines_var.get():
+                values = [float(v) for v in self.isocline_entry.get().split(',') if v.strip()]
+                lines, levels = field.isoclines(values)
+                if lines:
+                    isoclines = LineCollection(lines, cmap='coolwarm', linewidths=1.5, linestyles='--')
+                    isoclines.set_array(np.asarray(levels))
+                    self.ax.add_collection(isoclines)
             
             # 绘制积分曲线
             if self.show_curves_var.get() and initial_conditions:
                 curve_color = self.curve_color_var.get()
                 
-                for idx, (x0, y0) in enumerate(initial_conditions):
-                    # 确保初始点在范围内
-                    if x_min <= x0 <= x_max and y_min <= y0 <= y_max:
-                        # 向前积分
-                        sol_forward = solve_ivp(
-                            dydx, 
-                            [x0, x_max], 
-                            [y0], 
-                            method='RK45',
-                            dense_output=True,
-                            events=lambda x, y: self._out_of_bounds(x, y, y_min, y_max),
-                            rtol=1e-5
-                        )
-                        
-                        # 向后积分
-                        sol_backward = solve_ivp(
-                            dydx, 
-                            [x0, x_min], 
-                            [y0], 
-                            method='RK45',
-                            dense_output=True,
-                            events=lambda x, y: self._out_of_bounds(x, y, y_min, y_max),
-                            rtol=1e-5
-                        )
-                        
-                        # 生成密集的点
-                        t_forward = np.linspace(x0, sol_forward.t[-1], 100)
-                        y_forward = sol_forward.sol(t_forward)[0]
-                        
-                        t_backward = np.linspace(x0, sol_backward.t[-1], 100)
-                        y_backward = sol_backward.sol(t_backward)[0]
-                        
-                        # 过滤超出范围的点
+                # 所有初始点（向前和向后）作为一批同时积分
+                seeds = [(x0, y0) for x0, y0 in initial_conditions
+                         if x_min <= x0 <= x_max and y_min <= y0 <= y_max]
+                if seeds:
+                    seeds_x, seeds_y = np.array(seeds).T
+                    traj_x, traj_y = integrate_seeds(
+                        equation_str, seeds_x, seeds_y, (x_min, x_max), (y_min, y_max),
+                        steps=self.ODE_STEPS)
+                
+                for idx, (x0, y0) in enumerate(seeds):
+                    # 以初始点为界拆分为向前和向后两段
+                    t_forward = traj_x[idx, self.ODE_STEPS:]
+                    y_forward = traj_y[idx, self.ODE_STEPS:]
+                    t_backward = traj_x[idx, self.ODE_STEPS::-1]
+                    y_backward = traj_y[idx, self.ODE_STEPS::-1]
+                    
+                    # 过滤超出范围的点
+                    with np.errstate(invalid='ignore'):
                         valid_forward = (y_forward >= y_min) & (y_forward <= y_max)
                         valid_backward = (y_backward >= y_min) & (y_backward <= y_max)
+                    
+                    # 如果启用动画，创建空曲线，绘制完成后逐帧展开
+                    if self.animate_var.get():
+                        self.ax.plot(x0, y0, 'o', color=curve_color, markersize=6)
+                        line, = self.ax.plot([], [], '-', color=curve_color, linewidth=2, alpha=0.8,
+                                             animated=True)
+                        with np.errstate(invalid='ignore'):
+                            inside = (traj_y[idx] >= y_min) & (traj_y[idx] <= y_max)
+                        animated_lines.append(line)
+                        animated_curves.append((traj_x[idx], np.where(inside, traj_y[idx], np.nan),
+                                                self.ODE_STEPS))
+                    else:
+                        # 一次性绘制所有曲线
+                        if np.any(valid_forward):
+                            self.ax.plot(t_forward[valid_forward], y_forward[valid_forward], 
+                                      '-', color=curve_color, linewidth=2, alpha=0.8)
                         
-                        # 如果启用动画，分段绘制
-                        if self.animate_var.get():
-                            # 先绘制初始点
-                            self.ax.plot(x0, y0, 'o', color=curve_color, markersize=6)
-                            self.canvas.draw_idle()
-                            self.root.update()
-                            
-                            # 分段绘制向前曲线
-                            segments = 20
-                            for i in range(1, segments+1):
-                                end_idx = min(len(t_forward), int(i * len(t_forward) / segments))
-                                if end_idx > 0:
-                                    segment_t = t_forward[:end_idx]
-                                    segment_y = y_forward[:end_idx]
-                                    segment_valid = valid_forward[:end_idx]
-                                    
-                                    if np.any(segment_valid):
-                                        self.ax.plot(segment_t[segment_valid], segment_y[segment_valid], 
-                                                  '-', color=curve_color, linewidth=2, alpha=0.8)
-                                        self.canvas.draw_idle()
-                                        self.root.update()
-                                        self.root.after(50)  # 短暂延迟
-                            
-                            # 分段绘制向后曲线
-                            for i in range(1, segments+1):
-                                end_idx = min(len(t_backward), int(i * len(t_backward) / segments))
-                                if end_idx > 0:
-                                    segment_t = t_backward[:end_idx]
-                                    segment_y = y_backward[:end_idx]
-                                    segment_valid = valid_backward[:end_idx]
-                                    
-                                    if np.any(segment_valid):
-                                        self.ax.plot(segment_t[segment_valid], segment_y[segment_valid], 
-                                                  '-', color=curve_color, linewidth=2, alpha=0.8)
-                                        self.canvas.draw_idle()
-                                        self.root.update()
-                                        self.root.after(50)  # 短暂延迟
-                        else:
-                            # 一次性绘制所有曲线
-                            if np.any(valid_forward):
-                                self.ax.plot(t_forward[valid_forward], y_forward[valid_forward], 
-                                          '-', color=curve_color, linewidth=2, alpha=0.8)
-                            
-                            if np.any(valid_backward):
-                                self.ax.plot(t_backward[valid_backward], y_backward[valid_backward], 
-                                          '-', color=curve_color, linewidth=2, alpha=0.8)
-                            
-                            # 绘制初始点
-                            self.ax.plot(x0, y0, 'o', color=curve_color, markersize=6)
+                        if np.any(valid_backward):
+                            self.ax.plot(t_backward[valid_backward], y_backward[valid_backward], 
+                                      '-', color=curve_color, linewidth=2, alpha=0.8)
+                        
+                        # 绘制初始点
+                        self.ax.plot(x0, y0, 'o', color=curve_color, markersize=6)
                 
                 # 添加图例
                 self.ax.legend(['积分曲线'], loc='best')
             
             # 更新画布
             self.canvas.draw()
+            if animated_lines:
+                self.animator.start(animated_lines, animated_curves)
             
             # 更新信息文本
             self.update_info_text(equation_str)
@@ -389,10 +599,6 @@ class DirectionFieldApp:
             import traceback
             traceback.print_exc()
 
-    def _out_of_bounds(self, x, y, y_min, y_max):
-        """检查积分是否超出边界"""
-        return 1 if y[0] < y_min or y[0] > y_max else -1
-
     def update_info_text(self, equation_str):
         """更新信息文本区域"""
         self.info_text.config(state=tk.NORMAL)
@@ -446,25 +652,79 @@ class DirectionFieldApp:
             # 重新绘制
             self.plot_direction_field_and_curves()
 
+    def _draw_streamlines(self, field, equation_str, color):
+        """绘制流线；尚未计算且种子数超过阈值时交给进程池，结果返回后再补画"""
+        lines = field.cached_streamlines(steps=self.STREAMLINE_STEPS)
+        seeds_x, seeds_y = field.streamline_seeds()
+        threshold = config_manager.get_config("performance.process_batch_threshold", 256)
+        if lines is None and threshold and len(seeds_x) > threshold:
+            submit_seeds_to_process_pool(
+                equation_str, seeds_x, seeds_y, (field.x[0], field.x[-1]), (field.y[0], field.y[-1]),
+                partial(self._on_streamlines_done, field, seeds_x, seeds_y, color),
+                steps=self.STREAMLINE_STEPS, key=self.streamline_task_key)
+            return
+        if lines is None:
+            lines = field.streamlines(steps=self.STREAMLINE_STEPS)
+        self.ax.add_collection(LineCollection(lines, colors=color, linewidths=1, alpha=0.8))
+
+    def _on_streamlines_done(self, field, seeds_x, seeds_y, color, task_result):
+        """进程池返回流线轨迹后（主线程）挑选流线并补画"""
+        if not task_result.success:
+            messagebox.showerror("错误", f"计算流线时出错: {task_result.error}")
+            return
+        full_x, full_y = task_result.result
+        steps = self.STREAMLINE_STEPS
+        # integrate_seeds 的每行按 x 从后向前到向前排列，以初始点为界拆开
+        lines = field.accept_streamlines(seeds_x, seeds_y, (full_x[:, steps:], full_y[:, steps:]),
+                                         (full_x[:, steps::-1], full_y[:, steps::-1]), steps=steps)
+        self.ax.add_collection(LineCollection(lines, colors=color, linewidths=1, alpha=0.8))
+        self.canvas.draw_idle()
+
+    def cleanup(self):
+        """页面回收时取消动画、流线计算和悬停刷新回调"""
+        self.animator.cancel()
+        get_thread_manager().cancel_key(self.streamline_task_key)
+        if self.hover_job is not None:
+            self.root.after_cancel(self.hover_job)
+            self.hover_job = None
+
     def on_hover(self, event):
-        """处理鼠标悬停事件"""
-        if event.inaxes == self.ax:
-            x, y = event.xdata, event.ydata
-            
-            # 计算当前点的斜率
-            equation_str = self.equation_entry.get()
-            try:
-                slope = eval(equation_str, {"__builtins__": {}}, 
-                           {"x": x, "y": y, "sin": np.sin, "cos": np.cos, 
-                            "tan": np.tan, "exp": np.exp, "log": np.log, 
-                            "sqrt": np.sqrt, "pi": np.pi})
-                
-                # 更新状态栏
-                self.ax.set_title(f"方向场与积分曲线: dy/dx = {equation_str} | 坐标: ({x:.2f}, {y:.2f}), 斜率: {slope:.2f}", 
-                                fontsize=10)
-                self.canvas.draw_idle()
-            except:
-                pass
+        """处理鼠标悬停事件（只记录位置，按刷新周期更新一次）"""
+        if event.inaxes == self.ax and event.xdata is not None:
+            self.hover_position = (event.xdata, event.ydata)
+            if self.hover_job is None:
+                self.hover_job = self.root.after(self.HOVER_INTERVAL_MS, self._update_hover)
+
+    def _update_hover(self):
+        """显示最近一次悬停位置的坐标和斜率"""
+        self.hover_job = None
+        if self.hover_position is None or self.hover_function is None:
+            return
+        x, y = self.hover_position
+        slope = self.hover_function.scalar(x, y)
+        
+        self.hover_text.set_text(f"坐标: ({x:.2f}, {y:.2f})\n斜率: {slope:.2f}")
+
+        # 在鼠标处画一小段切线：在按视口归一化的坐标中取固定长度
+        x_min, x_max = self.ax.get_xlim()
+        y_min, y_max = self.ax.get_ylim()
+        sx, sy = x_max - x_min, y_max - y_min
+        ux, uy = 1.0, slope * sx / sy
+        norm = np.hypot(ux, uy) / 0.04
+        dx, dy = ux / norm * sx, uy / norm * sy
+        self.hover_marker.set_data([x - dx, x + dx], [y - dy, y + dy])
+
+        # 只 blit 悬停图形；窗口缩放或范围变化时由完整重绘重新截取背景
+        if not self.animator.blit():
+            self.canvas.draw_idle()
+
+    def _create_hover_artists(self):
+        """在清空后的坐标轴上创建悬停读数（animated，不参与完整重绘，只通过 blit 更新）"""
+        self.hover_text = self.ax.text(0.02, 0.98, "", transform=self.ax.transAxes, va='top', fontsize=10,
+                                       bbox=dict(boxstyle='round', facecolor='white', alpha=0.8),
+                                       animated=True)
+        self.hover_marker, = self.ax.plot([], [], '-', color='red', linewidth=2, animated=True)
+        self.animator.overlays = [self.hover_text, self.hover_marker]
 
     def save_figure(self):
         """保存图像到文件"""
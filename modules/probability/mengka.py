@@ -6,10 +6,11 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 import math
-import random
 import time
 from typing import Callable, Optional
 
+from core.expression_manager import expression_manager
+
 # 配置 Matplotlib，使中文正常显示
 matplotlib.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'DejaVu Sans']
 matplotlib.rcParams['axes.unicode_minus'] = False
@@ -231,25 +232,12 @@ class MonteCarloApp:
             return False
         
         try:
-            # 安全的函数评估环境
-            safe_dict = {
-                "x": 0.5,  # 测试值
-                "math": math,
-                "np": np,
-                "sin": np.sin, "cos": np.cos, "tan": np.tan,
-                "exp": np.exp, "log": np.log, "log10": np.log10,
-                "sqrt": np.sqrt, "abs": np.abs, "pi": np.pi,
-                "e": np.e
-            }
-            
-            # 测试函数是否可以被解析和执行
-            eval(func_str, {"__builtins__": {}}, safe_dict)
+            # 解析并编译为向量化函数（共享缓存）
+            compiled = expression_manager.compile(func_str, ("x",))
             
-            # 如果测试成功，创建实际的函数对象
             def func(x):
-                safe_locals = safe_dict.copy()
-                safe_locals["x"] = x
-                return eval(func_str, {"__builtins__": {}}, safe_locals)
+                value = compiled(x)
+                return float(value) if value.ndim == 0 else value
             
             # 测试函数在积分区间的端点
             a = self.a_var.get()
@@ -265,9 +253,9 @@ class MonteCarloApp:
             # 尝试自动估计Y范围
             try:
                 x_samples = np.linspace(a, b, 20)  # 少量样本点用于快速检查
-                y_samples = [func(x) for x in x_samples]
-                self.integral_min_y = min(0, min(y_samples))  # 确保包含0
-                self.integral_max_y = max(0, max(y_samples))  # 确保包含0
+                y_samples = func(x_samples)
+                self.integral_min_y = min(0, float(np.nanmin(y_samples)))  # 确保包含0
+                self.integral_max_y = max(0, float(np.nanmax(y_samples)))  # 确保包含0
                 
                 # 添加一些边距
                 padding = (self.integral_max_y - self.integral_min_y) * 0.2
@@ -424,6 +412,13 @@ class MonteCarloApp:
 
         self.run_simulation_step()
 
+    def cleanup(self):
+        """页面回收时停止模拟循环"""
+        self.simulation_running = False
+        if self.simulation_task:
+            self.master.after_cancel(self.simulation_task)
+            self.simulation_task = None
+
     def stop_simulation(self):
         """Stop the simulation loop."""
         if not self.simulation_running:
@@ -482,61 +477,41 @@ class MonteCarloApp:
         sim_type = self.sim_type_var.get()
         points_in_batch = self.speed_var.get() # Use speed variable
 
-        new_x_inside, new_y_inside = [], []
-        new_x_outside, new_y_outside = [], []
-        batch_points_inside = 0 # Points inside for this batch
+        # 整批采样并向量化判断命中
+        if sim_type == "计算 π 值":
+            xs = np.random.random(points_in_batch)
+            ys = np.random.random(points_in_batch)
+            is_hit = xs * xs + ys * ys <= 1.0
 
-        for _ in range(points_in_batch):
-            self.total_points += 1
+        elif sim_type == "估算积分":
+            if not self.integral_func or self.integral_a >= self.integral_b or self.integral_min_y >= self.integral_max_y:
+                messagebox.showerror("错误", "积分参数无效，请检查函数、区间和Y范围。")
+                self.stop_simulation()
+                return
 
-            if sim_type == "计算 π 值":
-                x, y = random.random(), random.random()
-                is_inside = (x*x + y*y <= 1.0)
-                if is_inside:
-                    self.points_inside += 1
-                    batch_points_inside += 1
-                    new_x_inside.append(x)
-                    new_y_inside.append(y)
-                else:
-                    new_x_outside.append(x)
-                    new_y_outside.append(y)
+            # Sample within the bounding box
+            xs = np.random.uniform(self.integral_a, self.integral_b, points_in_batch)
+            ys = np.random.uniform(self.integral_min_y, self.integral_max_y, points_in_batch)
 
-            elif sim_type == "估算积分":
-                if not self.integral_func or self.integral_a >= self.integral_b or self.integral_min_y >= self.integral_max_y:
-                    messagebox.showerror("错误", "积分参数无效，请检查函数、区间和Y范围。")
-                    self.stop_simulation()
-                    return
+            try:
+                f_x = np.broadcast_to(self.integral_func(xs), xs.shape)
+            except Exception as e:
+                print(f"Error evaluating function: {e}")
+                self.stop_simulation()
+                messagebox.showerror("函数求值错误", f"计算函数值时出错: {e}")
+                return
 
-                # Sample within the bounding box
-                x = random.uniform(self.integral_a, self.integral_b)
-                y = random.uniform(self.integral_min_y, self.integral_max_y)
+            # A 'hit' means the random y falls between 0 and f(x)
+            is_hit = ((ys >= 0) & (ys <= f_x)) | ((ys <= 0) & (ys >= f_x))
 
-                try:
-                    f_x = self.integral_func(x)
-                except Exception as e:
-                    print(f"Error evaluating function at x={x}: {e}")
-                    self.stop_simulation()
-                    messagebox.showerror("函数求值错误", f"在 x={x:.4f} 处计算函数值时出错: {e}")
-                    return
+        else:
+            return
 
-                # Check if the point is a "hit" (between 0 and f(x) or f(x) and 0)
-                # This handles both positive and negative functions relative to the bounding box
-                is_inside = (self.integral_min_y <= y <= f_x) or (f_x <= y <= self.integral_max_y and f_x >= self.integral_min_y)
-                # Simplified check assuming bounding box contains the relevant area:
-                is_inside_area = (y >= self.integral_min_y and y <= f_x) if f_x >= self.integral_min_y else (y <= self.integral_max_y and y >= f_x)
-
-                # More robust check for hit-or-miss (area under curve relative to baseline y=0)
-                # A 'hit' means the random y falls between 0 and f(x)
-                is_hit = (y >= 0 and y <= f_x) or (y <= 0 and y >= f_x)
-
-                if is_hit:
-                    self.points_inside += 1 # Count 'hits' for integral estimation
-                    batch_points_inside += 1
-                    new_x_inside.append(x)
-                    new_y_inside.append(y)
-                else:
-                    new_x_outside.append(x)
-                    new_y_outside.append(y)
+        batch_points_inside = int(np.count_nonzero(is_hit))
+        self.total_points += points_in_batch
+        self.points_inside += batch_points_inside
+        new_x_inside, new_y_inside = xs[is_hit].tolist(), ys[is_hit].tolist()
+        new_x_outside, new_y_outside = xs[~is_hit].tolist(), ys[~is_hit].tolist()
 
         # --- Update Data Lists ---
         self.points_x_inside.extend(new_x_inside)
@@ -115,10 +115,11 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 from matplotlib.patches import Ellipse
 import sympy as sp
-from sympy.parsing.sympy_parser import parse_expr
 from scipy import stats
 import re
 
+from core.expression_manager import expression_manager
+
 # 配置 Matplotlib，使中文正常显示
 matplotlib.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'DejaVu Sans']
 matplotlib.rcParams['axes.unicode_minus'] = False
@@ -1478,28 +1479,10 @@ class RandomVariableApp:
             self.result_text3.delete(1.0, tk.END)
 
         try:
-            # 解析变换函数
-            x_sym = sp.Symbol('x')
-            # 使用更安全的解析方式
-            from sympy.parsing.sympy_parser import (parse_expr,
-                                                    standard_transformations,
-                                                    implicit_multiplication_application)
-            transformations = (standard_transformations +
-                               (implicit_multiplication_application,))
-            transform_expr = parse_expr(transform_func_str,
-                                        local_dict={'x': x_sym, 'exp': sp.exp, 'sin': sp.sin, 'cos': sp.cos, 'tan':sp.tan, 'log':sp.log}, # 添加常用函数
-                                        transformations=transformations)
-
-            # 检查解析结果是否依赖于 x
-            if not transform_expr.has(x_sym):
-                 # 如果不依赖x，尝试直接评估为常数
-                 try:
-                     const_val = float(transform_expr.evalf())
-                     transform_expr = sp.Number(const_val) # 替换为 sympy Number
-                 except (TypeError, ValueError):
-                      raise ValueError(f"变换函数 '{transform_func_str}' 无效或不依赖于 x")
-
-            transform_func = sp.lambdify(x_sym, transform_expr, modules=['numpy', {'exp': np.exp, 'sin': np.sin, 'cos': np.cos, 'tan':np.tan, 'log':np.log}]) # 传递 numpy 函数
+            # 解析变换函数（共享的表达式缓存，返回向量化函数）
+            compiled = expression_manager.compile(transform_func_str, ("x",))
+            transform_expr = compiled.expr
+            transform_func = compiled
 
             # 创建子图
             ax1 = self.fig3.add_subplot(221)  # 原始分布
@@ -8,10 +8,87 @@ from matplotlib.figure import Figure
 from scipy import stats
 import math
 
+from core.thread_manager import TaskCancelledError, get_thread_manager
+
 # 配置 Matplotlib，使中文正常显示
 matplotlib.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'DejaVu Sans']
 matplotlib.rcParams['axes.unicode_minus'] = False
 
+
+def compute_test(test_type, alternative, alpha, params, cancel_token=None):
+    """计算检验统计量、p 值和临界值（不涉及界面，在后台线程中执行）
+
+    Args:
+        test_type: 检验类型名称
+        alternative: "two-sided"、"less" 或 "greater"
+        alpha: 显著性水平
+        params: 参数名 -> 数值
+        cancel_token: 取消令牌，被新的请求取代后提前退出
+
+    Returns:
+        字典，包含 dist, stat, stat_name, df, p_value, crit_val, alpha, alternative；
+        未知检验类型返回 None
+
+    Raises:
+        ValueError: 参数不合法
+    """
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+
+    if test_type == "单样本Z检验 (总体方差已知)":
+        x_bar = params["样本均值"]
+        mu0 = params["总体均值"]
+        sigma = params["总体标准差"]
+        n = params["样本量"]
+        if n < 2 or sigma <= 0:
+            raise ValueError("样本量需 >= 2, 总体标准差需 > 0")
+
+        # 计算检验统计量 Z
+        se = sigma / math.sqrt(n) # 标准误
+        stat = (x_bar - mu0) / se
+        dist, df, stat_name = stats.norm, None, "Z"
+        cdf = dist.cdf
+        ppf = dist.ppf
+
+    elif test_type == "单样本t检验 (总体方差未知)":
+        x_bar = params["样本均值"]
+        mu0 = params["总体均值"]
+        s = params["样本标准差"]
+        n = params["样本量"]
+        if n < 2 or s <= 0:
+            raise ValueError("样本量需 >= 2, 样本标准差需 > 0")
+
+        df = n - 1 # 自由度
+        se = s / math.sqrt(n) # 标准误
+        stat = (x_bar - mu0) / se
+        dist, stat_name = stats.t, "t"
+        cdf = lambda v: stats.t.cdf(v, df)
+        ppf = lambda q: stats.t.ppf(q, df)
+
+    # --- 添加其他检验类型的逻辑 ---
+    else:
+        return None
+
+    # 计算 p 值
+    if alternative == 'two-sided':
+        p_value = 2 * (1 - cdf(abs(stat)))
+    elif alternative == 'less':
+        p_value = cdf(stat)
+    else: # 'greater'
+        p_value = 1 - cdf(stat)
+
+    # 获取临界值
+    if alternative == 'two-sided':
+        crit_val = (ppf(alpha / 2), ppf(1 - alpha / 2))
+    elif alternative == 'less':
+        crit_val = ppf(alpha)
+    else: # 'greater'
+        crit_val = ppf(1 - alpha)
+
+    return {"dist": dist, "stat": stat, "stat_name": stat_name, "df": df, "p_value": p_value,
+            "crit_val": crit_val, "alpha": alpha, "alternative": alternative}
+
+
 class HypothesisTestingApp:
     def __init__(self, master):
         self.master = master
@@ -92,13 +169,15 @@ class HypothesisTestingApp:
 
         # --- 初始化 ---
         self.current_params = {} # 用于存储当前检验所需的参数控件变量
+        self._after_id = None    # 待执行的检验（只保留最新一次）
+        self._task_key = f"hypothesis_test_{id(self)}"  # 后台检验任务键（新的计算取代旧的）
         self.create_test_params() # 创建初始参数控件
         self.perform_test()       # 执行初始检验和绘图
 
     def update_alpha_display(self, value):
         """更新alpha显示标签并重新执行检验"""
         self.alpha_label.config(text=f"α = {self.alpha_var.get():.3f}")
-        self.perform_test()
+        self.schedule_test(50)
 
     def on_test_type_change(self, event):
         """切换检验类型时，重新创建参数输入控件并执行检验"""
@@ -162,15 +241,25 @@ class HypothesisTestingApp:
         entry = ttk.Entry(frame, width=8, textvariable=var)
         entry.pack(side=tk.LEFT)
         # 绑定输入框更新事件 (防抖动)
-        entry.bind("<KeyRelease>", lambda e: self.master.after(500, self.perform_test))
+        entry.bind("<KeyRelease>", lambda e: self.schedule_test(500))
 
         # 更新滑块命令以包含输入框更新
-        scale.config(command=lambda v, v_var=var, e=entry: [self.update_param_entry(e, v_var.get()), self.perform_test()])
+        scale.config(command=lambda v, v_var=var, e=entry: [self.update_param_entry(e, v_var.get()), self.schedule_test(50)])
 
         # 存储变量以便后续获取值
         param_key = label_text.split(" ")[0] # 使用标签的第一个词作为键
         self.current_params[param_key] = var
 
+    def schedule_test(self, delay=50):
+        """安排执行检验：新的请求会取代尚未执行的旧请求，拖动滑块时不会堆积重算"""
+        if self._after_id:
+            self.master.after_cancel(self._after_id)
+        self._after_id = self.master.after(delay, self._run_scheduled_test)
+
+    def _run_scheduled_test(self):
+        self._after_id = None
+        self.perform_test()
+
     def update_param_entry(self, entry, value):
         """更新参数输入框的值"""
         if entry:
@@ -179,7 +268,7 @@ class HypothesisTestingApp:
 
 
     def perform_test(self):
-        """执行选定的假设检验并更新图表和结果"""
+        """读取当前参数，把检验计算提交到后台；同一页面只保留最新一次，过期结果直接丢弃"""
         test_type = self.test_type_var.get()
         alpha = self.alpha_var.get()
         alternative_map = {
@@ -189,93 +278,50 @@ class HypothesisTestingApp:
         }
         alternative = alternative_map[self.alternative_var.get()]
 
-        params = {key: var.get() for key, var in self.current_params.items()}
-
         try:
-            if test_type == "单样本Z检验 (总体方差已知)":
-                x_bar = params["样本均值"]
-                mu0 = params["总体均值"]
-                sigma = params["总体标准差"]
-                n = params["样本量"]
-                if n < 2 or sigma <= 0:
-                    raise ValueError("样本量需 >= 2, 总体标准差需 > 0")
-
-                # 计算检验统计量 Z
-                se = sigma / math.sqrt(n) # 标准误
-                z_stat = (x_bar - mu0) / se
-
-                # 计算 p 值
-                if alternative == 'two-sided':
-                    p_value = 2 * (1 - stats.norm.cdf(abs(z_stat)))
-                elif alternative == 'less':
-                    p_value = stats.norm.cdf(z_stat)
-                else: # 'greater'
-                    p_value = 1 - stats.norm.cdf(z_stat)
-
-                # 获取临界值
-                if alternative == 'two-sided':
-                    crit_val_lower = stats.norm.ppf(alpha / 2)
-                    crit_val_upper = stats.norm.ppf(1 - alpha / 2)
-                    crit_val = (crit_val_lower, crit_val_upper)
-                elif alternative == 'less':
-                    crit_val = stats.norm.ppf(alpha)
-                else: # 'greater'
-                    crit_val = stats.norm.ppf(1 - alpha)
-
-                # 绘制标准正态分布
-                self.plot_distribution(stats.norm, z_stat, crit_val, p_value, alpha, alternative, df=None)
-                # 显示结果
-                self.display_results(z_stat, p_value, crit_val, alpha, alternative, "Z")
-
-
-            elif test_type == "单样本t检验 (总体方差未知)":
-                x_bar = params["样本均值"]
-                mu0 = params["总体均值"]
-                s = params["样本标准差"]
-                n = params["样本量"]
-                if n < 2 or s <= 0:
-                    raise ValueError("样本量需 >= 2, 样本标准差需 > 0")
-
-                df = n - 1 # 自由度
-                se = s / math.sqrt(n) # 标准误
-                t_stat = (x_bar - mu0) / se
-
-                # 计算 p 值
-                if alternative == 'two-sided':
-                    p_value = 2 * (1 - stats.t.cdf(abs(t_stat), df))
-                elif alternative == 'less':
-                    p_value = stats.t.cdf(t_stat, df)
-                else: # 'greater'
-                    p_value = 1 - stats.t.cdf(t_stat, df)
-
-                # 获取临界值
-                if alternative == 'two-sided':
-                    crit_val_lower = stats.t.ppf(alpha / 2, df)
-                    crit_val_upper = stats.t.ppf(1 - alpha / 2, df)
-                    crit_val = (crit_val_lower, crit_val_upper)
-                elif alternative == 'less':
-                    crit_val = stats.t.ppf(alpha, df)
-                else: # 'greater'
-                    crit_val = stats.t.ppf(1 - alpha, df)
-
-                # 绘制 t 分布
-                self.plot_distribution(stats.t, t_stat, crit_val, p_value, alpha, alternative, df=df)
-                # 显示结果
-                self.display_results(t_stat, p_value, crit_val, alpha, alternative, "t", df)
-
-            # --- 添加其他检验类型的逻辑 ---
-
-        except ValueError as ve:
-            messagebox.showerror("参数错误", str(ve))
-            self.clear_plot()
-            self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(tk.END, f"参数错误: {str(ve)}")
-        except Exception as e:
-            messagebox.showerror("计算错误", f"执行检验时发生错误: {str(e)}")
-            self.clear_plot()
-            self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(tk.END, f"计算错误: {str(e)}")
-
+            params = {key: var.get() for key, var in self.current_params.items()}
+        except tk.TclError:
+            # 输入框中途被清空等无法解析的值，等输入完成后再计算
+            return
+
+        manager = get_thread_manager()
+        if manager.root is None:
+            manager.attach(self.master.winfo_toplevel())
+        manager.submit_task(compute_test, self._on_test_done, None, "正在计算...",
+                            test_type, alternative, alpha, params,
+                            key=self._task_key, pass_token=True)
+
+    def _on_test_done(self, task_result):
+        """在主线程中绘制检验结果（只有最新一次提交的结果会回调到这里）"""
+        if task_result.success:
+            result = task_result.result
+            if result is None:
+                return
+            self.plot_distribution(result["dist"], result["stat"], result["crit_val"], result["p_value"],
+                                   result["alpha"], result["alternative"], df=result["df"])
+            self.display_results(result["stat"], result["p_value"], result["crit_val"], result["alpha"],
+                                 result["alternative"], result["stat_name"], result["df"])
+            return
+
+        error = task_result.error
+        if isinstance(error, TaskCancelledError):
+            return
+        if isinstance(error, ValueError):
+            messagebox.showerror("参数错误", str(error))
+            message = f"参数错误: {str(error)}"
+        else:
+            messagebox.showerror("计算错误", f"执行检验时发生错误: {str(error)}")
+            message = f"计算错误: {str(error)}"
+        self.clear_plot()
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, message)
+
+    def cleanup(self):
+        """页面回收时取消待执行和正在进行的检验"""
+        if self._after_id:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
+        get_thread_manager().cancel_key(self._task_key)
 
     def plot_distribution(self, dist, stat_val, crit_val, p_value, alpha, alternative, df=None):
         """绘制分布图，标记拒绝域、检验统计量和p值区域"""
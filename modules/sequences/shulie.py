@@ -3,10 +3,10 @@ from tkinter import ttk, messagebox
 import numpy as np
 import sympy as sp
 from matplotlib.lines import Line2D
-from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application
 import warnings
 
 from common.base_app import MathModuleApp
+from core.expression_manager import expression_manager
 from knowledge import KnowledgeLearningClass
 
 # 忽略sympy的警告
@@ -159,17 +159,19 @@ class SequenceModule(MathModuleApp):
                 messagebox.showerror("数列错误", "结束项必须大于等于开始项")
                 return
             
-            x = sp.Symbol('n')
-            expr = parse_expr(expression, transformations=(standard_transformations + (implicit_multiplication_application,)))
-            self.sequence_expr = expr
+            # scipy 函数集支持 factorial、binomial、gamma 等数列常用函数的向量化计算
+            compiled = expression_manager.compile(expression, ("n",), functions="scipy")
+            self.sequence_expr = compiled.expr
             
-            values = []
-            for n in range(start, end + 1):
-                try:
-                    val = float(expr.subs(x, n))
-                    values.append((n, val))
-                except (ValueError, ZeroDivisionError, OverflowError):
-                    continue
+            # 一次性计算所有项，跳过无定义的项
+            n_vals = np.arange(start, end + 1)
+            try:
+                y_vals = compiled(n_vals)
+            except Exception:
+                # 向量化计算不支持的函数逐项精确求值
+                y_vals = np.array([self._exact_term(compiled, n) for n in n_vals.tolist()], dtype=float)
+            finite = np.isfinite(y_vals)
+            values = list(zip(n_vals[finite].tolist(), y_vals[finite].tolist()))
             
             self.sequence_values = values
             self.draw_sequence_points(values)
@@ -178,6 +180,15 @@ class SequenceModule(MathModuleApp):
             messagebox.showerror("数列错误", f"计算数列时出错: {str(e)}")
             self.clear_sequence()
 
+    @staticmethod
+    def _exact_term(compiled, n):
+        """用 SymPy 精确计算第 n 项，无定义或非实数时返回 NaN"""
+        try:
+            value = complex(compiled.expr.subs(compiled.symbols[0], n).evalf())
+        except (TypeError, ValueError):
+            return np.nan
+        return value.real if abs(value.imag) < 1e-12 else np.nan
+
     def draw_sequence_points(self, values):
         """绘制数列点"""
         self.clear_sequence()
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from common.adaptive_sampling import adaptive_sample
+
+# 方程绘图器的默认分辨率为 500，预算为分辨率的 4 倍
+BUDGET = 500 * 4
+
+
+def _sample(func, t_min, t_max, y_range=(-10, 10)):
+    return adaptive_sample(lambda t: (t, func(t)), t_min, t_max, (t_min, t_max) + y_range, max_points=BUDGET)
+
+
+def _period_extremes(x, y, period, t_min, t_max):
+    """每个完整周期内的最大值和最小值"""
+    finite = np.isfinite(y)
+    index = np.floor((x[finite] - t_min) / period)
+    full = np.arange(int((t_max - t_min) // period))
+    peaks = np.array([y[finite][index == k].max() for k in full])
+    troughs = np.array([y[finite][index == k].min() for k in full])
+    return peaks, troughs
+
+
+@pytest.mark.parametrize("func, t_min, t_max, period", [
+    (lambda t: np.sin(20 * t), -10, 10, 2 * np.pi / 20),
+    (lambda t: np.cos(20.106 * t), -10, 10, 2 * np.pi / 20.106),
+    (np.sin, -200, 200, 2 * np.pi),
+])
+def test_oscillations_keep_full_amplitude(func, t_min, t_max, period):
+    x, y = _sample(func, t_min, t_max)
+    peaks, troughs = _period_extremes(x, y, period, t_min, t_max)
+    assert peaks.min() > 0.95
+    assert troughs.max() < -0.95
+
+
+def test_tan_branches_reach_viewport_and_break_at_poles():
+    x, y = _sample(np.tan, -100, 100)
+    finite = np.isfinite(y)
+    # 每个分支（两个相邻极点之间）都应延伸到视口边界附近
+    branch = np.round(x[finite] / np.pi)
+    reach = [np.abs(y[finite][branch == k]).max() for k in np.unique(branch)[1:-1]]
+    assert min(reach) > 9
+    # 每个极点处都应断开，不能画出跨越视口的竖线
+    poles = np.pi / 2 + np.pi * np.arange(-32, 32)
+    for piece in np.split(x, np.flatnonzero(np.isnan(y))):
+        piece = piece[np.isfinite(piece)]
+        if piece.size:
+            assert not ((poles > piece.min()) & (poles < piece.max())).any()
+
+
+def test_smooth_curve_is_within_budget():
+    x, y = _sample(lambda t: t ** 2, -3, 3, (0, 9))
+    assert len(x) <= BUDGET
+    assert np.nanmax(y) == pytest.approx(9)
+
+
+@pytest.mark.parametrize("func", [np.square, np.sin, np.exp])
+def test_smooth_curves_use_far_fewer_evaluations_than_budget(func):
+    """平滑曲线只需初始网格、探测点和少量细分，远少于预算（也少于旧的均匀 500 点）"""
+    evaluations = []
+
+    def counted(t):
+        evaluations.append(len(t))
+        return t, func(t)
+
+    adaptive_sample(counted, -10, 10, (-10, 10, -10, 10), max_points=BUDGET)
+    assert sum(evaluations) < 300
+
+
+def test_oscillation_respects_budget():
+    evaluations = []
+
+    def counted(t):
+        evaluations.append(len(t))
+        return t, np.sin(20 * t)
+
+    adaptive_sample(counted, -10, 10, (-10, 10, -10, 10), max_points=BUDGET)
+    assert sum(evaluations) <= BUDGET
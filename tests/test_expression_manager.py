@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from core.expression_manager import ExpressionError, ExpressionManager
+
+
+def _chars(text):
+    """把字符串写成 chr(..)+chr(..) 的形式，绕过对引号的检查"""
+    return "+".join(f"chr({ord(c)})" for c in text)
+
+
+@pytest.mark.parametrize("source", [
+    f"exec({_chars('print(7)')})",
+    f"eval({_chars('print(7)')})",
+    f"getattr(x, {_chars('real')})",
+    f"open({_chars('unsafe.txt')})",
+])
+def test_builtins_are_not_reachable(source, capsys, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = ExpressionManager(enabled=False)
+    with pytest.raises(ExpressionError):
+        manager.compile(source, ("x",))
+    assert capsys.readouterr().out == ""
+    assert not (tmp_path / "unsafe.txt").exists()
+
+
+def test_common_syntax_still_parses():
+    manager = ExpressionManager(enabled=False)
+    f = manager.compile("2x^2 + sin(x) + ln(x) + abs(x) + pi", ("x",))
+    assert f.scalar(1.0) == pytest.approx(2 + np.sin(1.0) + 0 + 1 + np.pi)
+    assert manager.compile("n!", ("n",), functions="scipy")(np.arange(1, 5.0)).tolist() == [1, 2, 6, 24]
+
+
+def test_unprintable_expression_raises_expression_error():
+    with pytest.raises(ExpressionError):
+        ExpressionManager(enabled=False).compile("Integral(x, x)", ("x",))
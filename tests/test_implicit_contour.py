@@ -0,0 +1,32 @@
+import numpy as np
+
+from common.implicit_contour import quadtree_contour
+from core.expression_manager import expression_manager
+
+VIEWPORT = (-10, 10, -10, 10)
+
+
+def _points(source):
+    func = expression_manager.compile(source, ("x", "y"))
+    segments, _ = quadtree_contour(func, VIEWPORT, initial_cells=32, max_depth=5)
+    return segments.reshape(-1, 2)
+
+
+def test_log_branch_reaches_towards_singularity():
+    """y = log(x)：x<0 无定义、x=0 为奇点，靠近 y 轴的下降分支不能在粗网格层被丢掉"""
+    points = _points("y - log(x)")
+    x, y = points[:, 0], points[:, 1]
+    assert (x > 0).all()
+    assert x.min() < 0.05
+    assert y.min() < -3
+    assert np.abs(y - np.log(x)).max() < 0.1
+
+
+def test_hyperbola_both_branches_span_viewport():
+    """y = 1/x：两支都应画到视口边缘，且不在 x=0 处产生假线段"""
+    points = _points("y - 1/x")
+    x, y = points[:, 0], points[:, 1]
+    for branch in (x > 0, x < 0):
+        assert np.abs(y[branch]).max() > 9
+        assert np.abs(x[branch]).max() > 9
+    assert np.abs(x * y - 1).max() < 0.1
@@ -0,0 +1,29 @@
+from core.search_manager import SearchItem, SearchManager
+
+
+def _manager(*entries):
+    manager = SearchManager()
+    for title, description in entries:
+        manager.register_item(SearchItem(title, description, "测试", [], lambda: None))
+    return manager
+
+
+def _titles(results):
+    return [item.title for item, _ in results]
+
+
+def test_single_character_words_in_multi_word_query():
+    """每个词都只有一个字符时没有二元组，仍应按一元组命中"""
+    manager = _manager(("坐标平面", "x y 平面上的点"), ("数轴", "实数轴"))
+    results = manager.search("x y")
+    assert _titles(results) == ["坐标平面"]
+    assert results[0][1] == 0.8
+
+
+def test_multi_word_substring_ranks_first():
+    manager = _manager(("Normal Distribution", "bell curve"), ("Binomial Distribution", "coin flips"),
+                       ("t 检验", "单样本 t 检验"), ("卡方检验", "拟合优度检验"))
+    assert _titles(manager.search("normal  dist"))[0] == "Normal Distribution"
+    results = manager.search("t 检验")
+    assert results[0] == (manager.items[2], 1.0)
+    assert results[1][1] < 1.0